@@ -0,0 +1,29 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.db.scheduler import GraphDBOverloadedError
+from app.db.circuit_breaker import GraphDBUnavailableError
+from app.core.config import settings
+
+# GraphDB errors that mean "try again shortly"; routes re-raise these so
+# the app answers them with 503 + Retry-After
+GRAPHDB_BUSY_ERRORS = (GraphDBOverloadedError, GraphDBUnavailableError)
+
+
+async def graphdb_overloaded_handler(request: Request, exc: GraphDBOverloadedError) -> JSONResponse:
+    """The query queue is full; it drains within about a second."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+async def graphdb_unavailable_handler(request: Request, exc: GraphDBUnavailableError) -> JSONResponse:
+    """The circuit breaker is open; retry once it may half-open."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(settings.GRAPHDB_BREAKER_RESET_SECONDS))}
+    )
+
+
+def register_exception_handlers(app: FastAPI):
+    """Map GraphDB back-pressure errors to 503 responses for every route."""
+    app.add_exception_handler(GraphDBOverloadedError, graphdb_overloaded_handler)
+    app.add_exception_handler(GraphDBUnavailableError, graphdb_unavailable_handler)
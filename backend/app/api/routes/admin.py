@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Dict, Any, Optional
+import secrets
+from app.db.graphdb import graphdb_client
+from app.services.materializer import entity_materializer
+from app.core.config import settings
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Hide the admin API unless ADMIN_ENABLED; require X-Admin-Token when ADMIN_TOKEN is set."""
+    if not settings.ADMIN_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.ADMIN_TOKEN and not secrets.compare_digest(
+        (x_admin_token or "").encode(),
+        settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/graphdb/scheduler")
+async def get_graphdb_scheduler_stats() -> Dict[str, Any]:
+    """GraphDB query scheduler gauges: in-flight queries, queue depth and wait times."""
+    return graphdb_client.scheduler.stats()
+
+
+@router.get("/graphdb/breaker")
+async def get_graphdb_breaker_stats() -> Dict[str, Any]:
+    """GraphDB circuit breaker state and counters."""
+    return graphdb_client.breaker.stats()
+
+
+@router.get("/graphdb/replicas")
+async def get_graphdb_replica_stats() -> Dict[str, Any]:
+    """Per-replica latency, ejections and hedged read counters (empty without a replica pool)."""
+    stats = getattr(graphdb_client.backend, "stats", None)
+    return stats() if stats else {"replicas": []}
+
+
+@router.get("/graphdb/profile")
+async def get_graphdb_query_profile() -> Dict[str, Any]:
+    """Per-template SPARQL latency histograms and percentiles, row counts and result sizes."""
+    return graphdb_client.profiler.stats()
+
+
+@router.get("/graphdb/slow-queries")
+async def get_graphdb_slow_queries() -> Dict[str, Any]:
+    """Recent slow SPARQL queries with their parameters, and captured GraphDB query plans."""
+    return graphdb_client.profiler.slow_log()
+
+
+@router.post("/graphdb/profile/reset")
+async def reset_graphdb_query_profile() -> Dict[str, Any]:
+    """Drop all query profiles, slow queries and captured plans."""
+    graphdb_client.profiler.reset()
+    return {"reset": True}
+
+
+@router.get("/graphdb/memo")
+async def get_graphdb_memo_stats() -> Dict[str, Any]:
+    """SPARQL query memo size and hit rate, with the dataset version it is keyed on."""
+    return {
+        **graphdb_client.memo.stats(),
+        "datasetVersion": graphdb_client.dataset_version,
+        "activeGraph": graphdb_client.active_graph
+    }
+
+
+@router.post("/graphdb/memo/clear")
+async def clear_graphdb_memo() -> Dict[str, Any]:
+    """Drop all memoized SPARQL results and re-read the dataset version."""
+    graphdb_client.memo.clear()
+    version = await graphdb_client.refresh_dataset_version()
+    return {"cleared": True, "datasetVersion": version}
+
+
+@router.get("/entities/materialize")
+async def get_entity_materialization() -> Dict[str, Any]:
+    """Whether entity caches are being materialized, and the last run's per-collection counts."""
+    return entity_materializer.stats()
+
+
+@router.post("/entities/materialize")
+async def materialize_entities() -> Dict[str, Any]:
+    """Rebuild the MongoDB entity caches from GraphDB in the background (incremental)."""
+    return {"started": entity_materializer.start(), **entity_materializer.stats()}
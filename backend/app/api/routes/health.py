@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from app.models.schemas import HealthCheckResponse
-from app.db.graphdb import graphdb_client
-from app.db.mongodb import mongodb_client
+from app.services.health_monitor import health_monitor
 from app.core.config import settings
 
 router = APIRouter()
@@ -9,13 +8,11 @@ router = APIRouter()
 
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
-    """Health check endpoint."""
-    graphdb_ok = await graphdb_client.test_connection()
-    mongodb_ok = await mongodb_client.test_connection()
+    """Health check endpoint, answered from the latest background probe."""
+    status = await health_monitor.status()
 
     return HealthCheckResponse(
-        status="healthy" if (graphdb_ok and mongodb_ok) else "degraded",
+        status="healthy" if (status["graphdb_connected"] and status["mongodb_connected"]) else "degraded",
         version=settings.APP_VERSION,
-        graphdb_connected=graphdb_ok,
-        mongodb_connected=mongodb_ok
+        **status
     )
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Depends
 from typing import List, Optional
 from app.models.schemas import Hospital
 from app.db.mongodb import mongodb_client
+from app.db.entity_loader import EntityLoader, get_entity_loader
+from app.services.entities import hospital_record
 from app.services.geo import calculate_distances, filter_by_radius
 import logging
 
@@ -35,15 +37,39 @@ async def get_all_hospitals(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/compare", response_model=List[Hospital])
+async def compare_hospitals(
+    ids: List[str] = Query(..., description="Hospital IDs"),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
+    """
+    Get several hospitals at once, in the requested order.
+
+    All lookups go to GraphDB as a single batched query; unknown IDs are skipped.
+    """
+    try:
+        hospitals = await loader.load_many("hospitals", ids)
+        return [Hospital(**hospital_record(h)) for h in hospitals if h is not None]
+    except Exception as e:
+        logger.error(f"Error comparing hospitals: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{hospital_id}", response_model=Hospital)
-async def get_hospital(hospital_id: str = Path(..., description="Hospital ID")):
-    """Get a specific hospital by ID."""
+async def get_hospital(
+    hospital_id: str = Path(..., description="Hospital ID"),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
+    """Get a specific hospital by ID, from the cache or else GraphDB."""
     try:
         hospitals = await mongodb_client.get_cached_hospitals()
         hospital = next((h for h in hospitals if h.get("id") == hospital_id), None)
 
         if not hospital:
-            raise HTTPException(status_code=404, detail="Hospital not found")
+            entity = await loader.load("hospitals", hospital_id)
+            if entity is None:
+                raise HTTPException(status_code=404, detail="Hospital not found")
+            hospital = hospital_record(entity)
 
         return Hospital(**hospital)
     except HTTPException:
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Query, Depends
 from typing import List
 from app.models.schemas import Provider
 from app.db.mongodb import mongodb_client
+from app.db.entity_loader import EntityLoader, get_entity_loader
+from app.services.entities import provider_record
 import logging
 
 router = APIRouter()
@@ -19,14 +21,39 @@ async def get_all_providers():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/compare", response_model=List[Provider])
+async def compare_providers(
+    ids: List[str] = Query(..., description="Provider IDs"),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
+    """
+    Get several providers at once, in the requested order.
+
+    All lookups go to GraphDB as a single batched query; unknown IDs are skipped.
+    """
+    try:
+        providers = await loader.load_many("providers", ids)
+        return [Provider(**provider_record(p)) for p in providers if p is not None]
+    except Exception as e:
+        logger.error(f"Error comparing providers: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{provider_id}", response_model=Provider)
-async def get_provider(provider_id: str = Path(..., description="Provider ID")):
-    """Get a specific provider by ID."""
+async def get_provider(
+    provider_id: str = Path(..., description="Provider ID"),
+    loader: EntityLoader = Depends(get_entity_loader)
+):
+    """Get a specific provider by ID, from the cache or else GraphDB."""
     try:
         providers = await mongodb_client.get_cached_providers({"id": provider_id})
-        if not providers:
+        if providers:
+            return Provider(**providers[0])
+
+        entity = await loader.load("providers", provider_id)
+        if entity is None:
             raise HTTPException(status_code=404, detail="Provider not found")
-        return Provider(**providers[0])
+        return Provider(**provider_record(entity))
     except HTTPException:
         raise
     except Exception as e:
@@ -3,10 +3,19 @@ from typing import List, Optional
 from app.models.schemas import (
     SymptomSearchRequest,
     SymptomSearchResponse,
+    BatchSymptomSearchRequest,
+    BatchSymptomSearchResponse,
+    SymptomSuggestion,
     SearchFilters,
     ProviderSearchResponse
 )
-from app.services.search import search_by_symptom, search_providers
+from app.api.errors import GRAPHDB_BUSY_ERRORS
+from app.services.search import (
+    search_by_symptom,
+    search_by_symptom_batch,
+    search_providers,
+    suggest_symptoms
+)
 import logging
 
 router = APIRouter()
@@ -24,11 +33,45 @@ async def search_by_symptom_endpoint(request: SymptomSearchRequest):
     try:
         result = await search_by_symptom(request)
         return SymptomSearchResponse(**result)
+    except GRAPHDB_BUSY_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in symptom search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/symptom/batch", response_model=BatchSymptomSearchResponse)
+async def search_by_symptom_batch_endpoint(request: BatchSymptomSearchRequest):
+    """
+    Run many symptom searches in a single call.
+
+    Identical searches are deduplicated, cache lookups and GraphDB queries
+    are shared across the batch, and each item reports its own result or error.
+    """
+    try:
+        result = await search_by_symptom_batch(request.requests)
+        return BatchSymptomSearchResponse(**result)
+    except GRAPHDB_BUSY_ERRORS:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch symptom search: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/symptoms/suggest", response_model=List[SymptomSuggestion])
+async def suggest_symptoms_endpoint(
+    q: str = Query(..., min_length=2, description="Free-text symptom description"),
+    limit: int = Query(5, ge=1, le=20)
+):
+    """
+    Suggest known symptoms for a free-text description.
+
+    Uses the local TF-IDF symptom index, so "can't breathe" suggests
+    "Shortness Of Breath" without any external model service.
+    """
+    return [SymptomSuggestion(**s) for s in suggest_symptoms(q, limit)]
+
+
 @router.post("/providers", response_model=ProviderSearchResponse)
 async def search_providers_endpoint(filters: SearchFilters):
     """
@@ -43,6 +86,8 @@ async def search_providers_endpoint(filters: SearchFilters):
     try:
         result = await search_providers(filters)
         return ProviderSearchResponse(**result)
+    except GRAPHDB_BUSY_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in provider search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -75,6 +120,8 @@ async def search_providers_get(
     try:
         result = await search_providers(filters)
         return ProviderSearchResponse(**result)
+    except GRAPHDB_BUSY_ERRORS:
+        raise
     except Exception as e:
         logger.error(f"Error in provider search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
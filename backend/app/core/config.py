@@ -23,10 +23,57 @@ class Settings(BaseSettings):
     CORS_ORIGINS: str = '["http://localhost:5173","http://localhost:3000"]'
 
     # GraphDB
+    # Graph backend: "graphdb" (HTTP) or "embedded" (in-process pyoxigraph store)
+    GRAPH_BACKEND: str = "graphdb"
+    # Embedded backend data; empty = repo ontology and ops/ttl_data/*.ttl
+    EMBEDDED_ONTOLOGY_PATH: str = ""
+    EMBEDDED_TTL_DIR: str = ""
     GRAPHDB_URL: str = "http://localhost:7200"
+    # Read replicas as a JSON list of base URLs, e.g. '["http://gdb-1:7200","http://gdb-2:7200"]';
+    # empty = GRAPHDB_URL only
+    GRAPHDB_REPLICA_URLS: str = ""
+    GRAPHDB_REPLICA_EWMA_ALPHA: float = 0.3
+    GRAPHDB_REPLICA_EJECT_FAILURES: int = 3
+    GRAPHDB_REPLICA_EJECT_SECONDS: float = 30.0
+    # Duplicate reads still running after the p95 latency to the next best replica
+    GRAPHDB_HEDGE_READS: bool = True
+    GRAPHDB_HEDGE_MIN_SAMPLES: int = 20
     GRAPHDB_REPOSITORY: str = "healthnav"
     GRAPHDB_USERNAME: str = ""
     GRAPHDB_PASSWORD: str = ""
+    GRAPHDB_TIMEOUT_SECONDS: float = 30.0
+    GRAPHDB_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    GRAPHDB_MAX_CONNECTIONS: int = 20
+    GRAPHDB_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GRAPHDB_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    GRAPHDB_GZIP: bool = True
+    # Override the per-template SPARQL results format (json, csv, tsv); empty = per template
+    GRAPHDB_RESULT_FORMAT: str = ""
+    GRAPHDB_MAX_CONCURRENT_QUERIES: int = 16
+    GRAPHDB_MAX_QUEUED_QUERIES: int = 64
+    GRAPHDB_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    GRAPHDB_BREAKER_FAILURE_THRESHOLD: int = 5
+    GRAPHDB_BREAKER_SLOW_CALL_SECONDS: float = 5.0
+    GRAPHDB_BREAKER_RESET_SECONDS: float = 30.0
+    # Paged catalog retrieval: entities per page, concurrent page fetches
+    GRAPHDB_PAGE_SIZE: int = 1000
+    GRAPHDB_PAGE_CONCURRENCY: int = 4
+    # Max IDs per batched entity lookup (one VALUES query)
+    GRAPHDB_LOADER_MAX_BATCH: int = 100
+    # Query memoization: max estimated bytes (0 = off), entry TTL, dataset version poll interval
+    GRAPHDB_MEMO_MAX_BYTES: int = 64 * 1024 * 1024
+    GRAPHDB_MEMO_TTL_SECONDS: int = 3600
+    GRAPHDB_VERSION_POLL_SECONDS: int = 30
+    # Query profiling: slow-query threshold, slow-query log length, capture onto:explain plans
+    GRAPHDB_SLOW_QUERY_MS: float = 1000.0
+    GRAPHDB_SLOW_QUERY_LOG_SIZE: int = 100
+    GRAPHDB_EXPLAIN_SLOW_QUERIES: bool = True
+    # Bulk loading (ops): triples per chunk, uploads in flight, retries per chunk, gzip request bodies
+    GRAPHDB_BULK_CHUNK_TRIPLES: int = 50000
+    GRAPHDB_BULK_PARALLELISM: int = 4
+    GRAPHDB_BULK_MAX_RETRIES: int = 5
+    GRAPHDB_BULK_GZIP: bool = True
+    GRAPHDB_BULK_TIMEOUT_SECONDS: float = 300.0
 
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
@@ -39,6 +86,10 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Admin API (/api/v1/admin); off unless enabled, token checked if set
+    ADMIN_ENABLED: bool = False
+    ADMIN_TOKEN: str = ""
+
     # Data Configuration
     DEFAULT_RADIUS_MILES: float = 25.0
     MAX_RADIUS_MILES: float = 100.0
@@ -48,6 +99,36 @@ class Settings(BaseSettings):
     # Feature Flags
     ENABLE_CACHING: bool = True
     CACHE_TTL_SECONDS: int = 300
+    NEGATIVE_CACHE_TTL_SECONDS: int = 60
+    # How long expired search results are kept as a stale fallback while GraphDB is down
+    CACHE_STALE_TTL_SECONDS: int = 86400
+    SYMPTOM_FILTER_REFRESH_SECONDS: int = 300
+    CACHE_COMPRESS_PAYLOADS: bool = True
+    CACHE_COMPRESSION_LEVEL: int = 6
+
+    # Semantic Symptom Search
+    SEMANTIC_SEARCH_ENABLED: bool = True
+    SEMANTIC_INDEX_PATH: str = ""
+    SEMANTIC_INDEX_DIM: int = 4096
+    # Paraphrases like "can't breathe" score ~0.2-0.25; unrelated n-gram
+    # overlaps are ruled out by the index's word-coverage check instead
+    SEMANTIC_MIN_SCORE: float = 0.2
+    SEMANTIC_MIN_MARGIN: float = 0.04
+    SEMANTIC_INDEX_REFRESH_SECONDS: int = 300
+
+    # Batch Search
+    BATCH_SEARCH_CONCURRENCY: int = 8
+
+    # Cache Warming
+    CACHE_WARM_ON_STARTUP: bool = True
+    CACHE_WARM_TOP_N: int = 50
+    CACHE_WARM_CONCURRENCY: int = 4
+    POPULARITY_FLUSH_SECONDS: int = 60
+    POPULARITY_HALF_LIFE_HOURS: float = 168.0
+
+    # Health Checks: background probe interval and per-probe timeout
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 10.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
 
     @property
     def cors_origins_list(self) -> List[str]:
@@ -57,5 +138,15 @@ class Settings(BaseSettings):
         except:
             return ["http://localhost:5173"]
 
+    @property
+    def graphdb_replica_urls_list(self) -> List[str]:
+        """Parse GraphDB replica URLs from JSON string."""
+        if not self.GRAPHDB_REPLICA_URLS:
+            return []
+        try:
+            return json.loads(self.GRAPHDB_REPLICA_URLS)
+        except:
+            return []
+
 
 settings = Settings()
@@ -0,0 +1,88 @@
+from typing import Dict, Any, List, Union
+import json
+import zlib
+from app.core.config import settings
+
+# Format marker + version, so the layout can evolve without breaking old entries
+MAGIC = b"HNC1"
+
+# Provider fields that are identical for every provider at the same hospital
+HOSPITAL_FIELDS = ("hospitalId", "hospitalName", "hcahpsScore", "lat", "lng", "phone", "address")
+
+
+def _pack_providers(providers: List[Dict[str, Any]]) -> Union[List, Dict[str, Any]]:
+    """Convert providers to a columnar layout with a shared hospital table."""
+    if not providers:
+        return providers
+
+    fields = list(providers[0].keys())
+    if any(list(p.keys()) != fields for p in providers):
+        # Heterogeneous records: keep as-is
+        return providers
+
+    shared = [f for f in HOSPITAL_FIELDS if f in fields]
+    own = [f for f in fields if f not in shared]
+
+    hospitals: List[List[Any]] = []
+    hospital_index: Dict[tuple, int] = {}
+    rows = []
+    try:
+        for provider in providers:
+            hospital = tuple(provider[f] for f in shared)
+            index = hospital_index.get(hospital)
+            if index is None:
+                index = hospital_index[hospital] = len(hospitals)
+                hospitals.append(list(hospital))
+            rows.append([provider[f] for f in own] + [index])
+    except TypeError:
+        # Unhashable hospital values: keep as-is
+        return providers
+
+    return {
+        "fields": fields,
+        "own": own,
+        "shared": shared,
+        "hospitals": hospitals,
+        "rows": rows
+    }
+
+
+def _unpack_providers(packed: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rebuild provider dicts from the columnar layout."""
+    fields, own, shared = packed["fields"], packed["own"], packed["shared"]
+    hospitals = [dict(zip(shared, h)) for h in packed["hospitals"]]
+
+    providers = []
+    for row in packed["rows"]:
+        values = dict(zip(own, row))
+        values.update(hospitals[row[-1]])
+        providers.append({f: values[f] for f in fields})
+    return providers
+
+
+def encode_search_result(result: Dict[str, Any]) -> bytes:
+    """
+    Encode a search result to compressed bytes.
+
+    Providers are stored column-wise: field names are written once and the
+    hospital fields repeated for every provider at the same hospital are
+    factored out into a shared table. The result is serialized as compact
+    JSON and zlib-compressed.
+    """
+    data = dict(result)
+    if isinstance(data.get("providers"), list):
+        data["providers"] = _pack_providers(data["providers"])
+
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return MAGIC + zlib.compress(raw, settings.CACHE_COMPRESSION_LEVEL)
+
+
+def decode_search_result(payload: bytes) -> Dict[str, Any]:
+    """Decode bytes produced by `encode_search_result`."""
+    if not payload.startswith(MAGIC):
+        raise ValueError("Unknown cache payload format")
+
+    data = json.loads(zlib.decompress(payload[len(MAGIC):]))
+    if isinstance(data.get("providers"), dict):
+        data["providers"] = _unpack_providers(data["providers"])
+    return data
@@ -0,0 +1,129 @@
+from typing import Dict, Any, Callable, Optional
+from contextlib import asynccontextmanager
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class GraphDBUnavailableError(Exception):
+    """Raised when a GraphDB call is short-circuited because the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with closed, open and half-open states.
+
+    While closed, calls go through; `failure_threshold` consecutive failures
+    open the breaker. A call slower than `slow_call_seconds` counts as a
+    failure even if it succeeds, so a GraphDB that degrades into multi-second
+    responses trips the breaker just like one that errors. While open, calls
+    fail immediately with GraphDBUnavailableError. After `reset_seconds` the
+    breaker goes half-open and lets a single trial call through: success
+    closes it, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        slow_call_seconds: float,
+        reset_seconds: float,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.is_failure = is_failure or (lambda exc: True)
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+        self.short_circuited = 0
+        self.slow_calls = 0
+        self.times_opened = 0
+        self.last_failure: Optional[str] = None
+
+    def _open(self, reason: str):
+        if self.state != OPEN:
+            self.times_opened += 1
+            logger.warning(f"GraphDB circuit breaker opened: {reason}")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def _close(self):
+        if self.state != CLOSED:
+            logger.info("GraphDB circuit breaker closed")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+
+    def _record_failure(self, reason: str):
+        self.consecutive_failures += 1
+        self.last_failure = reason
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open(reason)
+
+    def _record_success(self, elapsed: float):
+        if elapsed > self.slow_call_seconds:
+            self.slow_calls += 1
+            self._record_failure(f"slow call ({elapsed:.2f}s)")
+        else:
+            self._close()
+
+    def current_state(self) -> str:
+        """Current state, moving from open to half-open once the reset timeout passes."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+            logger.info("GraphDB circuit breaker half-open, allowing a trial call")
+        return self.state
+
+    @asynccontextmanager
+    async def guard(self):
+        """Run a call through the breaker, failing fast while it is open."""
+        state = self.current_state()
+        if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+            self.short_circuited += 1
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            raise GraphDBUnavailableError(
+                f"GraphDB circuit open after repeated failures; retrying in {retry_in:.0f}s"
+            )
+
+        trial = state == HALF_OPEN
+        if trial:
+            self._trial_in_flight = True
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            if self.is_failure(e):
+                self._record_failure(f"{type(e).__name__}: {e}")
+            elif trial:
+                # Inconclusive trial; let the next call probe again
+                self.state = OPEN
+                self.opened_at = time.monotonic() - self.reset_seconds
+            raise
+        else:
+            self._record_success(time.monotonic() - start)
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and counters."""
+        return {
+            "state": self.current_state(),
+            "consecutiveFailures": self.consecutive_failures,
+            "failureThreshold": self.failure_threshold,
+            "slowCallSeconds": self.slow_call_seconds,
+            "resetSeconds": self.reset_seconds,
+            "timesOpened": self.times_opened,
+            "shortCircuited": self.short_circuited,
+            "slowCalls": self.slow_calls,
+            "lastFailure": self.last_failure
+        }
@@ -0,0 +1,182 @@
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+import hashlib
+import json
+import pyoxigraph
+
+# Subject IRI → its triples as sorted N-Triples lines
+SubjectTriples = Dict[str, List[str]]
+
+# Subject IRI → canonical N-Triples line → the line as stored
+StoredTriples = Dict[str, Dict[str, str]]
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+XSD_STRING = f"{XSD}string"
+
+# Stores may rewrite typed literals (e.g. "74.0" → "74"), so triples are
+# compared on canonical lexical forms
+CANONICAL_FORMS = {
+    f"{XSD}decimal": lambda value: format(Decimal(value).normalize(), "f"),
+    f"{XSD}integer": lambda value: str(int(value)),
+    f"{XSD}double": lambda value: repr(float(value)),
+    f"{XSD}float": lambda value: repr(float(value)),
+    f"{XSD}boolean": lambda value: "true" if value.strip() in ("true", "1") else "false",
+}
+
+# SPARQL updates larger than this are split across statements
+DELTA_BATCH_TRIPLES = 5000
+
+
+def canonical_line(subject, predicate, obj) -> str:
+    """N-Triples line for a triple of pyoxigraph terms, with a canonical object literal."""
+    if isinstance(obj, pyoxigraph.Literal) and obj.datatype.value in CANONICAL_FORMS:
+        try:
+            obj = pyoxigraph.Literal(CANONICAL_FORMS[obj.datatype.value](obj.value), datatype=obj.datatype)
+        except (ValueError, ArithmeticError):
+            pass
+    return f"{subject} {predicate} {obj} ."
+
+
+def read_subjects(paths: Iterable[Path]) -> SubjectTriples:
+    """Parse Turtle files and group their triples by subject."""
+    subjects: Dict[str, Set[str]] = {}
+    for path in paths:
+        for triple in pyoxigraph.parse(path=str(path), format=pyoxigraph.RdfFormat.TURTLE):
+            if isinstance(triple.subject, pyoxigraph.BlankNode) or isinstance(triple.object, pyoxigraph.BlankNode):
+                # Blank node labels change between parses, so they can't be matched
+                raise ValueError(f"{path.name}: blank nodes can't be delta loaded ({triple})")
+            line = canonical_line(triple.subject, triple.predicate, triple.object)
+            subjects.setdefault(triple.subject.value, set()).add(line)
+
+    return {subject: sorted(lines) for subject, lines in subjects.items()}
+
+
+def subject_hash(lines: List[str]) -> str:
+    """Content hash of one subject's (sorted) triples."""
+    return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def subject_hashes(subjects: SubjectTriples) -> Dict[str, str]:
+    return {subject: subject_hash(lines) for subject, lines in subjects.items()}
+
+
+def binding_term(binding: Dict[str, str]):
+    """pyoxigraph term for a SPARQL JSON result term."""
+    if binding["type"] == "uri":
+        return pyoxigraph.NamedNode(binding["value"])
+    if binding["type"] == "bnode":
+        raise ValueError("Blank nodes can't be delta loaded")
+    if "xml:lang" in binding:
+        return pyoxigraph.Literal(binding["value"], language=binding["xml:lang"])
+    datatype = binding.get("datatype", XSD_STRING)
+    return pyoxigraph.Literal(binding["value"], datatype=pyoxigraph.NamedNode(datatype))
+
+
+def triples_query(subjects: List[str], graph: Optional[str] = None) -> str:
+    """SELECT every triple of the given subjects, from one named graph if given."""
+    values = " ".join(f"<{subject}>" for subject in subjects)
+    pattern = f"GRAPH <{graph}> {{ ?s ?p ?o }}" if graph else "?s ?p ?o"
+    return f"SELECT ?s ?p ?o WHERE {{ VALUES ?s {{ {values} }} {pattern} }}"
+
+
+def rows_to_subjects(bindings: List[Dict[str, Any]]) -> StoredTriples:
+    """Group SPARQL JSON ?s ?p ?o bindings by subject, keyed by canonical line."""
+    subjects: StoredTriples = {}
+    for binding in bindings:
+        s, p, o = (binding_term(binding[name]) for name in ("s", "p", "o"))
+        subjects.setdefault(s.value, {})[canonical_line(s, p, o)] = f"{s} {p} {o} ."
+    return subjects
+
+
+@dataclass
+class DatasetDelta:
+    """Triples to delete and insert to turn one dataset into another."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+    inserts: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.deletes and not self.inserts
+
+
+def changed_subjects(
+    old_hashes: Dict[str, str],
+    new_hashes: Dict[str, str]
+) -> Tuple[List[str], List[str], List[str]]:
+    """Subjects (added, changed, removed) between two sets of subject hashes."""
+    added = sorted(subject for subject in new_hashes if subject not in old_hashes)
+    changed = sorted(
+        subject for subject, digest in new_hashes.items()
+        if subject in old_hashes and old_hashes[subject] != digest
+    )
+    removed = sorted(subject for subject in old_hashes if subject not in new_hashes)
+    return added, changed, removed
+
+
+def compute_delta(
+    old_hashes: Dict[str, str],
+    new_subjects: SubjectTriples,
+    old_subjects: StoredTriples
+) -> DatasetDelta:
+    """
+    Triple-level delta between the loaded dataset and a new one.
+
+    Only subjects whose hash changed are compared; `old_subjects` needs the
+    currently loaded triples of the changed and removed subjects only.
+    Deletes use the triples as stored, so they match the store's literals.
+    """
+    new_hashes = subject_hashes(new_subjects)
+    added, changed, removed = changed_subjects(old_hashes, new_hashes)
+    delta = DatasetDelta(added=added, changed=changed, removed=removed)
+
+    for subject in added:
+        delta.inserts.extend(new_subjects[subject])
+    for subject in changed:
+        old_lines = old_subjects.get(subject, {})
+        new_lines = set(new_subjects[subject])
+        delta.deletes.extend(sorted(line for key, line in old_lines.items() if key not in new_lines))
+        delta.inserts.extend(line for line in new_subjects[subject] if line not in old_lines)
+    for subject in removed:
+        delta.deletes.extend(sorted(old_subjects.get(subject, {}).values()))
+
+    return delta
+
+
+def _data_block(operation: str, lines: List[str], graph: Optional[str]) -> List[str]:
+    statements = []
+    for start in range(0, len(lines), DELTA_BATCH_TRIPLES):
+        body = "\n".join(lines[start:start + DELTA_BATCH_TRIPLES])
+        if graph:
+            body = f"GRAPH <{graph}> {{\n{body}\n}}"
+        statements.append(f"{operation} {{\n{body}\n}}")
+    return statements
+
+
+def delta_update(delta: DatasetDelta, graph: Optional[str] = None) -> str:
+    """SPARQL update applying a delta (deletes first), into one named graph if given."""
+    statements = _data_block("DELETE DATA", delta.deletes, graph)
+    statements += _data_block("INSERT DATA", delta.inserts, graph)
+    return " ;\n".join(statements)
+
+
+def write_manifest(path: Path, version: str, graph: Optional[str], hashes: Dict[str, str]):
+    """Record the subject hashes of a loaded dataset version."""
+    manifest = {"version": version, "graph": graph, "subjects": hashes}
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+    tmp_path.replace(path)
+
+
+def read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    """The manifest of the last loaded dataset, or None if there isn't one."""
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
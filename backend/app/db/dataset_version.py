@@ -0,0 +1,56 @@
+from typing import Optional
+from datetime import datetime, timezone
+import uuid
+from app.db.sparql_templates import sparql_string
+
+# The loaded dataset is stamped with a version marker triple; the API watches
+# it to invalidate query-level caches when the repository is reloaded
+DATASET_IRI = "http://example.org/healthnav#currentDataset"
+VERSION_PREDICATE = "http://example.org/healthnav#datasetVersion"
+
+# Versioned loads put each dataset in its own named graph; the marker's
+# active-graph pointer says which one queries read
+ACTIVE_GRAPH_PREDICATE = "http://example.org/healthnav#activeGraph"
+GRAPH_PREFIX = "http://example.org/healthnav/graph/"
+
+# Reported when the repository has no version marker (e.g. loaded by hand)
+UNVERSIONED = "unversioned"
+
+
+def new_dataset_version() -> str:
+    """A fresh, sortable dataset version identifier."""
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{timestamp}-{uuid.uuid4().hex[:8]}"
+
+
+def dataset_graph(version: str) -> str:
+    """The named graph holding a dataset version."""
+    return f"{GRAPH_PREFIX}{version}"
+
+
+def version_triple(version: str) -> str:
+    """The version marker as an N-Triples/Turtle statement."""
+    return f"<{DATASET_IRI}> <{VERSION_PREDICATE}> {sparql_string(version)} ."
+
+
+def activation_update(version: str, graph: Optional[str] = None) -> str:
+    """
+    SPARQL update that points the marker at a new version, as one transaction.
+
+    With a graph, queries switch to reading only that named graph; without
+    one, any active-graph pointer is dropped and queries read the whole
+    repository (for loads straight into the default graph).
+    """
+    statements = version_triple(version)
+    if graph is not None:
+        statements += f" <{DATASET_IRI}> <{ACTIVE_GRAPH_PREDICATE}> <{graph}> ."
+    return (
+        f"DELETE WHERE {{ <{DATASET_IRI}> <{VERSION_PREDICATE}> ?version }} ;\n"
+        f"DELETE WHERE {{ <{DATASET_IRI}> <{ACTIVE_GRAPH_PREDICATE}> ?graph }} ;\n"
+        f"INSERT DATA {{ {statements} }}"
+    )
+
+
+def version_update(version: str) -> str:
+    """SPARQL update replacing the dataset version marker for an in-place load."""
+    return activation_update(version)
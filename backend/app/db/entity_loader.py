@@ -0,0 +1,82 @@
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
+import logging
+from app.core.config import settings
+from app.db.graphdb import GraphDBClient, graphdb_client
+
+logger = logging.getLogger(__name__)
+
+
+class EntityLoader:
+    """
+    Request-scoped batching loader for hospital and provider lookups.
+
+    Every `load()` made in the same event-loop tick is queued and sent as
+    one `VALUES ?id { ... }` query per entity type (split into batches of
+    GRAPHDB_LOADER_MAX_BATCH), then fanned back out to the callers. Results
+    are cached for the life of the loader, so repeated lookups of one ID
+    cost nothing. Create one loader per request (see `get_entity_loader`);
+    sharing one across requests would serve stale entities forever.
+    """
+
+    def __init__(self, client: GraphDBClient, max_batch: Optional[int] = None):
+        self.client = client
+        self.max_batch = max_batch or settings.GRAPHDB_LOADER_MAX_BATCH
+        self._futures: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._queued: Dict[str, List[str]] = {}
+        self._scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def load(self, kind: str, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get one hospital or provider by ID, or None if it doesn't exist."""
+        key = (kind, entity_id)
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._queued.setdefault(kind, []).append(entity_id)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # A cancelled caller must not cancel the lookup other callers share
+        return await asyncio.shield(future)
+
+    async def load_many(self, kind: str, entity_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Get several entities of one kind, in order, with None for unknown IDs."""
+        return list(await asyncio.gather(*(self.load(kind, entity_id) for entity_id in entity_ids)))
+
+    def _dispatch(self):
+        self._scheduled = False
+        queued, self._queued = self._queued, {}
+        for kind, ids in queued.items():
+            for start in range(0, len(ids), self.max_batch):
+                task = asyncio.create_task(self._fetch(kind, ids[start:start + self.max_batch]))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, kind: str, ids: List[str]):
+        self.batches += 1
+        try:
+            entities = await self.client.get_entities_by_id(kind, ids)
+        except asyncio.CancelledError:
+            for entity_id in ids:
+                self._futures.pop((kind, entity_id)).cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batched {kind} lookup of {len(ids)} IDs failed: {e}")
+            for entity_id in ids:
+                # Let a later load() retry instead of caching the failure
+                future = self._futures.pop((kind, entity_id))
+                future.set_exception(e)
+                future.exception()
+            return
+
+        for entity_id in ids:
+            self._futures[(kind, entity_id)].set_result(entities.get(entity_id))
+
+
+def get_entity_loader() -> EntityLoader:
+    """FastAPI dependency: a fresh loader for each request."""
+    return EntityLoader(graphdb_client)
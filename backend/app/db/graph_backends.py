@@ -0,0 +1,486 @@
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Deque
+from collections import deque
+from pathlib import Path
+import asyncio
+import hashlib
+import logging
+import time
+import httpx
+import pyoxigraph
+from app.core.config import settings
+from app.db.sparql_results import MEDIA_TYPES, PARSERS, STREAM_PARSERS, Row
+from app.db.dataset_version import version_triple
+
+logger = logging.getLogger(__name__)
+
+# Backend names for GRAPH_BACKEND
+GRAPHDB = "graphdb"
+EMBEDDED = "embedded"
+
+# Recent query latencies kept by a replica pool for its hedging quantile
+LATENCY_WINDOW = 200
+# An idle replica's latency estimate halves every this many seconds, so one
+# slow response doesn't keep it out of rotation for good
+IDLE_HALF_LIFE_SECONDS = 10.0
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class RowStream:
+    """Rows of an opened streaming query; close it to release the underlying resources."""
+
+    def __init__(
+        self,
+        rows: AsyncIterator[Row],
+        close: Optional[Callable[[], Awaitable[None]]] = None
+    ):
+        self._rows = rows
+        self._close = close
+
+    def __aiter__(self) -> AsyncIterator[Row]:
+        return self._rows.__aiter__()
+
+    async def aclose(self):
+        if self._close is not None:
+            await self._close()
+
+
+class GraphBackend:
+    """
+    Transport that executes SPARQL for GraphDBClient.
+
+    Backends return flat rows (variable name → lexical value); scheduling,
+    circuit breaking and templates stay in GraphDBClient.
+    """
+
+    name = "base"
+    endpoint = ""
+    # Whether queries FROM onto:explain return a GraphDB query plan
+    supports_explain = False
+
+    async def start(self):
+        """Prepare the backend (load data, warm connections)."""
+
+    async def close(self):
+        """Release connections and other resources."""
+
+    async def query(self, sparql_query: str, result_format: str) -> List[Row]:
+        """Execute a query and return all rows."""
+        raise NotImplementedError
+
+    async def open_stream(self, sparql_query: str, result_format: str) -> RowStream:
+        """Start a query and return its rows as a stream."""
+        raise NotImplementedError
+
+
+class HttpGraphBackend(GraphBackend):
+    """SPARQL over HTTP to a GraphDB repository, with pooled keep-alive connections."""
+
+    name = GRAPHDB
+    supports_explain = True
+
+    def __init__(self, base_url: Optional[str] = None):
+        base_url = (base_url or settings.GRAPHDB_URL).rstrip("/")
+        self.endpoint = f"{base_url}/repositories/{settings.GRAPHDB_REPOSITORY}"
+
+        self.auth = None
+        if settings.GRAPHDB_USERNAME and settings.GRAPHDB_PASSWORD:
+            self.auth = (settings.GRAPHDB_USERNAME, settings.GRAPHDB_PASSWORD)
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        """Get the pooled keep-alive HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            if self._http is not None and not self._http.is_closed:
+                self._discard_client(self._http, self._http_loop)
+            self._http = httpx.AsyncClient(
+                auth=self.auth,
+                timeout=httpx.Timeout(
+                    settings.GRAPHDB_TIMEOUT_SECONDS,
+                    connect=settings.GRAPHDB_CONNECT_TIMEOUT_SECONDS
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.GRAPHDB_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GRAPHDB_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.GRAPHDB_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                headers={
+                    "Accept-Encoding": "gzip" if settings.GRAPHDB_GZIP else "identity"
+                }
+            )
+            self._http_loop = loop
+        return self._http
+
+    @staticmethod
+    def _discard_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client left behind by another event loop, on that loop if it still runs."""
+        if loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        # The loop is gone and its sockets with it; closing may still fail
+        # on transports bound to it, which is harmless
+        async def aclose():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Closing a GraphDB client from a closed event loop failed: {e}")
+
+        asyncio.get_running_loop().create_task(aclose())
+
+    async def close(self):
+        """Close pooled connections."""
+        if self._http is not None:
+            if self._http_loop is asyncio.get_running_loop():
+                await self._http.aclose()
+            else:
+                self._discard_client(self._http, self._http_loop)
+            self._http = None
+            self._http_loop = None
+
+    async def query(self, sparql_query: str, result_format: str) -> List[Row]:
+        """POST the query and parse the whole response."""
+        response = await self._client().post(
+            self.endpoint,
+            data={"query": sparql_query},
+            headers={"Accept": MEDIA_TYPES[result_format]}
+        )
+        response.raise_for_status()
+        return PARSERS[result_format](response.text)
+
+    async def open_stream(self, sparql_query: str, result_format: str) -> RowStream:
+        """POST the query and return once response headers arrive; rows parse as the body streams."""
+        client = self._client()
+        request = client.build_request(
+            "POST",
+            self.endpoint,
+            data={"query": sparql_query},
+            headers={"Accept": MEDIA_TYPES[result_format]}
+        )
+        response = await client.send(request, stream=True)
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            await response.aclose()
+            raise
+
+        return RowStream(
+            STREAM_PARSERS[result_format](response.aiter_text()),
+            response.aclose
+        )
+
+
+class EmbeddedGraphBackend(GraphBackend):
+    """
+    In-process SPARQL store (pyoxigraph) loaded from the ontology and TTL files.
+
+    Answers the same templates as GraphDB without a network hop, for
+    development, benchmarks and small deployments. Queries run in a worker
+    thread so large ones don't block the event loop.
+    """
+
+    name = EMBEDDED
+
+    def __init__(self, paths: List[Path]):
+        self.paths = paths
+        self.endpoint = "embedded:" + ",".join(path.name for path in paths)
+        self._store = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _load(self):
+        """Build a store from the RDF files (blocking)."""
+        store = pyoxigraph.Store()
+        fingerprint = hashlib.sha1()
+        for path in self.paths:
+            store.bulk_load(path=str(path), format=pyoxigraph.RdfFormat.TURTLE)
+            stat = path.stat()
+            fingerprint.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+
+        # Version the dataset by its files, like the GraphDB loaders do
+        store.load(
+            version_triple(f"files-{fingerprint.hexdigest()[:16]}").encode(),
+            format=pyoxigraph.RdfFormat.N_TRIPLES
+        )
+        logger.info(f"Embedded graph loaded {len(store)} triples from {len(self.paths)} files")
+        return store
+
+    async def _ensure_loaded(self):
+        if self._store is not None:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._store is None:
+                self._store = await asyncio.to_thread(self._load)
+
+    async def start(self):
+        """Load the RDF files now instead of on the first query."""
+        await self._ensure_loaded()
+
+    def _execute(self, sparql_query: str) -> List[Row]:
+        results = self._store.query(sparql_query)
+        if not isinstance(results, pyoxigraph.QuerySolutions):
+            return []
+
+        names = [variable.value for variable in results.variables]
+        return [
+            {name: term.value for name, term in zip(names, solution) if term is not None}
+            for solution in results
+        ]
+
+    async def query(self, sparql_query: str, result_format: str) -> List[Row]:
+        """Execute the query in-process; rows are already flat, so the format is ignored."""
+        await self._ensure_loaded()
+        return await asyncio.to_thread(self._execute, sparql_query)
+
+    async def open_stream(self, sparql_query: str, result_format: str) -> RowStream:
+        """Execute the query in-process and stream the materialized rows."""
+        rows = await self.query(sparql_query, result_format)
+
+        async def iterate() -> AsyncIterator[Row]:
+            for row in rows:
+                yield row
+
+        return RowStream(iterate())
+
+
+def _replica_failed(exc: BaseException) -> bool:
+    """Whether an error means the replica itself is unhealthy (not a bad query)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+class Replica:
+    """One endpoint of a replica pool with its latency and health state."""
+
+    def __init__(self, backend: GraphBackend):
+        self.backend = backend
+        self.ewma: Optional[float] = None
+        self.last_used = 0.0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+        self.requests = 0
+        self.failures = 0
+        self.times_ejected = 0
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def expected_latency(self, now: float) -> float:
+        """EWMA latency, decayed while idle; 0 until measured so new replicas get tried."""
+        if self.ewma is None:
+            return 0.0
+        return self.ewma * 0.5 ** ((now - self.last_used) / IDLE_HALF_LIFE_SECONDS)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "endpoint": self.backend.endpoint,
+            "ewmaMs": round(self.ewma * 1000, 2) if self.ewma is not None else None,
+            "inFlight": self.in_flight,
+            "available": self.available(now),
+            "ejectedForSeconds": round(max(0.0, self.ejected_until - now), 1),
+            "consecutiveFailures": self.consecutive_failures,
+            "requests": self.requests,
+            "failures": self.failures,
+            "timesEjected": self.times_ejected
+        }
+
+
+class ReplicaPoolBackend(GraphBackend):
+    """
+    Read-only GraphDB replicas behind one backend.
+
+    Each query goes to the available replica with the lowest recent latency
+    (an exponentially weighted moving average); replicas not yet measured
+    are tried first. A replica that fails GRAPHDB_REPLICA_EJECT_FAILURES
+    times in a row is ejected for GRAPHDB_REPLICA_EJECT_SECONDS and the query
+    fails over to the next one. With GRAPHDB_HEDGE_READS, a query still
+    running after the pool's p95 latency is duplicated to the next best
+    replica and the first response wins, trimming the latency tail at the
+    cost of roughly 5% extra reads.
+    """
+
+    name = "replicas"
+    supports_explain = True
+
+    def __init__(self, backends: List[GraphBackend]):
+        self.replicas = [Replica(backend) for backend in backends]
+        self.endpoint = ",".join(backend.endpoint for backend in backends)
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    async def start(self):
+        await asyncio.gather(*(replica.backend.start() for replica in self.replicas))
+
+    async def close(self):
+        await asyncio.gather(*(replica.backend.close() for replica in self.replicas))
+
+    def _ranked(self, exclude: List[Replica] = ()) -> List[Replica]:
+        """Candidate replicas, best first; ejected ones only if nothing else is left."""
+        now = time.monotonic()
+        candidates = [r for r in self.replicas if r not in exclude]
+        available = [r for r in candidates if r.available(now)]
+        if available:
+            return sorted(available, key=lambda r: (r.expected_latency(now), r.in_flight))
+        # Everything is ejected: fail open, soonest-back replica first
+        return sorted(candidates, key=lambda r: r.ejected_until)
+
+    def hedge_delay(self) -> Optional[float]:
+        """The p95 query latency, or None until enough queries have been measured."""
+        if len(self._latencies) < settings.GRAPHDB_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _record_latency(self, replica: Replica, elapsed: float, sample: bool = True):
+        alpha = settings.GRAPHDB_REPLICA_EWMA_ALPHA
+        replica.ewma = elapsed if replica.ewma is None else alpha * elapsed + (1 - alpha) * replica.ewma
+        replica.last_used = time.monotonic()
+        if sample:
+            self._latencies.append(elapsed)
+
+    def _record_failure(self, replica: Replica, exc: BaseException):
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= settings.GRAPHDB_REPLICA_EJECT_FAILURES:
+            replica.ejected_until = time.monotonic() + settings.GRAPHDB_REPLICA_EJECT_SECONDS
+            replica.consecutive_failures = 0
+            replica.times_ejected += 1
+            logger.warning(f"Ejected GraphDB replica {replica.backend.endpoint}: {exc}")
+
+    async def _query_replica(self, replica: Replica, sparql_query: str, result_format: str) -> List[Row]:
+        replica.requests += 1
+        replica.in_flight += 1
+        start = time.monotonic()
+        try:
+            rows = await replica.backend.query(sparql_query, result_format)
+        except asyncio.CancelledError:
+            # Lost a hedge race: it took at least this long
+            self._record_latency(replica, time.monotonic() - start, sample=False)
+            raise
+        except Exception as e:
+            if _replica_failed(e):
+                self._record_failure(replica, e)
+            raise
+        finally:
+            replica.in_flight -= 1
+
+        replica.consecutive_failures = 0
+        self._record_latency(replica, time.monotonic() - start)
+        return rows
+
+    async def _hedged(
+        self,
+        primary: Replica,
+        backup: Replica,
+        delay: float,
+        sparql_query: str,
+        result_format: str
+    ) -> List[Row]:
+        """Query `primary`, duplicating to `backup` if it hasn't answered within `delay`."""
+        first = asyncio.create_task(self._query_replica(primary, sparql_query, result_format))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.hedged += 1
+        second = asyncio.create_task(self._query_replica(backup, sparql_query, result_format))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both failed; report the primary's error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def query(self, sparql_query: str, result_format: str) -> List[Row]:
+        """Query the best replica, hedging slow queries and failing over on replica errors."""
+        tried: List[Replica] = []
+        while True:
+            ranked = self._ranked(exclude=tried)
+            primary = ranked[0]
+            delay = self.hedge_delay() if settings.GRAPHDB_HEDGE_READS else None
+            try:
+                if delay is not None and len(ranked) > 1:
+                    tried.append(ranked[1])
+                    return await self._hedged(primary, ranked[1], delay, sparql_query, result_format)
+                return await self._query_replica(primary, sparql_query, result_format)
+            except Exception as e:
+                tried.append(primary)
+                if not _replica_failed(e) or len(tried) >= len(self.replicas):
+                    raise
+                self.failovers += 1
+                logger.warning(f"GraphDB replica {primary.backend.endpoint} failed ({e}); failing over")
+
+    async def open_stream(self, sparql_query: str, result_format: str) -> RowStream:
+        """Open the stream on the best replica, failing over if it can't be opened (streams aren't hedged)."""
+        tried: List[Replica] = []
+        while True:
+            replica = self._ranked(exclude=tried)[0]
+            replica.requests += 1
+            try:
+                return await replica.backend.open_stream(sparql_query, result_format)
+            except Exception as e:
+                tried.append(replica)
+                if not _replica_failed(e):
+                    raise
+                self._record_failure(replica, e)
+                if len(tried) >= len(self.replicas):
+                    raise
+                self.failovers += 1
+                logger.warning(f"GraphDB replica {replica.backend.endpoint} failed ({e}); failing over")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-replica latency and health, with hedging counters."""
+        now = time.monotonic()
+        delay = self.hedge_delay()
+        return {
+            "replicas": [replica.stats(now) for replica in self.replicas],
+            "hedgeReads": settings.GRAPHDB_HEDGE_READS,
+            "hedgeDelayMs": round(delay * 1000, 2) if delay is not None else None,
+            "hedged": self.hedged,
+            "hedgeWins": self.hedge_wins,
+            "failovers": self.failovers
+        }
+
+
+def embedded_graph_files() -> List[Path]:
+    """The ontology followed by the TTL data files, as configured."""
+    ontology = Path(settings.EMBEDDED_ONTOLOGY_PATH or BACKEND_DIR.parent / "HealthcareNavigator_Team4.owl")
+    ttl_dir = Path(settings.EMBEDDED_TTL_DIR or BACKEND_DIR / "ops" / "ttl_data")
+
+    paths = [ontology] if ontology.exists() else []
+    if not paths:
+        logger.warning(f"Ontology not found at {ontology}; loading data files only")
+    paths.extend(sorted(ttl_dir.glob("*.ttl")))
+    return paths
+
+
+def create_backend(name: Optional[str] = None) -> GraphBackend:
+    """Create the graph backend selected by GRAPH_BACKEND."""
+    name = name or settings.GRAPH_BACKEND
+    if name == GRAPHDB:
+        urls = settings.graphdb_replica_urls_list
+        if len(urls) > 1:
+            return ReplicaPoolBackend([HttpGraphBackend(url) for url in urls])
+        return HttpGraphBackend(urls[0] if urls else None)
+    if name == EMBEDDED:
+        return EmbeddedGraphBackend(embedded_graph_files())
+    raise ValueError(f"Unknown GRAPH_BACKEND '{name}' (expected '{GRAPHDB}' or '{EMBEDDED}')")
@@ -1,57 +1,300 @@
-from SPARQLWrapper import SPARQLWrapper, JSON
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Deque, Set
+from collections import deque
+from contextlib import aclosing
+import asyncio
 import logging
+import time
+import httpx
 from app.core.config import settings
+from app.db.scheduler import QueryScheduler, GraphDBOverloadedError
+from app.db.circuit_breaker import CircuitBreaker, GraphDBUnavailableError
+from app.db.sparql_templates import get_template, with_default_graph
+from app.db.sparql_results import JSON, Row
+from app.db.graph_backends import GraphBackend, create_backend
+from app.db.query_memo import QueryMemo
+from app.db.query_profiler import QueryProfiler, EXPLAIN, explain_query, result_size
+from app.db.dataset_version import UNVERSIONED
+from app.services.geo import bounding_box
 
 logger = logging.getLogger(__name__)
 
+# Paged entity catalogs: page template, count template, IRI variable
+ENTITY_CATALOGS = {
+    "hospitals": ("hospitals_page", "hospital_count", "hospital"),
+    "pharmacies": ("pharmacies_page", "pharmacy_count", "pharmacy"),
+    "providers": ("providers_page", "provider_count", "physician"),
+}
 
-class GraphDBClient:
-    """Client for interacting with Ontotext GraphDB."""
+# Entity lookups by ID: template, IRI variable, ID variable
+ENTITY_LOOKUPS = {
+    "hospitals": ("hospitals_by_id", "hospital", "hospitalId"),
+    "providers": ("providers_by_id", "physician", "physicianId"),
+}
 
-    def __init__(self):
-        self.endpoint = f"{settings.GRAPHDB_URL}/repositories/{settings.GRAPHDB_REPOSITORY}"
-        self.sparql = SPARQLWrapper(self.endpoint)
-        self.sparql.setReturnFormat(JSON)
 
-        if settings.GRAPHDB_USERNAME and settings.GRAPHDB_PASSWORD:
-            self.sparql.setCredentials(
-                settings.GRAPHDB_USERNAME,
-                settings.GRAPHDB_PASSWORD
-            )
+def _is_outage(exc: BaseException) -> bool:
+    """Whether an error indicates GraphDB itself is failing (not a bad query)."""
+    if isinstance(exc, (GraphDBOverloadedError, SyntaxError)):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return True
 
-    async def query(self, sparql_query: str) -> List[Dict[str, Any]]:
-        """Execute a SPARQL query and return results."""
-        try:
-            import asyncio
 
-            def _execute_query():
-                """Helper to execute synchronous SPARQL query."""
-                self.sparql.setQuery(sparql_query)
-                return self.sparql.query().convert()
+class GraphDBClient:
+    """
+    Client for interacting with Ontotext GraphDB.
+
+    Queries run on the backend selected by GRAPH_BACKEND: GraphDB over
+    HTTP, or an embedded in-process store loaded from the TTL files.
+    """
+
+    def __init__(self, backend: Optional[GraphBackend] = None):
+        self.backend = backend or create_backend()
+        self.endpoint = self.backend.endpoint
+
+        self.scheduler = QueryScheduler(
+            max_concurrency=settings.GRAPHDB_MAX_CONCURRENT_QUERIES,
+            max_queue=settings.GRAPHDB_MAX_QUEUED_QUERIES,
+            queue_timeout=settings.GRAPHDB_QUEUE_TIMEOUT_SECONDS
+        )
+
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.GRAPHDB_BREAKER_FAILURE_THRESHOLD,
+            slow_call_seconds=settings.GRAPHDB_BREAKER_SLOW_CALL_SECONDS,
+            reset_seconds=settings.GRAPHDB_BREAKER_RESET_SECONDS,
+            is_failure=_is_outage
+        )
+
+        self.memo = QueryMemo(
+            max_bytes=settings.GRAPHDB_MEMO_MAX_BYTES,
+            ttl_seconds=settings.GRAPHDB_MEMO_TTL_SECONDS
+        )
+        self.dataset_version: Optional[str] = None
+        self.active_graph: Optional[str] = None
+        self._version_task: Optional[asyncio.Task] = None
+
+        self.profiler = QueryProfiler(
+            slow_ms=settings.GRAPHDB_SLOW_QUERY_MS,
+            slow_log_size=settings.GRAPHDB_SLOW_QUERY_LOG_SIZE
+        )
+        self._plan_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """Prepare the backend (the embedded store loads its data here) and watch the dataset version."""
+        if self._version_task is None:
+            self._version_task = asyncio.create_task(self._watch_dataset_version())
+        await self.backend.start()
+        logger.info(f"Graph backend: {self.backend.name} ({self.endpoint})")
+
+    async def close(self):
+        """Stop the version watcher and plan captures, and close pooled connections."""
+        if self._version_task is not None:
+            self._version_task.cancel()
+            try:
+                await self._version_task
+            except asyncio.CancelledError:
+                pass
+            self._version_task = None
+        for task in list(self._plan_tasks):
+            task.cancel()
+        await asyncio.gather(*self._plan_tasks, return_exceptions=True)
+        await self.backend.close()
+
+    async def refresh_dataset_version(self) -> Optional[str]:
+        """
+        Read the dataset version marker; a change invalidates memoized results.
 
-            # Run synchronous SPARQL query in thread pool to avoid blocking event loop
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(None, _execute_query)
+        Loaders stamp a new version after every (re)load, so the memo never
+        serves results from a previous dataset. Versioned loads also point
+        the marker at the version's named graph, which versioned templates
+        then read exclusively; the switch happens here, together with the
+        memo invalidation.
+        """
+        rows = await self.query_template("dataset_version")
+        version = rows[0].get("version", UNVERSIONED) if rows else UNVERSIONED
+        graph = rows[0].get("graph") if rows else None
+
+        if version != self.dataset_version or graph != self.active_graph:
+            if self.dataset_version is not None:
+                logger.info(f"Dataset version changed: {self.dataset_version} → {version}")
+                self.memo.clear()
+            if graph != self.active_graph:
+                logger.info(f"Reading dataset graph: {graph or 'whole repository'}")
+            self.dataset_version = version
+            self.active_graph = graph
+        return version
+
+    async def _watch_dataset_version(self):
+        while True:
+            try:
+                await self.refresh_dataset_version()
+            except Exception as e:
+                logger.warning(f"Dataset version check failed: {e}")
+            await asyncio.sleep(settings.GRAPHDB_VERSION_POLL_SECONDS)
+
+    @staticmethod
+    def _result_format(result_format: str) -> str:
+        """Resolve the results format, honouring the global override."""
+        return settings.GRAPHDB_RESULT_FORMAT or result_format
+
+    def _profile(
+        self,
+        template: Optional[str],
+        params: Optional[Dict[str, Any]],
+        sparql_query: str,
+        start: float,
+        rows: int,
+        size: int,
+        error: Optional[BaseException] = None
+    ):
+        """Record a query in the profiler and capture a plan if it was slow."""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        slow = self.profiler.record(template, params, elapsed_ms, rows, size, error)
+        if (
+            slow
+            and settings.GRAPHDB_EXPLAIN_SLOW_QUERIES
+            and self.backend.supports_explain
+            and self.profiler.wants_plan(template)
+        ):
+            task = asyncio.create_task(self._capture_plan(template, sparql_query))
+            self._plan_tasks.add(task)
+            task.add_done_callback(self._plan_tasks.discard)
+
+    async def _capture_plan(self, template: str, sparql_query: str):
+        """Ask GraphDB for the plan of a slow query (onto:explain) and keep it in the profiler."""
+        explain = explain_query(sparql_query)
+        if explain is None:
+            return
+        try:
+            rows = await self.query(explain, JSON, template=EXPLAIN)
+        except Exception as e:
+            logger.warning(f"Could not capture query plan for '{template}': {e}")
+            return
+        if rows:
+            plan = rows[0].get("plan") or "\n".join(rows[0].values())
+            self.profiler.record_plan(template, plan)
+
+    async def query(
+        self,
+        sparql_query: str,
+        result_format: str = JSON,
+        template: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        graph: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Execute a SPARQL query and return results.
 
-            if "results" in results and "bindings" in results["results"]:
-                return results["results"]["bindings"]
-            return []
+        Rows are flat dicts of variable name to lexical value, whatever
+        results format was negotiated with GraphDB. With `graph`, the query
+        reads only that named graph. Latency (excluding the scheduler
+        queue), rows and result size are profiled under `template`, or as
+        ad-hoc queries.
+        """
+        result_format = self._result_format(result_format)
+        if graph is not None:
+            sparql_query = with_default_graph(sparql_query, graph)
+        try:
+            async with self.scheduler.slot():
+                async with self.breaker.guard():
+                    start = time.perf_counter()
+                    try:
+                        rows = await self.backend.query(sparql_query, result_format)
+                    except Exception as e:
+                        self._profile(template, params, sparql_query, start, 0, 0, e)
+                        raise
+                    self._profile(template, params, sparql_query, start, len(rows), result_size(rows))
+                    return rows
+        except (GraphDBOverloadedError, GraphDBUnavailableError) as e:
+            logger.warning(f"GraphDB query rejected: {e}")
+            raise
         except Exception as e:
             logger.error(f"GraphDB query error: {e}")
             raise
 
+    async def query_template(self, name: str, **params: Any) -> List[Row]:
+        """
+        Execute a named SPARQL template with safely bound parameters.
+
+        Results are memoized per (dataset version, template, parameters);
+        treat the returned rows as read-only.
+        """
+        template = get_template(name)
+        sparql_query = template.bind(**params)
+        graph = self.active_graph if template.versioned else None
+        if not (template.memoize and self.memo.enabled):
+            return await self.query(sparql_query, template.result_format, name, params, graph)
+
+        key = self.memo.make_key(self.dataset_version, name, params)
+        rows = await self.memo.get_or_load(
+            key,
+            lambda: self.query(sparql_query, template.result_format, name, params, graph)
+        )
+        return list(rows)
+
+    async def stream(
+        self,
+        sparql_query: str,
+        result_format: str = JSON,
+        template: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        graph: Optional[str] = None
+    ) -> AsyncIterator[Row]:
+        """
+        Execute a SPARQL query and yield result rows as they arrive.
+
+        Over HTTP, rows are parsed incrementally from the response, so memory
+        stays bounded regardless of result size. The scheduler slot is held until
+        the iterator is exhausted or closed; wrap it in contextlib.aclosing()
+        when stopping early. The circuit breaker times the call up to the
+        response headers, so slow consumers don't count as slow queries; the
+        profiler times the whole stream. `graph` scopes the query as in `query`.
+        """
+        result_format = self._result_format(result_format)
+        if graph is not None:
+            sparql_query = with_default_graph(sparql_query, graph)
+        try:
+            async with self.scheduler.slot():
+                start = time.perf_counter()
+                count = 0
+                size = 0
+                try:
+                    async with self.breaker.guard():
+                        rows = await self.backend.open_stream(sparql_query, result_format)
+                except Exception as e:
+                    self._profile(template, params, sparql_query, start, 0, 0, e)
+                    raise
+
+                try:
+                    async for row in rows:
+                        count += 1
+                        size += result_size([row])
+                        yield row
+                finally:
+                    await rows.aclose()
+                    self._profile(template, params, sparql_query, start, count, size)
+        except (GraphDBOverloadedError, GraphDBUnavailableError) as e:
+            logger.warning(f"GraphDB query rejected: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"GraphDB streaming query error: {e}")
+            raise
+
+    def stream_template(self, name: str, **params: Any) -> AsyncIterator[Row]:
+        """Stream rows of a named SPARQL template with safely bound parameters."""
+        template = get_template(name)
+        graph = self.active_graph if template.versioned else None
+        return self.stream(template.bind(**params), template.result_format, name, params, graph)
+
     async def test_connection(self) -> bool:
-        """Test connection to GraphDB with timeout."""
+        """Test connection to GraphDB with a single-triple probe and a timeout."""
         try:
-            import asyncio
-            test_query = """
-            SELECT (COUNT(*) as ?count) WHERE {
-                ?s ?p ?o .
-            } LIMIT 1
-            """
             # Add timeout to prevent hanging
-            await asyncio.wait_for(self.query(test_query), timeout=2.0)
+            await asyncio.wait_for(
+                self.query_template("connection_test"),
+                timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+            )
             return True
         except asyncio.TimeoutError:
             logger.warning("GraphDB connection test timed out")
@@ -60,246 +303,249 @@ class GraphDBClient:
             logger.warning(f"GraphDB connection test failed: {e}")
             return False
 
+    @staticmethod
+    def _provider_filters(
+        lat: Optional[float],
+        lng: Optional[float],
+        radius: Optional[float],
+        min_hcahps: float
+    ) -> Dict[str, Any]:
+        """Template parameters that prune providers by hospital location and HCAHPS score."""
+        in_box = lat is not None and lng is not None and radius is not None
+        min_lat, max_lat, min_lng, max_lng = (
+            bounding_box(lat, lng, radius) if in_box else (-90.0, 90.0, -180.0, 180.0)
+        )
+        return {
+            "in_box": in_box,
+            "min_lat": min_lat,
+            "max_lat": max_lat,
+            "min_lng": min_lng,
+            "max_lng": max_lng,
+            "min_hcahps": float(min_hcahps or 0)
+        }
+
     async def search_by_symptom(
         self,
         symptom: str,
-        limit: int = 50
+        limit: int = 50,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,
+        min_hcahps: float = 0
     ) -> Dict[str, List[Dict[str, Any]]]:
-        """Search for providers, conditions, and precautions by symptom."""
-
-        # Query to find conditions and precautions for the symptom
-        symptom_query = f"""
-        PREFIX : <http://example.org/healthnav#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-        SELECT DISTINCT
-            ?symptomName ?conditionId ?conditionName
-            ?precautionId ?precautionName
-        WHERE {{
-            ?symptom a :Symptom ;
-                     :name ?symptomName .
-            FILTER (CONTAINS(LCASE(?symptomName), LCASE("{symptom}")))
-
-            OPTIONAL {{
-                ?condition a :MedicalCondition ;
-                           :hasSymptom ?symptom ;
-                           :name ?conditionName .
-                BIND(STRAFTER(STR(?condition), "#") AS ?conditionId)
-            }}
-
-            OPTIONAL {{
-                ?symptom :recommendedPrecaution ?precaution .
-                ?precaution :name ?precautionName .
-                BIND(STRAFTER(STR(?precaution), "#") AS ?precautionId)
-            }}
-        }}
-        LIMIT {limit}
         """
+        Search for providers, conditions, and precautions by symptom.
 
-        # Query to find providers who treat the conditions
-        provider_query = f"""
-        PREFIX : <http://example.org/healthnav#>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-        PREFIX schema: <http://schema.org/>
-
-        SELECT DISTINCT
-            ?physicianId ?physicianName ?npi
-            ?specialtyName ?conditionName
-            ?hospitalId ?hospitalName ?hcahpsScore
-            ?lat ?lng ?phone ?address
-        WHERE {{
-            ?symptom a :Symptom ;
-                     :name ?symptomName .
-            FILTER (CONTAINS(LCASE(?symptomName), LCASE("{symptom}")))
-
-            ?condition a :MedicalCondition ;
-                       :hasSymptom ?symptom ;
-                       :name ?conditionName .
-
-            ?physician a :Physician ;
-                      :name ?physicianName ;
-                      :treatsCondition ?condition .
-
-            OPTIONAL {{ ?physician :npi ?npi . }}
-            BIND(STRAFTER(STR(?physician), "#") AS ?physicianId)
-
-            OPTIONAL {{
-                ?physician :hasSpecialty ?specialty .
-                ?specialty :name ?specialtyName .
-            }}
-
-            OPTIONAL {{
-                ?physician :affiliatedWith ?hospital .
-                ?hospital :name ?hospitalName ;
-                         :hcahpsOverallScore ?hcahpsScore .
-                BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
-
-                OPTIONAL {{
-                    ?hospital :locatedAt ?hospitalAddress .
-                    ?hospitalAddress :hasGeo ?geo .
-                    ?geo :latitude ?lat ;
-                         :longitude ?lng .
-                }}
-
-                OPTIONAL {{ ?hospital :phone ?phone . }}
-                OPTIONAL {{
-                    ?hospital :locatedAt ?hospitalAddress .
-                    ?hospitalAddress :addressLine ?address .
-                }}
-            }}
-        }}
-        LIMIT {limit}
+        With a location and radius, GraphDB only returns providers whose
+        hospital lies in the enclosing bounding box; with `min_hcahps`, only
+        those whose hospital scores at least that. Callers still apply the
+        exact radius check. Errors are raised rather than turned into empty
+        results, so a failing GraphDB is never mistaken for "no matches".
         """
+        # Conditions and precautions for the symptom, and the
+        # providers who treat those conditions
+        symptom_results, provider_results = await asyncio.gather(
+            self.query_template("symptom_conditions", symptom=symptom, limit=limit),
+            self.query_template(
+                "symptom_providers",
+                symptom=symptom,
+                limit=limit,
+                **self._provider_filters(lat, lng, radius, min_hcahps)
+            )
+        )
 
-        try:
-            symptom_results = await self.query(symptom_query)
-            provider_results = await self.query(provider_query)
-
-            return {
-                "symptoms": symptom_results,
-                "providers": provider_results
-            }
-        except Exception as e:
-            logger.error(f"Error searching by symptom: {e}")
-            return {"symptoms": [], "providers": []}
+        return {
+            "symptoms": symptom_results,
+            "providers": provider_results
+        }
 
     async def get_providers_by_specialty(
         self,
         specialty: str,
-        limit: int = 50
+        limit: int = 50,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+        radius: Optional[float] = None,
+        min_hcahps: float = 0
     ) -> List[Dict[str, Any]]:
-        """Get providers by specialty."""
-        query = f"""
-        PREFIX : <http://example.org/healthnav#>
-
-        SELECT DISTINCT
-            ?physicianId ?physicianName ?npi ?specialtyName
-            ?hospitalId ?hospitalName ?hcahpsScore
-            ?lat ?lng
-        WHERE {{
-            ?physician a :Physician ;
-                      :name ?physicianName ;
-                      :hasSpecialty ?specialty .
-
-            ?specialty :name ?specialtyName .
-            FILTER (CONTAINS(LCASE(?specialtyName), LCASE("{specialty}")))
-
-            OPTIONAL {{ ?physician :npi ?npi . }}
-            BIND(STRAFTER(STR(?physician), "#") AS ?physicianId)
-
-            OPTIONAL {{
-                ?physician :affiliatedWith ?hospital .
-                ?hospital :name ?hospitalName ;
-                         :hcahpsOverallScore ?hcahpsScore .
-                BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
-
-                OPTIONAL {{
-                    ?hospital :locatedAt ?address .
-                    ?address :hasGeo ?geo .
-                    ?geo :latitude ?lat ;
-                         :longitude ?lng .
-                }}
-            }}
-        }}
-        LIMIT {limit}
-        """
-
-        return await self.query(query)
+        """Get providers by specialty, optionally pruned by location and HCAHPS score."""
+        return await self.query_template(
+            "providers_by_specialty",
+            specialty=specialty,
+            limit=limit,
+            **self._provider_filters(lat, lng, radius, min_hcahps)
+        )
 
     async def get_all_specialties(self) -> List[str]:
         """Get all available medical specialties."""
-        query = """
-        PREFIX : <http://example.org/healthnav#>
+        results = await self.query_template("all_specialties")
+        return [r["name"] for r in results if "name" in r]
+
+    async def get_symptom_names(self) -> List[str]:
+        """Get the names of all symptoms."""
+        results = await self.query_template("symptom_names")
+        return [r["name"] for r in results if "name" in r]
+
+    async def get_symptom_documents(self) -> Dict[str, str]:
+        """Get each symptom name with the text of its conditions and precautions."""
+        results = await self.query_template("symptom_documents")
+        texts: Dict[str, List[str]] = {}
+        for r in results:
+            if "symptomName" not in r:
+                continue
+            parts = texts.setdefault(r["symptomName"], [])
+            for field in ("conditionName", "precautionName"):
+                value = r.get(field)
+                if value and value not in parts:
+                    parts.append(value)
+
+        return {name: " ".join(parts) for name, parts in texts.items()}
+
+    @staticmethod
+    def _merge_entity_row(entities: Dict[str, Dict[str, Any]], row: Row, key: str):
+        """Fold one OPTIONAL-join row into its entity's record."""
+        iri = row.get(key)
+        if iri is None:
+            return
+        entity = entities.setdefault(iri, {})
+        for field, value in row.items():
+            if field != key:
+                entity.setdefault(field, value)
+
+    @classmethod
+    def _merge_entity_rows(cls, rows: List[Row], key: str) -> Dict[str, Dict[str, Any]]:
+        """Collapse the OPTIONAL-join rows of each entity into one record, keyed by IRI."""
+        entities: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            cls._merge_entity_row(entities, row, key)
+        return entities
+
+    async def _entity_page(
+        self,
+        kind: str,
+        page_size: int,
+        after: str = "",
+        offset: int = 0
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch one page of `page_size` entities (not rows) after a key or offset.
 
-        SELECT DISTINCT ?name
-        WHERE {
-            ?specialty a :Specialty ;
-                      :name ?name .
-        }
-        ORDER BY ?name
+        Rows are streamed and merged as they arrive, so only the merged
+        records are held, not the whole response.
+        """
+        page_template, _, key = ENTITY_CATALOGS[kind]
+        entities: Dict[str, Dict[str, Any]] = {}
+        rows = self.stream_template(page_template, after=after, offset=offset, page_size=page_size)
+        async with aclosing(rows):
+            async for row in rows:
+                self._merge_entity_row(entities, row, key)
+        return entities
+
+    async def iter_entities(
+        self,
+        kind: str,
+        page_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
+        Walk every hospital, pharmacy or provider in stable IRI order, one record per entity.
+
+        Pages hold `page_size` entities rather than rows, so OPTIONAL joins
+        can't truncate the catalog. With concurrency 1, pages are walked by
+        keyset (IRI > last IRI), which stays consistent while data changes.
+        With higher concurrency, the entities are counted first and offset
+        pages are fetched `concurrency` at a time and yielded in order; use
+        that on a dataset that isn't being written (e.g. full syncs after a
+        load). Entities are never yielded twice.
+        """
+        page_size = page_size or settings.GRAPHDB_PAGE_SIZE
+        concurrency = concurrency or settings.GRAPHDB_PAGE_CONCURRENCY
+        seen = set()
+
+        if concurrency <= 1:
+            after = ""
+            while True:
+                page = await self._entity_page(kind, page_size, after=after)
+                for iri, entity in page.items():
+                    if iri not in seen:
+                        seen.add(iri)
+                        yield entity
+                if len(page) < page_size:
+                    return
+                after = next(reversed(page))
+
+        _, count_template, _ = ENTITY_CATALOGS[kind]
+        rows = await self.query_template(count_template)
+        total = int(rows[0]["count"]) if rows and "count" in rows[0] else 0
+
+        # Sliding window of page fetches, consumed in offset order
+        pending: Deque[asyncio.Task] = deque()
+        offsets = iter(range(0, total, page_size))
+        try:
+            while True:
+                for offset in offsets:
+                    pending.append(asyncio.create_task(
+                        self._entity_page(kind, page_size, offset=offset)
+                    ))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+
+                page = await pending.popleft()
+                for iri, entity in page.items():
+                    if iri not in seen:
+                        seen.add(iri)
+                        yield entity
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _collect_entities(self, kind: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Collect up to `limit` entities, or the whole catalog when limit is None."""
+        if limit is None:
+            return [entity async for entity in self.iter_entities(kind)]
+
+        entities = []
+        pages = self.iter_entities(
+            kind,
+            page_size=min(limit, settings.GRAPHDB_PAGE_SIZE),
+            concurrency=1
+        )
+        async with aclosing(pages):
+            async for entity in pages:
+                entities.append(entity)
+                if len(entities) >= limit:
+                    break
+        return entities
+
+    async def get_entities_by_id(self, kind: str, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up hospitals or providers by ID in one query, keyed by ID.
 
-        results = await self.query(query)
-        return [r["name"]["value"] for r in results if "name" in r]
-
-    async def get_hospitals(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get all hospitals with their details."""
-        query = f"""
-        PREFIX : <http://example.org/healthnav#>
-
-        SELECT DISTINCT
-            ?hospitalId ?hospitalName ?cmsId ?hcahpsScore
-            ?addressLine ?city ?state ?postalCode
-            ?lat ?lng ?phone
-        WHERE {{
-            ?hospital a :Hospital ;
-                     :name ?hospitalName .
-
-            BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
-
-            OPTIONAL {{ ?hospital :cmsOrgId ?cmsId . }}
-            OPTIONAL {{ ?hospital :hcahpsOverallScore ?hcahpsScore . }}
-            OPTIONAL {{ ?hospital :phone ?phone . }}
-
-            OPTIONAL {{
-                ?hospital :locatedAt ?address .
-                OPTIONAL {{ ?address :addressLine ?addressLine . }}
-                OPTIONAL {{ ?address :city ?city . }}
-                OPTIONAL {{ ?address :state ?state . }}
-                OPTIONAL {{ ?address :postalCode ?postalCode . }}
-
-                OPTIONAL {{
-                    ?address :hasGeo ?geo .
-                    ?geo :latitude ?lat ;
-                         :longitude ?lng .
-                }}
-            }}
-        }}
-        LIMIT {limit}
+        IDs are bound as a VALUES block, so a whole batch costs one round
+        trip; unknown IDs are simply absent from the result.
         """
+        template, key, id_var = ENTITY_LOOKUPS[kind]
+        rows = await self.query_template(template, ids=tuple(sorted(set(ids))))
+        return {
+            entity[id_var]: entity
+            for entity in self._merge_entity_rows(rows, key).values()
+            if id_var in entity
+        }
 
-        return await self.query(query)
+    async def get_hospitals(self, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """Get hospitals with their details; `limit` counts hospitals, None gets all."""
+        return await self._collect_entities("hospitals", limit)
 
     async def get_pharmacies(
         self,
         lat: Optional[float] = None,
         lng: Optional[float] = None,
-        limit: int = 100
+        limit: Optional[int] = 100
     ) -> List[Dict[str, Any]]:
-        """Get pharmacies, optionally filtered by location."""
-        query = f"""
-        PREFIX : <http://example.org/healthnav#>
-
-        SELECT DISTINCT
-            ?pharmacyId ?pharmacyName
-            ?addressLine ?city ?state ?postalCode
-            ?lat ?lng ?phone
-        WHERE {{
-            ?pharmacy a :Pharmacy ;
-                     :name ?pharmacyName .
-
-            BIND(STRAFTER(STR(?pharmacy), "#") AS ?pharmacyId)
-
-            OPTIONAL {{
-                ?pharmacy :locatedAt ?address .
-                OPTIONAL {{ ?address :addressLine ?addressLine . }}
-                OPTIONAL {{ ?address :city ?city . }}
-                OPTIONAL {{ ?address :state ?state . }}
-                OPTIONAL {{ ?address :postalCode ?postalCode . }}
-
-                OPTIONAL {{
-                    ?address :hasGeo ?geo .
-                    ?geo :latitude ?lat ;
-                         :longitude ?lng .
-                }}
-            }}
-
-            OPTIONAL {{ ?pharmacy :phone ?phone . }}
-        }}
-        LIMIT {limit}
-        """
-
-        return await self.query(query)
+        """Get pharmacies, optionally filtered by location; `limit` counts pharmacies, None gets all."""
+        return await self._collect_entities("pharmacies", limit)
 
 
 # Global GraphDB client instance
@@ -1,10 +1,26 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import UpdateOne, ReplaceOne
+from bson import Binary
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
+import asyncio
 import logging
 from app.core.config import settings
+from app.db.cache_codec import encode_search_result, decode_search_result
 
 logger = logging.getLogger(__name__)
 
+# Entity cache collections and the field identifying their documents
+ENTITY_CACHE_KEYS = {
+    "providers_cache": "id",
+    "hospitals_cache": "id",
+    "pharmacies_cache": "id",
+    "specialties_cache": "name",
+}
+
+# Field holding a materialized document's content hash
+CONTENT_HASH = "contentHash"
+
 
 class MongoDBClient:
     """Client for interacting with MongoDB."""
@@ -23,12 +39,32 @@ class MongoDBClient:
             self.db = self.client[settings.MONGODB_DB_NAME]
 
             # Test connection
-            await self.client.admin.command('ping')
+            await asyncio.wait_for(
+                self.client.admin.command('ping'),
+                timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+            )
             logger.info("Connected to MongoDB successfully")
+
+            await self.ensure_indexes()
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
+    async def ensure_indexes(self):
+        """Create the indexes the cache collections rely on."""
+        try:
+            await self.db.search_cache.create_index("key")
+            # Expired results stay available as a stale fallback until purgeAt
+            indexes = await self.db.search_cache.index_information()
+            if "expiresAt_1" in indexes:
+                await self.db.search_cache.drop_index("expiresAt_1")
+            await self.db.search_cache.create_index("purgeAt", expireAfterSeconds=0)
+            # Entity caches are looked up and materialized by key
+            for collection, key in ENTITY_CACHE_KEYS.items():
+                await self.db[collection].create_index(key)
+        except Exception as e:
+            logger.error(f"Error creating MongoDB indexes: {e}")
+
     async def disconnect(self):
         """Disconnect from MongoDB."""
         if self.client:
@@ -40,7 +76,10 @@ class MongoDBClient:
         try:
             if not self.client:
                 return False
-            await self.client.admin.command('ping')
+            await asyncio.wait_for(
+                self.client.admin.command('ping'),
+                timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+            )
             return True
         except:
             return False
@@ -150,29 +189,97 @@ class MongoDBClient:
             logger.error(f"Error getting cached specialties: {e}")
             return []
 
+    # Materialized Entity Methods
+    async def sync_entity_range(
+        self,
+        collection_name: str,
+        docs: List[Dict[str, Any]],
+        after: Optional[str],
+        last: Optional[str]
+    ) -> Dict[str, int]:
+        """
+        Make one key range of an entity cache match `docs`, in bulk.
+
+        `docs` are every document with a key in (after, last] (last=None
+        means no upper bound), each carrying a content hash. Documents whose
+        hash is unchanged aren't rewritten, changed and new ones are upserted
+        in one bulk write, and documents in the range that aren't in `docs`
+        are deleted. Pass after=None to skip deletion. Errors are raised so a
+        materialization run can report them.
+        """
+        key = ENTITY_CACHE_KEYS[collection_name]
+        collection = self.db[collection_name]
+        keys = [doc[key] for doc in docs]
+
+        existing = {
+            doc[key]: doc.get(CONTENT_HASH)
+            async for doc in collection.find({key: {"$in": keys}}, {key: 1, CONTENT_HASH: 1, "_id": 0})
+        }
+        writes = [
+            ReplaceOne({key: doc[key]}, doc, upsert=True)
+            for doc in docs
+            if existing.get(doc[key]) != doc[CONTENT_HASH]
+        ]
+        if writes:
+            await collection.bulk_write(writes, ordered=False)
+
+        deleted = 0
+        if after is not None:
+            key_range: Dict[str, Any] = {"$gt": after, "$nin": keys}
+            if last is not None:
+                key_range["$lte"] = last
+            deleted = (await collection.delete_many({key: key_range})).deleted_count
+
+        inserted = sum(1 for doc in docs if doc[key] not in existing)
+        return {
+            "inserted": inserted,
+            "updated": len(writes) - inserted,
+            "unchanged": len(docs) - len(writes),
+            "deleted": deleted
+        }
+
     # Query Cache Methods
+    @staticmethod
+    def _search_result_from_doc(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the search result from a cache document, decoding compact payloads."""
+        if "payload" in doc:
+            try:
+                return decode_search_result(bytes(doc["payload"]))
+            except Exception as e:
+                logger.error(f"Error decoding cached search result: {e}")
+                return None
+        return doc.get("result")
+
     async def cache_search_result(
         self,
         cache_key: str,
-        result: Dict[str, Any]
+        result: Dict[str, Any],
+        ttl_seconds: Optional[int] = None
     ):
-        """Cache a search result with TTL."""
+        """Cache a search result with TTL (CACHE_TTL_SECONDS by default)."""
         if self.db is None or not settings.ENABLE_CACHING:
             return
 
         try:
             collection = self.db.search_cache
-            await collection.update_one(
-                {"key": cache_key},
-                {
-                    "$set": {
-                        "key": cache_key,
-                        "result": result,
-                        "timestamp": settings.CACHE_TTL_SECONDS
-                    }
-                },
-                upsert=True
-            )
+            now = datetime.now(timezone.utc)
+            ttl = ttl_seconds if ttl_seconds is not None else settings.CACHE_TTL_SECONDS
+            expires_at = now + timedelta(seconds=ttl)
+            doc = {
+                "key": cache_key,
+                "cachedAt": now,
+                "expiresAt": expires_at,
+                "purgeAt": expires_at + timedelta(seconds=settings.CACHE_STALE_TTL_SECONDS)
+            }
+            if settings.CACHE_COMPRESS_PAYLOADS:
+                update = {
+                    "$set": {**doc, "payload": Binary(encode_search_result(result))},
+                    "$unset": {"result": ""}
+                }
+            else:
+                update = {"$set": {**doc, "result": result}, "$unset": {"payload": ""}}
+
+            await collection.update_one({"key": cache_key}, update, upsert=True)
         except Exception as e:
             logger.error(f"Error caching search result: {e}")
 
@@ -186,12 +293,155 @@ class MongoDBClient:
 
         try:
             collection = self.db.search_cache
-            result = await collection.find_one({"key": cache_key})
-            return result.get("result") if result else None
+            result = await collection.find_one({
+                "key": cache_key,
+                "expiresAt": {"$gt": datetime.now(timezone.utc)}
+            })
+            return self._search_result_from_doc(result) if result else None
         except Exception as e:
             logger.error(f"Error getting cached search result: {e}")
             return None
 
+    async def get_cached_search_results(
+        self,
+        cache_keys: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get several cached search results in one round-trip, keyed by cache key."""
+        if self.db is None or not settings.ENABLE_CACHING or not cache_keys:
+            return {}
+
+        try:
+            collection = self.db.search_cache
+            cursor = collection.find({
+                "key": {"$in": cache_keys},
+                "expiresAt": {"$gt": datetime.now(timezone.utc)}
+            })
+            docs = await cursor.to_list(length=None)
+            results = {doc["key"]: self._search_result_from_doc(doc) for doc in docs}
+            return {key: result for key, result in results.items() if result}
+        except Exception as e:
+            logger.error(f"Error getting cached search results: {e}")
+            return {}
+
+    async def get_stale_search_results(
+        self,
+        cache_keys: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the last known good results for cache keys, ignoring expiry.
+
+        Used as a fallback while GraphDB is unavailable; each result is
+        flagged `stale` and carries the time it was cached.
+        """
+        if self.db is None or not settings.ENABLE_CACHING or not cache_keys:
+            return {}
+
+        try:
+            collection = self.db.search_cache
+            cursor = collection.find({"key": {"$in": cache_keys}})
+            docs = await cursor.to_list(length=None)
+            results = {}
+            for doc in docs:
+                result = self._search_result_from_doc(doc)
+                if result:
+                    results[doc["key"]] = {**result, "stale": True, "cachedAt": doc.get("cachedAt")}
+            return results
+        except Exception as e:
+            logger.error(f"Error getting stale search results: {e}")
+            return {}
+
+    async def expire_search_cache(self):
+        """
+        Mark every fresh cached search result as expired.
+
+        Entries stay until their purgeAt, so they remain available as stale
+        fallbacks while GraphDB is unavailable; refreshes overwrite them.
+        """
+        if self.db is None:
+            return
+
+        try:
+            now = datetime.now(timezone.utc)
+            result = await self.db.search_cache.update_many(
+                {"expiresAt": {"$gt": now}},
+                {"$set": {"expiresAt": now}}
+            )
+            logger.info(f"Expired {result.modified_count} cached search results")
+        except Exception as e:
+            logger.error(f"Error expiring search cache: {e}")
+
+    # Search Popularity Methods
+    @staticmethod
+    def _decayed_score(now: datetime) -> Dict[str, Any]:
+        """
+        Aggregation expression for a search's popularity score as of `now`.
+
+        The stored score was current at lastSeen; it halves every
+        POPULARITY_HALF_LIFE_HOURS since. Documents from before scores were
+        kept start from their raw count.
+        """
+        half_life_ms = settings.POPULARITY_HALF_LIFE_HOURS * 3600 * 1000
+        return {
+            "$multiply": [
+                {"$ifNull": ["$score", {"$ifNull": ["$count", 0]}]},
+                {"$pow": [0.5, {"$divide": [
+                    {"$subtract": [now, {"$ifNull": ["$lastSeen", now]}]},
+                    half_life_ms
+                ]}]}
+            ]
+        }
+
+    async def record_search_popularity(
+        self,
+        searches: Dict[str, Dict[str, Any]]
+    ) -> bool:
+        """
+        Add searches to their decaying popularity scores and total counts.
+
+        `searches` maps cache key → {"params": ..., "count": ...}. Returns
+        False if the write failed, so callers can keep the counts to retry;
+        without a MongoDB connection there is nowhere to keep them.
+        """
+        if self.db is None or not searches:
+            return True
+
+        try:
+            now = datetime.now(timezone.utc)
+            operations = [
+                UpdateOne(
+                    {"_id": key},
+                    [{"$set": {
+                        "score": {"$add": [self._decayed_score(now), entry["count"]]},
+                        "count": {"$add": [{"$ifNull": ["$count", 0]}, entry["count"]]},
+                        "params": {"$literal": entry["params"]},
+                        "lastSeen": now
+                    }}],
+                    upsert=True
+                )
+                for key, entry in searches.items()
+            ]
+            await self.db.search_popularity.bulk_write(operations, ordered=False)
+            return True
+        except Exception as e:
+            logger.error(f"Error recording search popularity: {e}")
+            return False
+
+    async def get_popular_searches(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the searches with the highest decayed popularity, most popular first."""
+        if self.db is None:
+            return []
+
+        try:
+            cursor = self.db.search_popularity.aggregate([
+                {"$addFields": {"rank": self._decayed_score(datetime.now(timezone.utc))}},
+                {"$sort": {"rank": -1}},
+                {"$limit": limit}
+            ])
+            return await cursor.to_list(length=limit)
+        except Exception as e:
+            logger.error(f"Error getting popular searches: {e}")
+            return []
+
 
 # Global MongoDB client instance
 mongodb_client = MongoDBClient()
@@ -0,0 +1,143 @@
+from typing import Dict, Any, List, Tuple, Optional, Hashable, Awaitable, Callable
+from collections import OrderedDict
+import asyncio
+import time
+from app.db.sparql_results import Row
+
+# Rough per-object overheads used to estimate the memory held by cached rows
+_ROW_OVERHEAD = 232
+_VALUE_OVERHEAD = 50
+
+
+def estimate_rows_size(rows: List[Row]) -> int:
+    """Approximate bytes held by a list of flat result rows."""
+    size = 56 + 8 * len(rows)
+    for row in rows:
+        size += _ROW_OVERHEAD
+        for name, value in row.items():
+            size += len(name) + len(value) + 2 * _VALUE_OVERHEAD
+    return size
+
+
+class QueryMemo:
+    """
+    Size-bounded LRU memo of SPARQL template results.
+
+    Entries are keyed on (dataset version, template name, parameters), so a
+    new dataset version never sees results from an older one. Least recently
+    used entries are evicted once the estimated size exceeds `max_bytes`;
+    entries older than `ttl_seconds` are treated as misses. Concurrent
+    misses for the same key share one query.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[List[Row], int, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(version: Optional[str], template: str, params: Dict[str, Any]) -> Hashable:
+        return (version, template, tuple(sorted(params.items())))
+
+    def get(self, key: Hashable) -> Optional[List[Row]]:
+        """Get memoized rows, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        rows, size, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return rows
+
+    def put(self, key: Hashable, rows: List[Row]):
+        """Memoize rows, evicting least recently used entries to stay within max_bytes."""
+        size = estimate_rows_size(rows)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (rows, size, time.monotonic())
+        self.size += size
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def clear(self):
+        """Drop every memoized result."""
+        self._entries.clear()
+        self.size = 0
+        self.invalidations += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[List[Row]]]
+    ) -> List[Row]:
+        """Return memoized rows for `key`, running `load` once on a miss."""
+        rows = self.get(key)
+        if rows is not None:
+            self.hits += 1
+            return rows
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            rows = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        else:
+            future.set_result(rows)
+            self.put(key, rows)
+            return rows
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Current size and counters."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "sizeBytes": self.size,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,210 @@
+from typing import Dict, Any, List, Optional, Deque
+from collections import deque
+from datetime import datetime, timezone
+import hashlib
+import logging
+import re
+import time
+from app.db.sparql_results import Row
+from app.db.sparql_templates import with_default_graph
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; slower queries land in "+Inf"
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Recent latencies kept per template for percentiles
+_LATENCY_WINDOW = 500
+
+# Profile names for queries that don't come from a template, and for plan captures
+ADHOC = "adhoc"
+EXPLAIN = "explain"
+
+# GraphDB returns the query plan instead of results for queries FROM this graph
+EXPLAIN_GRAPH = "http://www.ontotext.com/explain"
+
+# Quoted literals in plans, which echo the query's bound parameters
+_PLAN_LITERAL_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+
+def explain_query(sparql_query: str) -> Optional[str]:
+    """Rewrite a SELECT so GraphDB returns its plan (onto:explain), or None if it has no WHERE."""
+    try:
+        return with_default_graph(sparql_query, EXPLAIN_GRAPH)
+    except ValueError:
+        return None
+
+
+def redact_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Replace string parameters (e.g. users' symptom text) with short hashes.
+
+    Equal values still hash alike, so repeated slow queries can be matched
+    up without the slow log or application log holding what users typed.
+    """
+    def redact(value: Any) -> Any:
+        if isinstance(value, str):
+            return "sha1:" + hashlib.sha1(value.encode("utf-8")).hexdigest()[:12]
+        if isinstance(value, (list, tuple, set)):
+            return [redact(item) for item in value]
+        return value
+
+    return {name: redact(value) for name, value in (params or {}).items()}
+
+
+def result_size(rows: List[Row]) -> int:
+    """Characters in the decoded result (variable names and values), independent of wire format."""
+    return sum(len(name) + len(value) for row in rows for name, value in row.items())
+
+
+class TemplateProfile:
+    """Latency histogram, row counts and result sizes of one template."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.rows_total = 0
+        self.rows_max = 0
+        self.bytes_total = 0
+        self.bytes_max = 0
+
+    def record(self, elapsed_ms: float, rows: int, size: int, failed: bool):
+        self.count += 1
+        if failed:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.latencies.append(elapsed_ms)
+
+        bucket = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+        self.buckets[bucket] += 1
+
+        self.rows_total += rows
+        self.rows_max = max(self.rows_max, rows)
+        self.bytes_total += size
+        self.bytes_max = max(self.bytes_max, size)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        labels = [f"le{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "latencyMsMean": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "latencyMsP50": percentile(0.50),
+            "latencyMsP95": percentile(0.95),
+            "latencyMsP99": percentile(0.99),
+            "latencyMsMax": round(self.max_ms, 3),
+            "histogram": dict(zip(labels, self.buckets)),
+            "rowsMean": round(self.rows_total / self.count, 1) if self.count else 0.0,
+            "rowsMax": self.rows_max,
+            "resultBytesMean": round(self.bytes_total / self.count) if self.count else 0,
+            "resultBytesMax": self.bytes_max
+        }
+
+
+class QueryProfiler:
+    """
+    Per-template SPARQL latency histograms, row counts and result sizes.
+
+    Queries slower than `slow_ms` are also logged and kept (most recent
+    `slow_log_size`) with their bound parameters, string values hashed. When GraphDB supports it,
+    the caller captures an `onto:explain` plan for slow templates, at most
+    once per `plan_ttl_seconds` per template so a struggling GraphDB isn't
+    sent extra work on every slow query.
+    """
+
+    def __init__(self, slow_ms: float, slow_log_size: int, plan_ttl_seconds: float = 300.0):
+        self.slow_ms = slow_ms
+        self.plan_ttl_seconds = plan_ttl_seconds
+        self.templates: Dict[str, TemplateProfile] = {}
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+        self.plans: Dict[str, Dict[str, Any]] = {}
+        self._plan_requested: Dict[str, float] = {}
+
+    def record(
+        self,
+        template: Optional[str],
+        params: Optional[Dict[str, Any]],
+        elapsed_ms: float,
+        rows: int,
+        size: int,
+        error: Optional[BaseException] = None
+    ) -> bool:
+        """Record one query's latency, row count and result size; returns whether it was slow."""
+        name = template or ADHOC
+        self.templates.setdefault(name, TemplateProfile()).record(
+            elapsed_ms, rows, size, error is not None
+        )
+        if elapsed_ms < self.slow_ms:
+            return False
+
+        params = redact_params(params)
+        logger.warning(f"Slow SPARQL query '{name}': {elapsed_ms:.0f} ms, {rows} rows, params={params}")
+        self.slow_queries.append({
+            "template": name,
+            "params": params,
+            "elapsedMs": round(elapsed_ms, 3),
+            "rows": rows,
+            "resultBytes": size,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+            "at": datetime.now(timezone.utc)
+        })
+        return True
+
+    def wants_plan(self, template: Optional[str]) -> bool:
+        """Whether to capture a plan for this slow template now (claims the slot if so)."""
+        if template is None or template == EXPLAIN:
+            return False
+        now = time.monotonic()
+        requested = self._plan_requested.get(template)
+        if requested is not None and now - requested < self.plan_ttl_seconds:
+            return False
+        self._plan_requested[template] = now
+        return True
+
+    def record_plan(self, template: str, plan: str):
+        plan = _PLAN_LITERAL_RE.sub('"…"', plan)
+        self.plans[template] = {"plan": plan, "capturedAt": datetime.now(timezone.utc)}
+
+    def reset(self):
+        """Drop all profiles, slow queries and plans."""
+        self.templates.clear()
+        self.slow_queries.clear()
+        self.plans.clear()
+        self._plan_requested.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-template profiles, slowest mean latency first."""
+        profiles = {name: profile.stats() for name, profile in self.templates.items()}
+        return {
+            "slowQueryMs": self.slow_ms,
+            "latencyBucketsMs": list(LATENCY_BUCKETS_MS),
+            "templates": dict(sorted(
+                profiles.items(),
+                key=lambda item: item[1]["latencyMsMean"],
+                reverse=True
+            ))
+        }
+
+    def slow_log(self) -> Dict[str, Any]:
+        """Recent slow queries, newest first, with the latest plan per template."""
+        return {
+            "slowQueryMs": self.slow_ms,
+            "queries": list(reversed(self.slow_queries)),
+            "plans": self.plans
+        }
@@ -0,0 +1,95 @@
+from typing import Dict, Any
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class GraphDBOverloadedError(Exception):
+    """Raised when a GraphDB query is rejected because the wait queue is full."""
+
+
+class QueryScheduler:
+    """
+    Bounds concurrent GraphDB queries with a fixed-size wait queue.
+
+    At most `max_concurrency` queries run at once and at most `max_queue`
+    wait for a slot. Queries arriving when the queue is full, or waiting
+    longer than `queue_timeout` seconds, fail fast with
+    GraphDBOverloadedError instead of piling up on GraphDB.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._max_wait_ms = 0.0
+        self._waits_ms: deque = deque(maxlen=1000)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a query slot, or fail fast when overloaded."""
+        if self.in_flight + self.queued >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise GraphDBOverloadedError(
+                f"GraphDB queue full ({self.queued} waiting, {self.in_flight} in flight)"
+            )
+
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise GraphDBOverloadedError(
+                f"Timed out after {self.queue_timeout}s waiting for a GraphDB slot"
+            )
+        finally:
+            self.queued -= 1
+
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._waits_ms.append(wait_ms)
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current gauges and counters."""
+        waits = sorted(self._waits_ms)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3)
+
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "maxQueue": self.max_queue,
+            "inFlight": self.in_flight,
+            "queueDepth": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+            "waitMsP50": percentile(0.50),
+            "waitMsP95": percentile(0.95),
+            "waitMsMax": round(self._max_wait_ms, 3)
+        }
@@ -0,0 +1,246 @@
+from typing import Dict, Any, AsyncIterator, Callable, Iterable, List, Optional
+import csv
+import io
+import json
+import re
+
+# Result formats
+JSON = "json"
+CSV = "csv"
+TSV = "tsv"
+
+MEDIA_TYPES = {
+    JSON: "application/sparql-results+json",
+    CSV: "text/csv",
+    TSV: "text/tab-separated-values",
+}
+
+_BINDINGS_RE = re.compile(r'"bindings"\s*:\s*\[')
+_WHITESPACE = " \t\n\r"
+
+# Rows are flat: variable name → lexical value; unbound variables are absent
+Row = Dict[str, str]
+
+# Separator used by GROUP_CONCAT in the aggregated templates
+GROUP_SEPARATOR = "|"
+
+
+class SparqlResultsError(ValueError):
+    """Raised when a SPARQL results document is malformed or truncated."""
+
+
+def split_group(value: Optional[str]) -> List[str]:
+    """Split a GROUP_CONCAT value into its distinct, non-empty parts."""
+    if not value:
+        return []
+    return [part for part in value.split(GROUP_SEPARATOR) if part]
+
+
+# JSON
+
+def _flatten(binding: Dict[str, Any]) -> Row:
+    return {var: term["value"] for var, term in binding.items()}
+
+
+def parse_json_results(text: str) -> List[Row]:
+    """Parse a SPARQL JSON results document into flat rows."""
+    results = json.loads(text)
+    bindings = results.get("results", {}).get("bindings", [])
+    return [_flatten(binding) for binding in bindings]
+
+
+async def iter_json_bindings(chunks: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Incrementally parse SPARQL JSON results, yielding one binding at a time.
+
+    Only the text of the binding currently being decoded is buffered, so
+    memory stays bounded by the largest row rather than the result size.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    in_bindings = False
+    exhausted = False
+    chunk_iter = chunks.__aiter__()
+
+    async def read_more() -> bool:
+        nonlocal buffer, position, exhausted
+        try:
+            chunk = await chunk_iter.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    # Skip the head until the start of the bindings array
+    while not in_bindings:
+        match = _BINDINGS_RE.search(buffer)
+        if match:
+            position = match.end()
+            in_bindings = True
+            continue
+
+        # Keep a short tail in case the key spans two chunks
+        position = max(0, len(buffer) - 64)
+        if not await read_more():
+            # No bindings at all (e.g. an ASK result)
+            return
+
+    while True:
+        # Skip separators
+        while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+            position += 1
+        if position >= len(buffer):
+            if not await read_more():
+                raise SparqlResultsError("Truncated SPARQL results: bindings array not closed")
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            row, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Row split across chunks
+            if exhausted or not await read_more():
+                raise SparqlResultsError("Truncated SPARQL results: incomplete binding")
+            continue
+
+        position = end
+        yield row
+
+
+async def iter_json_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Row]:
+    """Stream SPARQL JSON results as flat rows."""
+    async for binding in iter_json_bindings(chunks):
+        yield _flatten(binding)
+
+
+# CSV (lexical values only, which is all the service layer uses)
+
+def _csv_rows(reader: Iterable[List[str]], header: List[str]) -> Iterable[Row]:
+    for values in reader:
+        yield {var: value for var, value in zip(header, values) if value}
+
+
+def parse_csv_results(text: str) -> List[Row]:
+    """Parse a SPARQL CSV results document into flat rows."""
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if header is None:
+        return []
+    return list(_csv_rows(reader, header))
+
+
+async def iter_csv_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Row]:
+    """
+    Stream SPARQL CSV results as flat rows.
+
+    Each chunk is cut at the last line break outside a quoted field, so
+    quoted values containing newlines are never split.
+    """
+    buffer = ""
+    header = None
+
+    async for chunk in chunks:
+        buffer += chunk
+        cut = buffer.rfind("\n")
+        while cut != -1 and buffer.count('"', 0, cut) % 2:
+            cut = buffer.rfind("\n", 0, cut)
+        if cut == -1:
+            continue
+
+        complete, buffer = buffer[:cut + 1], buffer[cut + 1:]
+        reader = csv.reader(io.StringIO(complete))
+        if header is None:
+            header = next(reader, None)
+        for row in _csv_rows(reader, header):
+            yield row
+
+    if buffer.strip():
+        reader = csv.reader(io.StringIO(buffer))
+        if header is None:
+            header = next(reader, None)
+        for row in _csv_rows(reader, header or []):
+            yield row
+
+
+# TSV (RDF term syntax, one row per line)
+
+_TSV_ESCAPES = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))')
+_TSV_ESCAPE_CHARS = {"t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f"}
+
+
+def _tsv_unescape(match: "re.Match") -> str:
+    if match.group(1) or match.group(2):
+        return chr(int(match.group(1) or match.group(2), 16))
+    char = match.group(3)
+    return _TSV_ESCAPE_CHARS.get(char, char)
+
+
+def _tsv_value(term: str) -> str:
+    """Lexical value of an RDF term in SPARQL TSV syntax."""
+    if term.startswith('"'):
+        end = term.rfind('"')
+        lexical = term[1:end]
+        if "\\" in lexical:
+            lexical = _TSV_ESCAPES.sub(_tsv_unescape, lexical)
+        return lexical
+    if term.startswith("<") and term.endswith(">"):
+        return term[1:-1]
+    # Bare numbers, booleans and blank nodes
+    return term
+
+
+def _tsv_row(header: List[str], line: str) -> Row:
+    return {
+        var: _tsv_value(term)
+        for var, term in zip(header, line.rstrip("\r").split("\t"))
+        if term
+    }
+
+
+def _tsv_header(line: str) -> List[str]:
+    return [var.lstrip("?$") for var in line.rstrip("\r").split("\t")]
+
+
+def parse_tsv_results(text: str) -> List[Row]:
+    """Parse a SPARQL TSV results document into flat rows."""
+    lines = text.split("\n")
+    if not lines or not lines[0]:
+        return []
+    header = _tsv_header(lines[0])
+    return [_tsv_row(header, line) for line in lines[1:] if line.strip("\r")]
+
+
+async def iter_tsv_rows(chunks: AsyncIterator[str]) -> AsyncIterator[Row]:
+    """Stream SPARQL TSV results as flat rows."""
+    buffer = ""
+    header = None
+
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            if header is None:
+                header = _tsv_header(line)
+            elif line.strip("\r"):
+                yield _tsv_row(header, line)
+
+    if buffer.strip("\r") and header is not None:
+        yield _tsv_row(header, buffer)
+
+
+PARSERS: Dict[str, Callable[[str], List[Row]]] = {
+    JSON: parse_json_results,
+    CSV: parse_csv_results,
+    TSV: parse_tsv_results,
+}
+
+STREAM_PARSERS: Dict[str, Callable[[AsyncIterator[str]], AsyncIterator[Row]]] = {
+    JSON: iter_json_rows,
+    CSV: iter_csv_rows,
+    TSV: iter_tsv_rows,
+}
@@ -0,0 +1,773 @@
+from typing import Dict, Any, List, Tuple, Callable
+import re
+import math
+from app.db.sparql_results import JSON, CSV, MEDIA_TYPES
+
+# Parameter types
+STRING = "string"
+INT = "int"
+DECIMAL = "decimal"
+BOOLEAN = "boolean"
+STRING_LIST = "string_list"
+
+_PLACEHOLDER_RE = re.compile(r"\$\{(\w+)\}")
+_WHERE_RE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+
+_STRING_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "'": "\\'",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+    "\b": "\\b",
+    "\f": "\\f",
+}
+
+
+class TemplateBindingError(ValueError):
+    """Raised when a template parameter is missing, unknown or of the wrong type."""
+
+
+def sparql_string(value: Any) -> str:
+    """Render a value as an escaped SPARQL string literal."""
+    if not isinstance(value, str):
+        raise TemplateBindingError(f"Expected a string, got {type(value).__name__}")
+    return '"' + "".join(_STRING_ESCAPES.get(c, c) for c in value) + '"'
+
+
+def sparql_int(value: Any) -> str:
+    """Render a value as a SPARQL integer literal."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TemplateBindingError(f"Expected an integer, got {type(value).__name__}")
+    return str(value)
+
+
+def sparql_decimal(value: Any) -> str:
+    """Render a number as a SPARQL numeric literal."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise TemplateBindingError(f"Expected a finite number, got {value!r}")
+    return repr(float(value))
+
+
+def sparql_boolean(value: Any) -> str:
+    """Render a bool as a SPARQL boolean literal."""
+    if not isinstance(value, bool):
+        raise TemplateBindingError(f"Expected a boolean, got {type(value).__name__}")
+    return "true" if value else "false"
+
+
+def sparql_string_list(values: Any) -> str:
+    """Render a non-empty list or tuple of strings as space-separated literals (for VALUES)."""
+    if not isinstance(values, (list, tuple)) or not values:
+        raise TemplateBindingError(f"Expected a non-empty list of strings, got {values!r}")
+    return " ".join(sparql_string(value) for value in values)
+
+
+_RENDERERS: Dict[str, Callable[[Any], str]] = {
+    STRING: sparql_string,
+    INT: sparql_int,
+    DECIMAL: sparql_decimal,
+    BOOLEAN: sparql_boolean,
+    STRING_LIST: sparql_string_list,
+}
+
+
+class SparqlTemplate:
+    """
+    A named SPARQL query with typed `${param}` placeholders.
+
+    The text is split into literal segments and placeholders once, when the
+    template is registered. Binding renders each parameter as an escaped
+    literal of its declared type, so user input can never change the query
+    structure. `${...}` is not valid SPARQL, so an unbound placeholder fails
+    instead of silently running. Versioned templates read only the active
+    dataset version's named graph; the others see the whole repository.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        text: str,
+        params: Dict[str, str],
+        result_format: str = JSON,
+        memoize: bool = True,
+        versioned: bool = True
+    ):
+        self.name = name
+        self.text = text
+        self.params = params
+        self.result_format = result_format
+        self.memoize = memoize
+        self.versioned = versioned
+
+        self._segments: List[Tuple[bool, str]] = []
+        position = 0
+        for match in _PLACEHOLDER_RE.finditer(text):
+            param = match.group(1)
+            if param not in params:
+                raise ValueError(f"Template '{name}' uses undeclared parameter '{param}'")
+            self._segments.append((False, text[position:match.start()]))
+            self._segments.append((True, param))
+            position = match.end()
+        self._segments.append((False, text[position:]))
+
+    def bind(self, **values: Any) -> str:
+        """Render the query with safely bound parameter values."""
+        missing = self.params.keys() - values.keys()
+        unknown = values.keys() - self.params.keys()
+        if missing or unknown:
+            raise TemplateBindingError(
+                f"Template '{self.name}': missing {sorted(missing)}, unknown {sorted(unknown)}"
+            )
+
+        rendered = {
+            param: _RENDERERS[kind](values[param])
+            for param, kind in self.params.items()
+        }
+        return "".join(
+            rendered[part] if is_param else part
+            for is_param, part in self._segments
+        )
+
+
+def with_default_graph(sparql_query: str, graph: str) -> str:
+    """Add `FROM <graph>` to a query so its default graph is just that graph."""
+    match = _WHERE_RE.search(sparql_query)
+    if match is None:
+        raise ValueError("Query has no WHERE clause to scope to a graph")
+    return f"{sparql_query[:match.start()]}FROM <{graph}>\n    {sparql_query[match.start():]}"
+
+
+TEMPLATES: Dict[str, SparqlTemplate] = {}
+
+
+def register(
+    name: str,
+    text: str,
+    result_format: str = JSON,
+    memoize: bool = True,
+    versioned: bool = True,
+    **params: str
+) -> SparqlTemplate:
+    """
+    Register a named template; parameter types are given as keyword arguments.
+
+    `result_format` is the SPARQL results format requested from GraphDB.
+    Row-heavy templates use CSV, which is several times smaller and faster
+    to parse than JSON (see ops/benchmark_sparql_formats.py). Templates
+    with `memoize=False` always go to GraphDB (probes, version checks, bulk extraction), and
+    those with `versioned=False` read the whole repository rather than the
+    active dataset graph.
+    """
+    if name in TEMPLATES:
+        raise ValueError(f"Duplicate SPARQL template '{name}'")
+    if result_format not in MEDIA_TYPES:
+        raise ValueError(f"Unknown result format '{result_format}' in template '{name}'")
+    for kind in params.values():
+        if kind not in _RENDERERS:
+            raise ValueError(f"Unknown parameter type '{kind}' in template '{name}'")
+    template = SparqlTemplate(name, text, params, result_format, memoize, versioned)
+    TEMPLATES[name] = template
+    return template
+
+
+def get_template(name: str) -> SparqlTemplate:
+    """Look up a registered template by name."""
+    try:
+        return TEMPLATES[name]
+    except KeyError:
+        raise KeyError(f"Unknown SPARQL template '{name}'")
+
+
+# Templates
+
+register(
+    "connection_test",
+    """
+    SELECT ?s WHERE {
+        ?s ?p ?o .
+    } LIMIT 1
+    """,
+    memoize=False
+)
+
+register(
+    "dataset_version",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT ?version ?graph WHERE {
+        :currentDataset :datasetVersion ?version .
+        OPTIONAL { :currentDataset :activeGraph ?graph . }
+    }
+    LIMIT 1
+    """,
+    memoize=False,
+    versioned=False
+)
+
+register(
+    "symptom_conditions",
+    """
+    PREFIX : <http://example.org/healthnav#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT DISTINCT
+        ?symptomName ?conditionId ?conditionName
+        ?precautionId ?precautionName
+    WHERE {
+        ?symptom a :Symptom ;
+                 :name ?symptomName .
+        FILTER (CONTAINS(LCASE(?symptomName), LCASE(${symptom})))
+
+        OPTIONAL {
+            ?condition a :MedicalCondition ;
+                       :hasSymptom ?symptom ;
+                       :name ?conditionName .
+            BIND(STRAFTER(STR(?condition), "#") AS ?conditionId)
+        }
+
+        OPTIONAL {
+            ?symptom :recommendedPrecaution ?precaution .
+            ?precaution :name ?precautionName .
+            BIND(STRAFTER(STR(?precaution), "#") AS ?precautionId)
+        }
+    }
+    LIMIT ${limit}
+    """,
+    result_format=CSV,
+    symptom=STRING, limit=INT
+)
+
+register(
+    "symptom_providers",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT
+        ?physicianId ?physicianName ?npi ?specialtyNames ?conditionNames ?hospitalId
+        (SAMPLE(?hospitalLabel) AS ?hospitalName)
+        (MAX(?score) AS ?hcahpsScore)
+        (SAMPLE(?latitude) AS ?lat)
+        (SAMPLE(?longitude) AS ?lng)
+        (SAMPLE(?hospitalPhone) AS ?phone)
+        (SAMPLE(?addressLine) AS ?address)
+    WHERE {
+        {
+            SELECT ?physician
+                (GROUP_CONCAT(DISTINCT ?specialtyName; SEPARATOR="|") AS ?specialtyNames)
+                (GROUP_CONCAT(DISTINCT ?conditionName; SEPARATOR="|") AS ?conditionNames)
+                (MIN(STR(?affiliation)) AS ?hospitalIri)
+            WHERE {
+                ?symptom a :Symptom ;
+                         :name ?symptomName .
+                FILTER (CONTAINS(LCASE(?symptomName), LCASE(${symptom})))
+
+                ?condition a :MedicalCondition ;
+                           :hasSymptom ?symptom ;
+                           :name ?conditionName .
+
+                ?physician a :Physician ;
+                          :treatsCondition ?condition .
+                FILTER EXISTS { ?physician :name ?anyName . }
+
+                OPTIONAL {
+                    ?physician :hasSpecialty ?specialty .
+                    ?specialty :name ?specialtyName .
+                }
+
+                # Prune by hospital location and quality before LIMIT
+                OPTIONAL {
+                    ?physician :affiliatedWith ?affiliation .
+                    ?affiliation :name ?n ;
+                                 :hcahpsOverallScore ?s .
+                    FILTER (?s >= ${min_hcahps})
+
+                    OPTIONAL {
+                        ?affiliation :locatedAt ?affiliationAddress .
+                        ?affiliationAddress :hasGeo ?affiliationGeo .
+                        ?affiliationGeo :latitude ?affiliationLat ;
+                                        :longitude ?affiliationLng .
+                    }
+                    FILTER (!${in_box} || (
+                        ?affiliationLat >= ${min_lat} && ?affiliationLat <= ${max_lat} &&
+                        ?affiliationLng >= ${min_lng} && ?affiliationLng <= ${max_lng}
+                    ))
+                }
+                FILTER ((!${in_box} && ${min_hcahps} <= 0) || BOUND(?affiliation))
+            }
+            GROUP BY ?physician
+            ORDER BY STR(?physician)
+            LIMIT ${limit}
+        }
+
+        ?physician :name ?physicianName .
+        BIND(STRAFTER(STR(?physician), "#") AS ?physicianId)
+        OPTIONAL { ?physician :npi ?npi . }
+        BIND(IRI(?hospitalIri) AS ?hospital)
+
+        OPTIONAL {
+            ?hospital :name ?hospitalLabel ;
+                     :hcahpsOverallScore ?score .
+            BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
+
+            OPTIONAL {
+                ?hospital :locatedAt ?hospitalAddress .
+                ?hospitalAddress :hasGeo ?geo .
+                ?geo :latitude ?latitude ;
+                     :longitude ?longitude .
+            }
+
+            OPTIONAL { ?hospital :phone ?hospitalPhone . }
+            OPTIONAL {
+                ?hospital :locatedAt ?addressNode .
+                ?addressNode :addressLine ?addressLine .
+            }
+        }
+    }
+    GROUP BY ?physicianId ?physicianName ?npi ?specialtyNames ?conditionNames ?hospitalId
+    ORDER BY ?physicianId
+    """,
+    result_format=CSV,
+    symptom=STRING, limit=INT,
+    in_box=BOOLEAN, min_lat=DECIMAL, max_lat=DECIMAL, min_lng=DECIMAL, max_lng=DECIMAL,
+    min_hcahps=DECIMAL
+)
+
+register(
+    "providers_by_specialty",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT
+        ?physicianId ?physicianName ?npi ?specialtyNames ?hospitalId
+        (SAMPLE(?hospitalLabel) AS ?hospitalName)
+        (MAX(?score) AS ?hcahpsScore)
+        (SAMPLE(?latitude) AS ?lat)
+        (SAMPLE(?longitude) AS ?lng)
+    WHERE {
+        {
+            SELECT ?physician
+                (GROUP_CONCAT(DISTINCT ?specialtyName; SEPARATOR="|") AS ?specialtyNames)
+                (MIN(STR(?affiliation)) AS ?hospitalIri)
+            WHERE {
+                ?physician a :Physician ;
+                          :hasSpecialty ?specialty .
+                FILTER EXISTS { ?physician :name ?anyName . }
+
+                ?specialty :name ?specialtyName .
+                FILTER (CONTAINS(LCASE(?specialtyName), LCASE(${specialty})))
+
+                # Prune by hospital location and quality before LIMIT
+                OPTIONAL {
+                    ?physician :affiliatedWith ?affiliation .
+                    ?affiliation :name ?n ;
+                                 :hcahpsOverallScore ?s .
+                    FILTER (?s >= ${min_hcahps})
+
+                    OPTIONAL {
+                        ?affiliation :locatedAt ?affiliationAddress .
+                        ?affiliationAddress :hasGeo ?affiliationGeo .
+                        ?affiliationGeo :latitude ?affiliationLat ;
+                                        :longitude ?affiliationLng .
+                    }
+                    FILTER (!${in_box} || (
+                        ?affiliationLat >= ${min_lat} && ?affiliationLat <= ${max_lat} &&
+                        ?affiliationLng >= ${min_lng} && ?affiliationLng <= ${max_lng}
+                    ))
+                }
+                FILTER ((!${in_box} && ${min_hcahps} <= 0) || BOUND(?affiliation))
+            }
+            GROUP BY ?physician
+            ORDER BY STR(?physician)
+            LIMIT ${limit}
+        }
+
+        ?physician :name ?physicianName .
+        BIND(STRAFTER(STR(?physician), "#") AS ?physicianId)
+        OPTIONAL { ?physician :npi ?npi . }
+        BIND(IRI(?hospitalIri) AS ?hospital)
+
+        OPTIONAL {
+            ?hospital :name ?hospitalLabel ;
+                     :hcahpsOverallScore ?score .
+            BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
+
+            OPTIONAL {
+                ?hospital :locatedAt ?address .
+                ?address :hasGeo ?geo .
+                ?geo :latitude ?latitude ;
+                     :longitude ?longitude .
+            }
+        }
+    }
+    GROUP BY ?physicianId ?physicianName ?npi ?specialtyNames ?hospitalId
+    ORDER BY ?physicianId
+    """,
+    result_format=CSV,
+    specialty=STRING, limit=INT,
+    in_box=BOOLEAN, min_lat=DECIMAL, max_lat=DECIMAL, min_lng=DECIMAL, max_lng=DECIMAL,
+    min_hcahps=DECIMAL
+)
+
+register(
+    "all_specialties",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT ?name
+    WHERE {
+        ?specialty a :Specialty ;
+                  :name ?name .
+    }
+    ORDER BY ?name
+    """
+)
+
+register(
+    "symptom_names",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT ?name
+    WHERE {
+        ?symptom a :Symptom ;
+                 :name ?name .
+    }
+    """
+)
+
+register(
+    "symptom_documents",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT ?symptomName ?conditionName ?precautionName
+    WHERE {
+        ?symptom a :Symptom ;
+                 :name ?symptomName .
+
+        OPTIONAL {
+            ?condition :hasSymptom ?symptom ;
+                       :name ?conditionName .
+        }
+
+        OPTIONAL {
+            ?symptom :recommendedPrecaution ?precaution .
+            ?precaution :name ?precautionName .
+        }
+    }
+    """,
+    result_format=CSV,
+)
+
+register(
+    "hospitals_page",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT
+        ?hospital ?hospitalId ?hospitalName ?cmsId ?hcahpsScore
+        ?addressLine ?city ?state ?postalCode
+        ?lat ?lng ?phone
+    WHERE {
+        {
+            SELECT ?hospital
+            WHERE {
+                ?hospital a :Hospital .
+                FILTER EXISTS { ?hospital :name ?anyName . }
+                FILTER(STR(?hospital) > ${after})
+            }
+            ORDER BY STR(?hospital)
+            OFFSET ${offset}
+            LIMIT ${page_size}
+        }
+
+        ?hospital :name ?hospitalName .
+
+        BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
+
+        OPTIONAL { ?hospital :cmsOrgId ?cmsId . }
+        OPTIONAL { ?hospital :hcahpsOverallScore ?hcahpsScore . }
+        OPTIONAL { ?hospital :phone ?phone . }
+
+        OPTIONAL {
+            ?hospital :locatedAt ?address .
+            OPTIONAL { ?address :addressLine ?addressLine . }
+            OPTIONAL { ?address :city ?city . }
+            OPTIONAL { ?address :state ?state . }
+            OPTIONAL { ?address :postalCode ?postalCode . }
+
+            OPTIONAL {
+                ?address :hasGeo ?geo .
+                ?geo :latitude ?lat ;
+                     :longitude ?lng .
+            }
+        }
+    }
+    ORDER BY STR(?hospital)
+    """,
+    result_format=CSV,
+    memoize=False,
+    after=STRING,
+    offset=INT,
+    page_size=INT
+)
+
+register(
+    "hospitals_by_id",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT
+        ?hospital ?hospitalId ?hospitalName ?cmsId ?hcahpsScore
+        ?addressLine ?city ?state ?postalCode
+        ?lat ?lng ?phone ?affiliatedProviders
+    WHERE {
+        VALUES ?hospitalId { ${ids} }
+        BIND(IRI(CONCAT("http://example.org/healthnav#", ?hospitalId)) AS ?hospital)
+
+        ?hospital a :Hospital ;
+                  :name ?hospitalName .
+
+        OPTIONAL { ?hospital :cmsOrgId ?cmsId . }
+        OPTIONAL { ?hospital :hcahpsOverallScore ?hcahpsScore . }
+        OPTIONAL { ?hospital :phone ?phone . }
+
+        OPTIONAL {
+            ?hospital :locatedAt ?address .
+            OPTIONAL { ?address :addressLine ?addressLine . }
+            OPTIONAL { ?address :city ?city . }
+            OPTIONAL { ?address :state ?state . }
+            OPTIONAL { ?address :postalCode ?postalCode . }
+
+            OPTIONAL {
+                ?address :hasGeo ?geo .
+                ?geo :latitude ?lat ;
+                     :longitude ?lng .
+            }
+        }
+
+        # Subqueries are evaluated first, so restrict the count to the batch
+        OPTIONAL {
+            SELECT ?hospital (COUNT(DISTINCT ?physician) AS ?affiliatedProviders)
+            WHERE {
+                VALUES ?hospitalId { ${ids} }
+                BIND(IRI(CONCAT("http://example.org/healthnav#", ?hospitalId)) AS ?hospital)
+                ?physician :affiliatedWith ?hospital .
+            }
+            GROUP BY ?hospital
+        }
+    }
+    """,
+    result_format=CSV,
+    ids=STRING_LIST
+)
+
+register(
+    "providers_by_id",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT ?physician ?physicianId ?physicianName ?npi ?specialtyNames ?hospitalId
+        (SAMPLE(?hospitalLabel) AS ?hospitalName)
+        (MAX(?score) AS ?hcahpsScore)
+        (SAMPLE(?latitude) AS ?lat)
+        (SAMPLE(?longitude) AS ?lng)
+        (SAMPLE(?hospitalPhone) AS ?phone)
+        (SAMPLE(?addressLine) AS ?address)
+    WHERE {
+        {
+            SELECT ?physician ?physicianId
+                (GROUP_CONCAT(DISTINCT ?specialtyName; SEPARATOR="|") AS ?specialtyNames)
+                (MIN(STR(?affiliation)) AS ?hospitalIri)
+            WHERE {
+                VALUES ?physicianId { ${ids} }
+                BIND(IRI(CONCAT("http://example.org/healthnav#", ?physicianId)) AS ?physician)
+                ?physician a :Physician .
+
+                OPTIONAL {
+                    ?physician :hasSpecialty ?specialty .
+                    ?specialty :name ?specialtyName .
+                }
+                OPTIONAL {
+                    ?physician :affiliatedWith ?affiliation .
+                    ?affiliation :name ?n .
+                }
+            }
+            GROUP BY ?physician ?physicianId
+        }
+
+        ?physician :name ?physicianName .
+        OPTIONAL { ?physician :npi ?npi . }
+        BIND(IRI(?hospitalIri) AS ?hospital)
+
+        OPTIONAL {
+            ?hospital :name ?hospitalLabel .
+            BIND(STRAFTER(STR(?hospital), "#") AS ?hospitalId)
+            OPTIONAL { ?hospital :hcahpsOverallScore ?score . }
+            OPTIONAL { ?hospital :phone ?hospitalPhone . }
+
+            OPTIONAL {
+                ?hospital :locatedAt ?hospitalAddress .
+                OPTIONAL { ?hospitalAddress :addressLine ?addressLine . }
+                OPTIONAL {
+                    ?hospitalAddress :hasGeo ?geo .
+                    ?geo :latitude ?latitude ;
+                         :longitude ?longitude .
+                }
+            }
+        }
+    }
+    GROUP BY ?physician ?physicianId ?physicianName ?npi ?specialtyNames ?hospitalId
+    """,
+    result_format=CSV,
+    ids=STRING_LIST
+)
+
+register(
+    "hospital_count",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT (COUNT(DISTINCT ?hospital) AS ?count)
+    WHERE {
+        ?hospital a :Hospital .
+        FILTER EXISTS { ?hospital :name ?anyName . }
+    }
+    """
+)
+
+register(
+    "providers_page",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT ?physician ?physicianId ?physicianName ?npi
+        (GROUP_CONCAT(DISTINCT ?specialtyName; SEPARATOR="|") AS ?specialtyNames)
+        (GROUP_CONCAT(DISTINCT ?conditionName; SEPARATOR="|") AS ?conditionNames)
+        (GROUP_CONCAT(DISTINCT ?symptomName; SEPARATOR="|") AS ?symptomNames)
+        (STRAFTER(MIN(STR(?affiliation)), "#") AS ?hospitalId)
+    WHERE {
+        {
+            SELECT ?physician
+            WHERE {
+                ?physician a :Physician .
+                FILTER EXISTS { ?physician :name ?anyName . }
+                FILTER(STR(?physician) > ${after})
+            }
+            ORDER BY STR(?physician)
+            OFFSET ${offset}
+            LIMIT ${page_size}
+        }
+
+        ?physician :name ?physicianName .
+
+        BIND(STRAFTER(STR(?physician), "#") AS ?physicianId)
+
+        OPTIONAL { ?physician :npi ?npi . }
+        OPTIONAL {
+            ?physician :hasSpecialty ?specialty .
+            ?specialty :name ?specialtyName .
+        }
+        OPTIONAL {
+            ?physician :treatsCondition ?condition .
+            ?condition :name ?conditionName .
+            OPTIONAL {
+                ?condition :hasSymptom ?symptom .
+                ?symptom :name ?symptomName .
+            }
+        }
+        OPTIONAL {
+            ?physician :affiliatedWith ?affiliation .
+            ?affiliation :name ?affiliationName .
+        }
+    }
+    GROUP BY ?physician ?physicianId ?physicianName ?npi
+    ORDER BY STR(?physician)
+    """,
+    result_format=CSV,
+    memoize=False,
+    after=STRING,
+    offset=INT,
+    page_size=INT
+)
+
+register(
+    "provider_count",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT (COUNT(DISTINCT ?physician) AS ?count)
+    WHERE {
+        ?physician a :Physician .
+        FILTER EXISTS { ?physician :name ?anyName . }
+    }
+    """,
+    memoize=False
+)
+
+register(
+    "pharmacies_page",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT DISTINCT
+        ?pharmacy ?pharmacyId ?pharmacyName
+        ?addressLine ?city ?state ?postalCode
+        ?lat ?lng ?phone
+    WHERE {
+        {
+            SELECT ?pharmacy
+            WHERE {
+                ?pharmacy a :Pharmacy .
+                FILTER EXISTS { ?pharmacy :name ?anyName . }
+                FILTER(STR(?pharmacy) > ${after})
+            }
+            ORDER BY STR(?pharmacy)
+            OFFSET ${offset}
+            LIMIT ${page_size}
+        }
+
+        ?pharmacy :name ?pharmacyName .
+
+        BIND(STRAFTER(STR(?pharmacy), "#") AS ?pharmacyId)
+
+        OPTIONAL {
+            ?pharmacy :locatedAt ?address .
+            OPTIONAL { ?address :addressLine ?addressLine . }
+            OPTIONAL { ?address :city ?city . }
+            OPTIONAL { ?address :state ?state . }
+            OPTIONAL { ?address :postalCode ?postalCode . }
+
+            OPTIONAL {
+                ?address :hasGeo ?geo .
+                ?geo :latitude ?lat ;
+                     :longitude ?lng .
+            }
+        }
+
+        OPTIONAL { ?pharmacy :phone ?phone . }
+    }
+    ORDER BY STR(?pharmacy)
+    """,
+    result_format=CSV,
+    memoize=False,
+    after=STRING,
+    offset=INT,
+    page_size=INT
+)
+
+register(
+    "pharmacy_count",
+    """
+    PREFIX : <http://example.org/healthnav#>
+
+    SELECT (COUNT(DISTINCT ?pharmacy) AS ?count)
+    WHERE {
+        ?pharmacy a :Pharmacy .
+        FILTER EXISTS { ?pharmacy :name ?anyName . }
+    }
+    """
+)
@@ -5,7 +5,13 @@ import logging
 
 from app.core.config import settings
 from app.db.mongodb import mongodb_client
-from app.api.routes import health, search, providers, hospitals, pharmacies, specialties
+from app.db.graphdb import graphdb_client
+from app.services.cache_warmer import cache_warmer
+from app.services.health_monitor import health_monitor
+from app.services.symptom_filter import known_symptom_filter
+from app.services.semantic_index import symptom_index
+from app.api.errors import register_exception_handlers
+from app.api.routes import health, search, providers, hospitals, pharmacies, specialties, admin
 
 # Configure logging
 logging.basicConfig(
@@ -27,11 +33,28 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
 
+    try:
+        await graphdb_client.start()
+    except Exception as e:
+        logger.error(f"Failed to start graph backend: {e}")
+
+    # Load the known-symptom filter and semantic index, record search
+    # popularity, warm the search cache and probe health in the background
+    known_symptom_filter.start()
+    symptom_index.start()
+    cache_warmer.start()
+    health_monitor.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Healthcare Navigator API...")
+    await health_monitor.stop()
+    await cache_warmer.stop()
+    await known_symptom_filter.stop()
+    await symptom_index.stop()
     await mongodb_client.disconnect()
+    await graphdb_client.close()
 
 
 # Create FastAPI app
@@ -51,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Answer GraphDB back-pressure with 503 + Retry-After
+register_exception_handlers(app)
+
 # Include routers
 app.include_router(health.router, prefix=settings.API_V1_STR, tags=["health"])
 app.include_router(search.router, prefix=f"{settings.API_V1_STR}/search", tags=["search"])
@@ -58,6 +84,7 @@ app.include_router(providers.router, prefix=f"{settings.API_V1_STR}/providers",
 app.include_router(hospitals.router, prefix=f"{settings.API_V1_STR}/hospitals", tags=["hospitals"])
 app.include_router(pharmacies.router, prefix=f"{settings.API_V1_STR}/pharmacies", tags=["pharmacies"])
 app.include_router(specialties.router, prefix=f"{settings.API_V1_STR}/specialties", tags=["specialties"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
 
 
 @app.get("/")
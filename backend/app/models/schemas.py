@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from enum import Enum
+from datetime import datetime
 
 
 class GeoLocation(BaseModel):
@@ -120,13 +121,47 @@ class SymptomSearchRequest(BaseModel):
     limit: int = Field(default=50, ge=1, le=200, description="Maximum results to return")
 
 
+class SymptomSuggestion(BaseModel):
+    """Known symptom matched semantically to a free-text query."""
+    name: str
+    score: float
+
+
 class SymptomSearchResponse(BaseModel):
     """Response for symptom-based search."""
     symptom: str
+    matchedSymptom: Optional[str] = Field(default=None, description="Symptom GraphDB was searched with; differs from the query after a semantic match, None if nothing matched")
     matchedConditions: List[MedicalCondition] = []
     precautions: List[Precaution] = []
     providers: List[Provider] = []
     totalResults: int
+    stale: bool = Field(default=False, description="Served from an expired cache entry while GraphDB is unavailable")
+    cachedAt: Optional[datetime] = Field(default=None, description="When a stale result was cached")
+
+
+class BatchSymptomSearchRequest(BaseModel):
+    """Request for a batch of symptom-based searches."""
+    requests: List[SymptomSearchRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Symptom searches to run"
+    )
+
+
+class BatchSymptomSearchItem(BaseModel):
+    """Result of a single search within a batch."""
+    index: int
+    result: Optional[SymptomSearchResponse] = None
+    error: Optional[str] = None
+
+
+class BatchSymptomSearchResponse(BaseModel):
+    """Response for a batch of symptom-based searches."""
+    results: List[BatchSymptomSearchItem]
+    totalRequests: int
+    uniqueSearches: int
+    failed: int = 0
 
 
 class ProviderSearchResponse(BaseModel):
@@ -150,3 +185,6 @@ class HealthCheckResponse(BaseModel):
     version: str
     graphdb_connected: bool
     mongodb_connected: bool
+    graphdb_latency_ms: Optional[float] = None
+    mongodb_latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
@@ -0,0 +1,93 @@
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+from app.db.mongodb import mongodb_client
+from app.models.schemas import SymptomSearchRequest
+from app.services.popularity import popularity_tracker
+from app.services.search import search_by_symptom_batch
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """
+    Replays the most popular symptom searches into the search cache.
+
+    Runs at application startup and after each GraphDB data load so the
+    first users after a deploy or reseed don't pay the cold-path latency.
+    """
+
+    def __init__(self):
+        self._tasks: list = []
+
+    async def warm(self, top_n: Optional[int] = None) -> Dict[str, Any]:
+        """Refresh cached results for the top-N most popular searches."""
+        top_n = top_n or settings.CACHE_WARM_TOP_N
+        searches = await popularity_tracker.top_searches(top_n)
+        if not searches:
+            logger.info("Cache warming skipped: no recorded searches yet")
+            return {"warmed": 0, "failed": 0}
+
+        requests = []
+        for params in searches:
+            try:
+                requests.append(SymptomSearchRequest(**{
+                    k: v for k, v in params.items() if k != "type"
+                }))
+            except Exception as e:
+                logger.warning(f"Skipping invalid popular search {params}: {e}")
+
+        result = await search_by_symptom_batch(
+            requests,
+            refresh=True,
+            concurrency=settings.CACHE_WARM_CONCURRENCY
+        )
+        stats = {
+            "warmed": result["totalRequests"] - result["failed"],
+            "failed": result["failed"]
+        }
+        logger.info(f"Cache warming complete: {stats['warmed']} warmed, {stats['failed']} failed")
+        return stats
+
+    async def after_data_load(self) -> Dict[str, Any]:
+        """
+        Expire cached search results and re-warm after a GraphDB data load.
+
+        Results are expired rather than deleted so they can still be served
+        stale if GraphDB fails; the warm-up overwrites the popular ones.
+        """
+        await mongodb_client.expire_search_cache()
+        return await self.warm()
+
+    async def _warm_safely(self):
+        try:
+            await self.warm()
+        except Exception as e:
+            logger.error(f"Cache warming failed: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(settings.POPULARITY_FLUSH_SECONDS)
+            try:
+                await popularity_tracker.flush()
+            except Exception as e:
+                logger.error(f"Error flushing search popularity: {e}")
+
+    def start(self):
+        """Start background popularity flushing and, if enabled, startup warming."""
+        self._tasks.append(asyncio.create_task(self._flush_loop()))
+        if settings.CACHE_WARM_ON_STARTUP:
+            self._tasks.append(asyncio.create_task(self._warm_safely()))
+
+    async def stop(self):
+        """Stop background tasks and flush pending popularity counts."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await popularity_tracker.flush()
+
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
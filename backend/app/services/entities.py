@@ -0,0 +1,74 @@
+from typing import Dict, Any, Tuple
+from app.db.sparql_results import Row, split_group
+from app.core.config import settings
+
+# Titles the graph prefixes to physician names ("Dr. Amanda Martinez")
+HONORIFICS = {"dr", "dr.", "doctor", "prof", "prof."}
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """Split a display name into first and last name, dropping leading titles."""
+    parts = name.split()
+    while len(parts) > 1 and parts[0].lower() in HONORIFICS:
+        parts = parts[1:]
+    if not parts:
+        return "", ""
+    return parts[0], " ".join(parts[1:])
+
+
+def provider_record(row: Row) -> Dict[str, Any]:
+    """Build a provider record from an aggregated physician row."""
+    name = row.get("physicianName", "")
+    first_name, last_name = split_name(name)
+    return {
+        "id": row["physicianId"],
+        "npi": row.get("npi", ""),
+        "name": name,
+        "firstName": first_name,
+        "lastName": last_name,
+        "specialties": split_group(row.get("specialtyNames")),
+        "conditions": split_group(row.get("conditionNames")),
+        "symptoms": split_group(row.get("symptomNames")),
+        "hospitalId": row.get("hospitalId"),
+        "hospitalName": row.get("hospitalName", ""),
+        "hcahpsScore": float(row["hcahpsScore"]) if row.get("hcahpsScore") else None,
+        "lat": float(row["lat"]) if row.get("lat") else settings.DEFAULT_LAT,
+        "lng": float(row["lng"]) if row.get("lng") else settings.DEFAULT_LNG,
+        "phone": row.get("phone"),
+        "address": row.get("address"),
+        "distance": None
+    }
+
+
+def hospital_record(entity: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a hospital record from a merged hospital entity."""
+    return {
+        "id": entity["hospitalId"],
+        "cmsId": entity.get("cmsId", ""),
+        "name": entity.get("hospitalName", ""),
+        "address": entity.get("addressLine", ""),
+        "city": entity.get("city", ""),
+        "state": entity.get("state", ""),
+        "zipCode": entity.get("postalCode", ""),
+        "hcahpsScore": float(entity["hcahpsScore"]) if entity.get("hcahpsScore") else 0.0,
+        "lat": float(entity["lat"]) if entity.get("lat") else settings.DEFAULT_LAT,
+        "lng": float(entity["lng"]) if entity.get("lng") else settings.DEFAULT_LNG,
+        "phone": entity.get("phone"),
+        "affiliatedProviders": int(entity.get("affiliatedProviders", 0))
+    }
+
+
+def pharmacy_record(entity: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a pharmacy record from a merged pharmacy entity."""
+    return {
+        "id": entity["pharmacyId"],
+        "name": entity.get("pharmacyName", ""),
+        "address": entity.get("addressLine", ""),
+        "city": entity.get("city", ""),
+        "state": entity.get("state", ""),
+        "zipCode": entity.get("postalCode", ""),
+        "lat": float(entity["lat"]) if entity.get("lat") else settings.DEFAULT_LAT,
+        "lng": float(entity["lng"]) if entity.get("lng") else settings.DEFAULT_LNG,
+        "phone": entity.get("phone"),
+        "distance": None
+    }
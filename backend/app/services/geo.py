@@ -29,6 +29,34 @@ def haversine_distance(
     return round(c * r, 2)
 
 
+def bounding_box(
+    lat: float,
+    lng: float,
+    radius: float
+) -> Tuple[float, float, float, float]:
+    """
+    Get the (min_lat, max_lat, min_lng, max_lng) box enclosing a circle.
+
+    The box is a superset of the radius (in miles), so it can prune
+    candidates cheaply before the exact haversine check. Near the poles
+    or across the antimeridian it widens to all longitudes.
+    """
+    # Same earth radius as haversine_distance
+    angle = radius / 3956
+    dlat = math.degrees(angle)
+    min_lat = max(-90.0, lat - dlat)
+    max_lat = min(90.0, lat + dlat)
+
+    cos_lat = math.cos(math.radians(lat))
+    if min_lat <= -90.0 or max_lat >= 90.0 or math.sin(angle) >= cos_lat:
+        return min_lat, max_lat, -180.0, 180.0
+
+    dlng = math.degrees(math.asin(math.sin(angle) / cos_lat))
+    if lng - dlng < -180.0 or lng + dlng > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lng - dlng, lng + dlng
+
+
 def calculate_distances(
     items: List[Dict[str, Any]],
     user_lat: float,
@@ -0,0 +1,83 @@
+from typing import Dict, Any, Optional, Awaitable, Callable, Tuple
+from datetime import datetime, timezone
+import asyncio
+import logging
+import time
+from app.db.graphdb import graphdb_client
+from app.db.mongodb import mongodb_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Probes GraphDB and MongoDB in the background and caches the result.
+
+    Load balancers poll /health every few seconds; answering from the last
+    probe keeps those polls from reaching the databases at all. Both probes
+    are cheap (a single-triple lookup and a ping) and run concurrently every
+    HEALTH_PROBE_INTERVAL_SECONDS.
+    """
+
+    def __init__(self):
+        self._status: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    async def _timed(check: Callable[[], Awaitable[bool]]) -> Tuple[bool, float]:
+        start = time.perf_counter()
+        ok = await check()
+        return ok, round((time.perf_counter() - start) * 1000, 2)
+
+    async def probe(self) -> Dict[str, Any]:
+        """Probe both databases now and cache the result."""
+        (graphdb_ok, graphdb_ms), (mongodb_ok, mongodb_ms) = await asyncio.gather(
+            self._timed(graphdb_client.test_connection),
+            self._timed(mongodb_client.test_connection)
+        )
+
+        previous = self._status
+        self._status = {
+            "graphdb_connected": graphdb_ok,
+            "mongodb_connected": mongodb_ok,
+            "graphdb_latency_ms": graphdb_ms,
+            "mongodb_latency_ms": mongodb_ms,
+            "checked_at": datetime.now(timezone.utc)
+        }
+        if previous is None or (
+            (previous["graphdb_connected"], previous["mongodb_connected"])
+            != (graphdb_ok, mongodb_ok)
+        ):
+            logger.info(f"Health: GraphDB {'up' if graphdb_ok else 'down'}, MongoDB {'up' if mongodb_ok else 'down'}")
+        return self._status
+
+    async def status(self) -> Dict[str, Any]:
+        """The last probe result, probing first if none has completed yet."""
+        if self._status is None:
+            return await self.probe()
+        return self._status
+
+    async def _probe_loop(self):
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}")
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL_SECONDS)
+
+    def start(self):
+        """Start probing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self):
+        """Stop background probing."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global health monitor instance
+health_monitor = HealthMonitor()
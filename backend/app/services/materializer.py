@@ -0,0 +1,200 @@
+from typing import Dict, Any, List, Optional, AsyncIterator, Iterable
+from collections import Counter
+from datetime import datetime, timezone
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from app.db.graphdb import graphdb_client
+from app.db.mongodb import mongodb_client, ENTITY_CACHE_KEYS, CONTENT_HASH
+from app.services.entities import provider_record, hospital_record, pharmacy_record
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Hospital fields copied onto each affiliated provider's record
+PROVIDER_HOSPITAL_FIELDS = {
+    "hospitalName": "hospitalName",
+    "hcahpsScore": "hcahpsScore",
+    "lat": "lat",
+    "lng": "lng",
+    "phone": "phone",
+    "address": "addressLine",
+}
+
+# GROUP_CONCAT order isn't stable between queries; sorted so hashes are
+PROVIDER_LIST_FIELDS = ("specialties", "conditions", "symptoms")
+
+
+def content_hash(doc: Dict[str, Any]) -> str:
+    """Stable hash of a document's content."""
+    return hashlib.sha1(json.dumps(doc, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def with_hash(doc: Dict[str, Any]) -> Dict[str, Any]:
+    doc[CONTENT_HASH] = content_hash(doc)
+    return doc
+
+
+class EntityMaterializer:
+    """
+    Materializes GraphDB entities into the MongoDB entity caches.
+
+    Providers, hospitals, pharmacies and specialties are extracted from
+    GraphDB in pages and turned into the denormalized documents the list and
+    detail routes serve: providers carry their hospital's name, HCAHPS score,
+    phone, address and coordinates, hospitals their affiliated provider
+    count. Runs are incremental: each document carries a content hash, only
+    changed documents are written (in bulk), and entities gone from the
+    graph are deleted. Pages arrive in key order, so each batch reconciles
+    one contiguous key range and memory stays bounded by the batch size.
+    """
+
+    def __init__(self):
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._lock is not None and self._lock.locked()
+
+    def start(self) -> bool:
+        """Materialize in the background; False if a run is already in progress."""
+        if self.running or (self._task is not None and not self._task.done()):
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self):
+        try:
+            await self.materialize()
+        except Exception as e:
+            logger.error(f"Entity cache materialization failed: {e}")
+            self.last_error = str(e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self.running, "lastRun": self.last_run, "lastError": self.last_error}
+
+    async def _sync(
+        self,
+        collection: str,
+        docs: AsyncIterator[Dict[str, Any]],
+        batch_size: int
+    ) -> Dict[str, int]:
+        """Reconcile a collection with documents arriving in ascending key order."""
+        key = ENTITY_CACHE_KEYS[collection]
+        totals: Counter = Counter()
+        batch: List[Dict[str, Any]] = []
+        after = ""
+        in_order = True
+
+        async def flush(last: Optional[str]):
+            nonlocal after
+            # Out-of-order keys would make range deletes drop live documents
+            stats = await mongodb_client.sync_entity_range(
+                collection, batch, after if in_order else None, last
+            )
+            totals.update(stats)
+            after = last
+            batch.clear()
+
+        async for doc in docs:
+            if batch and doc[key] <= batch[-1][key] or not batch and doc[key] <= after:
+                if in_order:
+                    logger.warning(f"{collection}: keys out of order at {doc[key]!r}; not pruning this run")
+                in_order = False
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                await flush(batch[-1][key])
+
+        await flush(None)
+        return {name: totals[name] for name in ("inserted", "updated", "unchanged", "deleted")}
+
+    @staticmethod
+    async def _iterate(docs: Iterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        for doc in docs:
+            yield doc
+
+    async def _provider_docs(
+        self,
+        hospitals: Dict[str, Dict[str, Any]],
+        affiliations: Counter
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for entity in graphdb_client.iter_entities("providers"):
+            hospital = hospitals.get(entity.get("hospitalId"))
+            if hospital:
+                affiliations[entity["hospitalId"]] += 1
+                entity = {
+                    **entity,
+                    **{
+                        field: hospital[source]
+                        for field, source in PROVIDER_HOSPITAL_FIELDS.items()
+                        if source in hospital
+                    }
+                }
+            record = provider_record(entity)
+            for field in PROVIDER_LIST_FIELDS:
+                record[field] = sorted(record[field])
+            yield with_hash(record)
+
+    async def _pharmacy_docs(self) -> AsyncIterator[Dict[str, Any]]:
+        async for entity in graphdb_client.iter_entities("pharmacies"):
+            yield with_hash(pharmacy_record(entity))
+
+    async def materialize(self) -> Dict[str, Any]:
+        """Bring every entity cache in line with GraphDB; returns per-collection counts."""
+        if mongodb_client.db is None:
+            raise RuntimeError("MongoDB is not connected")
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            start = time.perf_counter()
+            batch_size = settings.GRAPHDB_PAGE_SIZE
+            await graphdb_client.refresh_dataset_version()
+
+            # Hospitals first: providers are denormalized from them
+            hospitals = {
+                entity["hospitalId"]: entity
+                async for entity in graphdb_client.iter_entities("hospitals")
+            }
+            affiliations: Counter = Counter()
+
+            results = {
+                "providers": await self._sync(
+                    "providers_cache", self._provider_docs(hospitals, affiliations), batch_size
+                )
+            }
+            results["hospitals"] = await self._sync(
+                "hospitals_cache",
+                self._iterate(
+                    with_hash(hospital_record({**entity, "affiliatedProviders": affiliations[hospital_id]}))
+                    for hospital_id, entity in hospitals.items()
+                ),
+                batch_size
+            )
+            results["pharmacies"] = await self._sync("pharmacies_cache", self._pharmacy_docs(), batch_size)
+
+            specialties = await graphdb_client.get_all_specialties()
+            results["specialties"] = await self._sync(
+                "specialties_cache",
+                self._iterate(with_hash({"name": name}) for name in sorted(set(specialties))),
+                batch_size
+            )
+
+            self.last_run = {
+                "datasetVersion": graphdb_client.dataset_version,
+                "finishedAt": datetime.now(timezone.utc).isoformat(),
+                "elapsedSeconds": round(time.perf_counter() - start, 2),
+                "collections": results
+            }
+            self.last_error = None
+            logger.info(f"Entity caches materialized: {results}")
+            return self.last_run
+
+
+# Global entity materializer instance
+entity_materializer = EntityMaterializer()
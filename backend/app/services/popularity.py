@@ -0,0 +1,55 @@
+from collections import Counter
+from typing import Dict, Any, List
+import logging
+from app.db.mongodb import mongodb_client
+
+logger = logging.getLogger(__name__)
+
+
+class SearchPopularityTracker:
+    """
+    Counts how often each canonical search is made.
+
+    Counts are buffered in memory and flushed to MongoDB in bulk so recording
+    a search never adds a database round-trip to the request path. MongoDB
+    keeps a score that halves every POPULARITY_HALF_LIFE_HOURS, so searches
+    nobody makes any more drop out of the warm-up set.
+    """
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._params: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, cache_key: str, params: Dict[str, Any]):
+        """Record one occurrence of a search."""
+        self._counts[cache_key] += 1
+        self._params[cache_key] = params
+
+    async def flush(self):
+        """Write buffered counts to MongoDB."""
+        if not self._counts:
+            return
+
+        counts, params = self._counts, self._params
+        self._counts, self._params = Counter(), {}
+
+        written = await mongodb_client.record_search_popularity({
+            key: {"params": params[key], "count": count}
+            for key, count in counts.items()
+        })
+        if not written:
+            # Merge back for the next flush; searches recorded meanwhile win
+            self._counts.update(counts)
+            self._params = {**params, **self._params}
+            return
+        logger.debug(f"Flushed popularity for {len(counts)} searches")
+
+    async def top_searches(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the parameters of the most popular searches."""
+        await self.flush()
+        docs = await mongodb_client.get_popular_searches(limit)
+        return [doc["params"] for doc in docs if doc.get("params")]
+
+
+# Global popularity tracker instance
+popularity_tracker = SearchPopularityTracker()
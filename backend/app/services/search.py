@@ -1,10 +1,17 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import hashlib
 import json
+import asyncio
 from app.db.graphdb import graphdb_client
 from app.db.mongodb import mongodb_client
+from app.db.scheduler import GraphDBOverloadedError
+from app.db.circuit_breaker import GraphDBUnavailableError
+from app.services.popularity import popularity_tracker
+from app.services.symptom_filter import known_symptom_filter
+from app.services.semantic_index import symptom_index
 from app.services.geo import calculate_distances, filter_by_radius, rank_providers
+from app.services.entities import provider_record
 from app.models.schemas import (
     SymptomSearchRequest,
     SearchFilters,
@@ -23,46 +30,77 @@ def generate_cache_key(data: Dict[str, Any]) -> str:
     return hashlib.md5(json_str.encode()).hexdigest()
 
 
-async def search_by_symptom(
-    request: SymptomSearchRequest
-) -> Dict[str, Any]:
-    """
-    Search for providers, conditions, and precautions by symptom.
+def canonicalize_symptom(symptom: str) -> str:
+    """Normalize a symptom string so equivalent searches share a cache key."""
+    return " ".join(symptom.lower().split())
 
-    Data Flow (as per PDF specification):
-    1. Check MongoDB cache first
-    2. If cache miss → Query GraphDB via SPARQL (source of truth)
-    3. Process SPARQL results
-    4. Calculate distances and rank
-    5. Store in MongoDB cache
-    6. Return results
-    """
-    # Generate cache key
-    cache_key = generate_cache_key({
+
+def symptom_search_params(request: SymptomSearchRequest) -> Dict[str, Any]:
+    """Get the canonical parameters that identify a symptom search."""
+    return {
         "type": "symptom_search",
-        "symptom": request.symptom,
+        "symptom": canonicalize_symptom(request.symptom),
         "lat": request.lat,
         "lng": request.lng,
         "radius": request.radius,
         "minHcahps": request.minHcahps,
         "limit": request.limit
-    })
+    }
 
-    # Step 1: Check MongoDB cache FIRST
-    if settings.ENABLE_CACHING:
-        cached_result = await mongodb_client.get_cached_search_result(cache_key)
-        if cached_result:
-            logger.info(f"✓ Cache HIT for symptom: {request.symptom}")
-            return cached_result
 
-    # Step 2: Cache MISS → Query GraphDB (source of truth)
-    logger.info(f"✗ Cache MISS - Querying GraphDB for symptom: {request.symptom}")
-    results = await graphdb_client.search_by_symptom(
-        request.symptom,
-        limit=request.limit
-    )
-    logger.info(f"GraphDB returned {len(results.get('providers', []))} results")
+def provider_filters(request: SymptomSearchRequest) -> Dict[str, Any]:
+    """
+    Get the location and HCAHPS filters GraphDB can prune providers with.
+
+    The radius only applies with a location, so unlocated searches that
+    differ only in radius share one GraphDB query.
+    """
+    located = request.lat is not None and request.lng is not None
+    return {
+        "lat": request.lat if located else None,
+        "lng": request.lng if located else None,
+        "radius": request.radius if located else None,
+        "min_hcahps": request.minHcahps
+    }
+
+
+def resolve_symptom(symptom: str) -> Optional[str]:
+    """
+    Map a canonical symptom query to the text GraphDB is searched with.
 
+    Queries that can match a known symptom label are used as-is; otherwise
+    the closest label from the local semantic index is used if it is a
+    confident match (e.g. "very thirsty" → "excessive thirst"). Returns None
+    if nothing can match.
+    """
+    if known_symptom_filter.may_match(symptom):
+        return symptom
+    if settings.SEMANTIC_SEARCH_ENABLED:
+        match = symptom_index.best_match(symptom)
+        if match:
+            return canonicalize_symptom(match)
+    return None
+
+
+def result_cache_ttl(results: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Use the short negative-cache TTL for symptoms that matched nothing."""
+    if results.get("symptoms") or results.get("providers"):
+        return settings.CACHE_TTL_SECONDS
+    return settings.NEGATIVE_CACHE_TTL_SECONDS
+
+
+def build_symptom_response(
+    request: SymptomSearchRequest,
+    results: Dict[str, List[Dict[str, Any]]],
+    matched_symptom: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build a symptom search response from flat GraphDB result rows.
+
+    Applies distance calculation, radius/HCAHPS filtering and ranking
+    for the given request. `matched_symptom` is the symptom GraphDB was
+    searched with, which differs from the query after a semantic match.
+    """
     # Process conditions and precautions
     conditions_map = {}
     precautions_map = {}
@@ -70,66 +108,34 @@ async def search_by_symptom(
     for row in results.get("symptoms", []):
         # Extract conditions
         if "conditionId" in row and "conditionName" in row:
-            cond_id = row["conditionId"]["value"]
+            cond_id = row["conditionId"]
             conditions_map[cond_id] = {
                 "id": cond_id,
-                "name": row["conditionName"]["value"],
-                "symptoms": [row.get("symptomName", {}).get("value", "")],
+                "name": row["conditionName"],
+                "symptoms": [row.get("symptomName", "")],
                 "relatedSpecialties": []
             }
 
         # Extract precautions
         if "precautionId" in row and "precautionName" in row:
-            prec_id = row["precautionId"]["value"]
+            prec_id = row["precautionId"]
             precautions_map[prec_id] = {
                 "id": prec_id,
                 "name": prec_id,
-                "description": row["precautionName"]["value"],
+                "description": row["precautionName"],
                 "severity": "warning"
             }
 
-    # Process providers
+    # Process providers: one aggregated row per physician
     providers_map = {}
 
     for row in results.get("providers", []):
-        if "physicianId" not in row:
+        if "physicianId" not in row or row["physicianId"] in providers_map:
             continue
 
-        physician_id = row["physicianId"]["value"]
-
-        if physician_id not in providers_map:
-            # Create new provider
-            provider = {
-                "id": physician_id,
-                "npi": row.get("npi", {}).get("value", ""),
-                "name": row.get("physicianName", {}).get("value", ""),
-                "firstName": row.get("physicianName", {}).get("value", "").split()[0] if row.get("physicianName") else "",
-                "lastName": " ".join(row.get("physicianName", {}).get("value", "").split()[1:]) if row.get("physicianName") else "",
-                "specialties": [],
-                "conditions": [],
-                "symptoms": [request.symptom],
-                "hospitalId": row.get("hospitalId", {}).get("value"),
-                "hospitalName": row.get("hospitalName", {}).get("value", ""),
-                "hcahpsScore": float(row.get("hcahpsScore", {}).get("value", 0)) if row.get("hcahpsScore") else None,
-                "lat": float(row.get("lat", {}).get("value", settings.DEFAULT_LAT)) if row.get("lat") else settings.DEFAULT_LAT,
-                "lng": float(row.get("lng", {}).get("value", settings.DEFAULT_LNG)) if row.get("lng") else settings.DEFAULT_LNG,
-                "phone": row.get("phone", {}).get("value"),
-                "address": row.get("address", {}).get("value"),
-                "distance": None
-            }
-            providers_map[physician_id] = provider
-
-        # Add specialty if present
-        if "specialtyName" in row and row["specialtyName"].get("value"):
-            specialty = row["specialtyName"]["value"]
-            if specialty not in providers_map[physician_id]["specialties"]:
-                providers_map[physician_id]["specialties"].append(specialty)
-
-        # Add condition if present
-        if "conditionName" in row and row["conditionName"].get("value"):
-            condition = row["conditionName"]["value"]
-            if condition not in providers_map[physician_id]["conditions"]:
-                providers_map[physician_id]["conditions"].append(condition)
+        provider = provider_record(row)
+        provider["symptoms"] = [matched_symptom] if matched_symptom else []
+        providers_map[provider["id"]] = provider
 
     # Convert to lists
     providers_list = list(providers_map.values())
@@ -157,22 +163,242 @@ async def search_by_symptom(
         providers_list = rank_providers(providers_list)
 
     # Prepare response
-    response = {
+    return {
         "symptom": request.symptom,
+        "matchedSymptom": matched_symptom,
         "matchedConditions": list(conditions_map.values()),
         "precautions": list(precautions_map.values()),
         "providers": providers_list[:request.limit],
         "totalResults": len(providers_list)
     }
 
+
+async def search_by_symptom(
+    request: SymptomSearchRequest,
+    refresh: bool = False
+) -> Dict[str, Any]:
+    """
+    Search for providers, conditions, and precautions by symptom.
+
+    With `refresh`, the cache is bypassed and overwritten and the search
+    is not counted towards popularity (used by the cache warmer).
+
+    If GraphDB fails (or its circuit breaker is open), the last known good
+    cached result is returned flagged `stale`; without one the error is raised.
+
+    Data Flow (as per PDF specification):
+    1. Check MongoDB cache first
+    2. If cache miss → Query GraphDB via SPARQL (source of truth)
+    3. Process SPARQL results
+    4. Calculate distances and rank
+    5. Store in MongoDB cache
+    6. Return results
+    """
+    # Generate cache key
+    params = symptom_search_params(request)
+    cache_key = generate_cache_key(params)
+
+    # Step 0: Resolve the symptom; skip all I/O if it can't match anything
+    graph_symptom = resolve_symptom(params["symptom"])
+    if graph_symptom is None:
+        logger.info(f"✗ Unknown symptom, skipping lookup: {request.symptom}")
+        return build_symptom_response(request, {"symptoms": [], "providers": []})
+    if graph_symptom != params["symptom"]:
+        logger.info(f"Semantic match: '{request.symptom}' → '{graph_symptom}'")
+
+    if not refresh:
+        popularity_tracker.record(cache_key, params)
+
+    # Step 1: Check MongoDB cache FIRST
+    if settings.ENABLE_CACHING and not refresh:
+        cached_result = await mongodb_client.get_cached_search_result(cache_key)
+        if cached_result:
+            logger.info(f"✓ Cache HIT for symptom: {request.symptom}")
+            return cached_result
+
+    # Step 2: Cache MISS → Query GraphDB (source of truth)
+    logger.info(f"✗ Cache MISS - Querying GraphDB for symptom: {request.symptom}")
+    try:
+        results = await graphdb_client.search_by_symptom(
+            graph_symptom,
+            limit=request.limit,
+            **provider_filters(request)
+        )
+    except Exception as e:
+        # Serve the last known good result instead of failing; errors are never cached
+        if not refresh:
+            stale = await mongodb_client.get_stale_search_results([cache_key])
+            if cache_key in stale:
+                logger.warning(f"GraphDB unavailable ({e}); serving stale result for: {request.symptom}")
+                return stale[cache_key]
+        raise
+    logger.info(f"GraphDB returned {len(results.get('providers', []))} results")
+
+    # Steps 3-4: Process, filter and rank
+    response = build_symptom_response(request, results, graph_symptom)
+
     # Step 5: Cache result in MongoDB for next time
     if settings.ENABLE_CACHING:
-        await mongodb_client.cache_search_result(cache_key, response)
+        await mongodb_client.cache_search_result(
+            cache_key,
+            response,
+            ttl_seconds=result_cache_ttl(results)
+        )
         logger.info(f"✓ Cached result for symptom: {request.symptom}")
 
     return response
 
 
+async def search_by_symptom_batch(
+    requests: List[SymptomSearchRequest],
+    refresh: bool = False,
+    concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run many symptom searches as one batch.
+
+    Identical requests share one response, all cache lookups go to MongoDB
+    in a single round-trip, and cache misses are grouped by canonical
+    symptom, provider filters and limit so each distinct query hits GraphDB
+    once. The limit is part of the group because GraphDB caps both the
+    physicians and the condition rows it returns at the limit, so a larger
+    fetch would not build the same response. GraphDB fan-out is bounded by
+    `concurrency` (BATCH_SEARCH_CONCURRENCY by default). `refresh` behaves
+    as in `search_by_symptom`.
+
+    Other failures are reported per item, but if GraphDB is overloaded or
+    its circuit breaker is open and a search has no stale result to fall
+    back on, that error is raised for the whole batch, as a single search
+    would.
+    """
+    # Group request indexes by cache key (identical searches)
+    keys = []
+    requests_by_key: Dict[str, SymptomSearchRequest] = {}
+    graph_symptoms: Dict[str, str] = {}
+    responses: Dict[str, Dict[str, Any]] = {}
+    for request in requests:
+        params = symptom_search_params(request)
+        key = generate_cache_key(params)
+        keys.append(key)
+        if key in responses:
+            continue
+
+        # Symptoms that can't match anything are answered without I/O
+        if key not in graph_symptoms:
+            graph_symptom = resolve_symptom(params["symptom"])
+            if graph_symptom is None:
+                responses[key] = build_symptom_response(
+                    request,
+                    {"symptoms": [], "providers": []}
+                )
+                continue
+            graph_symptoms[key] = graph_symptom
+
+        requests_by_key.setdefault(key, request)
+        if not refresh:
+            popularity_tracker.record(key, params)
+
+    # One MongoDB round-trip for every distinct cache key
+    if settings.ENABLE_CACHING and not refresh:
+        responses.update(await mongodb_client.get_cached_search_results(
+            list(requests_by_key.keys())
+        ))
+
+    # Group the misses by resolved symptom, provider filters and limit to share GraphDB queries
+    misses_by_query: Dict[Tuple[str, Tuple, int], List[str]] = {}
+    for key in requests_by_key:
+        if key not in responses:
+            request = requests_by_key[key]
+            filters = tuple(provider_filters(request).items())
+            misses_by_query.setdefault((graph_symptoms[key], filters, request.limit), []).append(key)
+
+    logger.info(
+        f"Batch symptom search: {len(requests)} requests, "
+        f"{len(set(keys))} unique, {len(responses)} answered from cache or filter, "
+        f"{len(misses_by_query)} GraphDB symptom queries"
+    )
+
+    errors: Dict[str, str] = {}
+    busy: Dict[str, Exception] = {}
+    semaphore = asyncio.Semaphore(concurrency or settings.BATCH_SEARCH_CONCURRENCY)
+
+    async def resolve(symptom: str, filters: Tuple, limit: int, group: List[str]):
+        try:
+            async with semaphore:
+                results = await graphdb_client.search_by_symptom(
+                    symptom,
+                    limit=limit,
+                    **dict(filters)
+                )
+        except Exception as e:
+            logger.error(f"Batch search failed for symptom '{symptom}': {e}")
+            for key in group:
+                errors[key] = str(e)
+                if isinstance(e, (GraphDBOverloadedError, GraphDBUnavailableError)):
+                    busy[key] = e
+            return
+
+        for key in group:
+            try:
+                response = build_symptom_response(requests_by_key[key], results, symptom)
+            except Exception as e:
+                logger.error(f"Batch search failed to build response for '{symptom}': {e}")
+                errors[key] = str(e)
+                continue
+            responses[key] = response
+            if settings.ENABLE_CACHING:
+                await mongodb_client.cache_search_result(
+                    key,
+                    response,
+                    ttl_seconds=result_cache_ttl(results)
+                )
+
+    await asyncio.gather(*(
+        resolve(symptom, filters, limit, group)
+        for (symptom, filters, limit), group in misses_by_query.items()
+    ))
+
+    # Fall back to the last known good results for searches GraphDB failed
+    if errors and not refresh:
+        stale = await mongodb_client.get_stale_search_results(list(errors))
+        for key, result in stale.items():
+            responses[key] = result
+            del errors[key]
+        if stale:
+            logger.warning(f"Batch symptom search served {len(stale)} stale results")
+
+    # Back-pressure is answered with 503 + Retry-After, like a single search
+    for key in errors:
+        if key in busy:
+            raise busy[key]
+
+    items = []
+    for index, (key, request) in enumerate(zip(keys, requests)):
+        if key in responses:
+            # Echo each caller's own symptom spelling
+            result = {**responses[key], "symptom": request.symptom}
+            items.append({"index": index, "result": result, "error": None})
+        else:
+            items.append({
+                "index": index,
+                "result": None,
+                "error": errors.get(key, "Search failed")
+            })
+
+    return {
+        "results": items,
+        "totalRequests": len(requests),
+        "uniqueSearches": len(set(keys)),
+        "failed": sum(1 for item in items if item["error"] is not None)
+    }
+
+
+def suggest_symptoms(query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Get the known symptoms semantically closest to a free-text query."""
+    matches = symptom_index.search(canonicalize_symptom(query), top_k=limit)
+    return [{"name": name, "score": round(score, 4)} for name, score in matches]
+
+
 async def search_providers(
     filters: SearchFilters
 ) -> Dict[str, Any]:
@@ -0,0 +1,254 @@
+from typing import List, Dict, Tuple, Optional
+import asyncio
+import logging
+import os
+import re
+import zlib
+import numpy as np
+from app.db.graphdb import graphdb_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Character n-gram sizes used for embedding
+_NGRAM_SIZES = (3, 4)
+
+# Query words that say nothing about which symptom is meant
+_STOPWORDS = frozenset(
+    "a about after all always am an and are at bad badly be been can cant constantly day "
+    "feel feeling felt get getting hard has have having i im is keep lot lots much my night "
+    "of often or really so t the time to too very when".split()
+)
+
+# Everyday words → the clinical terms symptom labels use; added to queries
+LAY_TERMS = {
+    "breathe": "breath",
+    "breathing": "breath",
+    "hurt": "pain ache",
+    "hurts": "pain ache",
+    "hurting": "pain ache",
+    "sore": "pain ache",
+    "tired": "fatigue",
+    "exhausted": "fatigue",
+    "thirsty": "thirst",
+    "pee": "urination",
+    "peeing": "urination",
+    "dizzy": "dizziness",
+    "lightheaded": "dizziness",
+    "queasy": "nausea",
+    "nauseous": "nausea",
+    "sick": "nausea",
+    "cough": "coughing",
+    "wheezy": "wheezing",
+}
+
+
+def _features(text: str) -> List[str]:
+    """Split text into word tokens and padded character n-grams."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = [f"w:{t}" for t in tokens]
+    for token in tokens:
+        padded = f" {token} "
+        for n in _NGRAM_SIZES:
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return features
+
+
+def _expand(query: str) -> str:
+    """Append the clinical terms for any lay words in the query."""
+    tokens = _TOKEN_RE.findall(query.lower())
+    return " ".join(tokens + [LAY_TERMS[t] for t in tokens if t in LAY_TERMS])
+
+
+def _word_matches(term: str, words: frozenset) -> bool:
+    """Whether a query term appears in a document, allowing for inflections (breathe/breath)."""
+    for word in words:
+        if term == word or (len(term) >= 4 and term in word):
+            return True
+        if len(term) >= 5 and len(word) >= 5 and term[:5] == word[:5]:
+            return True
+    return False
+
+
+class SymptomVectorIndex:
+    """
+    Local TF-IDF index over symptom, condition and precaution text.
+
+    Each symptom is one document made of its name, the conditions that have
+    it and its precautions. Documents are embedded as hashed word and
+    character n-gram TF-IDF vectors in a dense NumPy matrix, so queries such
+    as "can't breathe" find "Shortness Of Breath" by cosine similarity
+    without any network or model service. Labels differing only in case or
+    spacing are one document.
+    """
+
+    def __init__(self, dim: int = 4096):
+        self.dim = dim
+        self.labels: List[str] = []
+        self.words: Dict[str, frozenset] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.matrix: Optional[np.ndarray] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.matrix is not None and len(self.labels) > 0
+
+    def _term_frequencies(self, texts: List[str]) -> np.ndarray:
+        """Hashed, sublinear term-frequency matrix for texts."""
+        tf = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in _features(text):
+                # crc32 is stable across processes, unlike hash()
+                tf[row, zlib.crc32(feature.encode("utf-8")) % self.dim] += 1
+        np.log1p(tf, out=tf)
+        return tf
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def build(self, documents: Dict[str, str]):
+        """Build the index from symptom label → document text."""
+        # Case variants ("Chest Pain", "Chest pain") would tie as best and
+        # runner-up, so merge them under one label
+        variants: Dict[str, List[str]] = {}
+        for label in documents:
+            variants.setdefault(" ".join(label.lower().split()), []).append(label)
+        merged = {
+            min(group): " ".join(documents[label] for label in sorted(group))
+            for group in variants.values()
+        }
+
+        labels = sorted(merged)
+        # Repeat the label so it outweighs long precaution text
+        texts = [f"{label} {label} {merged[label]}" for label in labels]
+        tf = self._term_frequencies(texts)
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1 + len(labels)) / (1 + df)) + 1).astype(np.float32)
+
+        self.labels = labels
+        self._set_words(texts)
+        self.idf = idf
+        self.matrix = self._normalize(tf * idf)
+
+    def _set_words(self, texts: List[str]):
+        self.words = {
+            label: frozenset(_TOKEN_RE.findall(text.lower()))
+            for label, text in zip(self.labels, texts)
+        }
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to top_k (symptom label, cosine score) pairs, best first."""
+        if not self.loaded:
+            return []
+
+        vector = self._normalize(self._term_frequencies([_expand(query)])[0] * self.idf)
+        scores = self.matrix @ vector
+
+        top_k = min(top_k, len(self.labels))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(self.labels[i], float(scores[i])) for i in best if scores[i] > 0]
+
+    def covers(self, query: str, label: str) -> bool:
+        """
+        Whether every meaningful query word (or its clinical term) appears in
+        the symptom's document.
+
+        Shared n-grams alone ("stomach ache" vs "Headache", "back pain" vs
+        "Chest Pain") score like real paraphrases; a word the symptom never
+        mentions ("stomach", "back") rules the match out.
+        """
+        words = self.words.get(label, frozenset())
+        for token in _TOKEN_RE.findall(query.lower()):
+            if token in _STOPWORDS:
+                continue
+            terms = [token] + LAY_TERMS.get(token, "").split()
+            if not any(_word_matches(term, words) for term in terms):
+                return False
+        return True
+
+    def best_match(self, query: str) -> Optional[str]:
+        """
+        Return the closest symptom label, if it is a confident match.
+
+        The best score must reach SEMANTIC_MIN_SCORE, lead the second best
+        by SEMANTIC_MIN_MARGIN, and the symptom must cover every meaningful
+        query word; otherwise None is returned.
+        """
+        matches = self.search(query, top_k=2)
+        if not matches or matches[0][1] < settings.SEMANTIC_MIN_SCORE:
+            return None
+        runner_up = matches[1][1] if len(matches) > 1 else 0.0
+        if matches[0][1] - runner_up < settings.SEMANTIC_MIN_MARGIN:
+            return None
+        if not self.covers(query, matches[0][0]):
+            return None
+        return matches[0][0]
+
+    def save(self, path: str):
+        """Write the index to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            dim=np.array(self.dim),
+            labels=np.array(self.labels),
+            texts=np.array([" ".join(sorted(self.words[label])) for label in self.labels]),
+            idf=self.idf,
+            matrix=self.matrix
+        )
+
+    def load(self, path: str):
+        """Load an index written by `save`."""
+        with np.load(path) as data:
+            self.dim = int(data["dim"])
+            self.labels = [str(label) for label in data["labels"]]
+            # Indexes saved before word coverage was kept fall back to their labels
+            texts = [str(text) for text in data["texts"]] if "texts" in data else self.labels
+            self._set_words(texts)
+            self.idf = data["idf"]
+            self.matrix = data["matrix"]
+
+    async def refresh(self):
+        """Rebuild the index from GraphDB symptom documents."""
+        try:
+            documents = await graphdb_client.get_symptom_documents()
+        except Exception as e:
+            logger.warning(f"Could not load symptom documents: {e}")
+            return
+
+        if not documents:
+            logger.warning("GraphDB returned no symptom documents; keeping previous index")
+            return
+
+        self.build(documents)
+        logger.info(f"Built semantic symptom index with {len(self.labels)} symptoms")
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.SEMANTIC_INDEX_REFRESH_SECONDS)
+
+    def start(self):
+        """Load the prebuilt index, or build it from GraphDB and keep it fresh."""
+        if settings.SEMANTIC_INDEX_PATH and os.path.exists(settings.SEMANTIC_INDEX_PATH):
+            self.load(settings.SEMANTIC_INDEX_PATH)
+            logger.info(f"Loaded semantic symptom index from {settings.SEMANTIC_INDEX_PATH}")
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the background refresh."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global semantic symptom index instance
+symptom_index = SymptomVectorIndex(dim=settings.SEMANTIC_INDEX_DIM)
@@ -0,0 +1,79 @@
+from typing import List, Optional
+import asyncio
+import logging
+from app.db.graphdb import graphdb_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Separator that can never appear in a canonical (whitespace-collapsed) query
+_SEPARATOR = "\n"
+
+
+class KnownSymptomFilter:
+    """
+    Exact pre-filter for symptom queries built from GraphDB symptom labels.
+
+    Symptom search matches labels with CONTAINS(LCASE(name), LCASE(query)),
+    so a query can only match if it is a substring of some lowercased label.
+    Labels are joined into one string, making the check a single substring
+    scan with no I/O. There are no false negatives for the loaded labels;
+    until labels are loaded every query is allowed through.
+    """
+
+    def __init__(self):
+        self._labels: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self.label_count = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._labels is not None
+
+    def load(self, labels: List[str]):
+        """Replace the known labels."""
+        canonical = {" ".join(label.lower().split()) for label in labels}
+        self._labels = _SEPARATOR.join(sorted(canonical))
+        self.label_count = len(canonical)
+
+    def may_match(self, canonical_symptom: str) -> bool:
+        """Return False only if the query cannot match any known symptom."""
+        if self._labels is None:
+            return True
+        return canonical_symptom in self._labels
+
+    async def refresh(self):
+        """Reload symptom labels from GraphDB."""
+        try:
+            labels = await graphdb_client.get_symptom_names()
+        except Exception as e:
+            logger.warning(f"Could not load symptom labels: {e}")
+            return
+
+        # An empty repository is more likely mid-load than truly empty
+        if not labels:
+            logger.warning("GraphDB returned no symptom labels; keeping previous filter")
+            return
+
+        self.load(labels)
+        logger.info(f"Loaded {self.label_count} symptom labels into known-term filter")
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.SYMPTOM_FILTER_REFRESH_SECONDS)
+
+    def start(self):
+        """Load labels now and refresh them periodically in the background."""
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the background refresh."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Global known-symptom filter instance
+known_symptom_filter = KnownSymptomFilter()
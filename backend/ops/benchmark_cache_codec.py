@@ -0,0 +1,102 @@
+"""
+Benchmark the compact search-cache codec against plain BSON documents.
+
+Builds synthetic symptom search results of several sizes and reports the
+stored size and encode/decode CPU time for both representations.
+
+Usage:
+    python ops/benchmark_cache_codec.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+import bson
+from app.db.cache_codec import encode_search_result, decode_search_result
+
+
+def make_result(provider_count: int, hospital_count: int) -> dict:
+    """Build a search result shaped like search_by_symptom output."""
+    hospitals = [
+        {
+            "hospitalId": f"Hospital{i}",
+            "hospitalName": f"Regional Medical Center {i}",
+            "hcahpsScore": round(random.uniform(70, 95), 1),
+            "lat": 33.4 + random.uniform(-0.5, 0.5),
+            "lng": -112.0 + random.uniform(-0.5, 0.5),
+            "phone": f"(602) 555-{i:04d}",
+            "address": f"{random.randint(100, 9999)} E McDowell Rd"
+        }
+        for i in range(hospital_count)
+    ]
+
+    providers = []
+    for i in range(provider_count):
+        hospital = random.choice(hospitals)
+        providers.append({
+            "id": f"DrProvider{i}",
+            "npi": f"{random.randint(1000000000, 9999999999)}",
+            "name": f"Dr. Provider {i}",
+            "firstName": "Dr.",
+            "lastName": f"Provider {i}",
+            "specialties": random.sample(["Cardiology", "Neurology", "Pulmonology", "Endocrinology"], 2),
+            "conditions": ["Coronary artery disease"],
+            "symptoms": ["chest pain"],
+            **hospital,
+            "distance": round(random.uniform(0, 25), 2),
+            "score": random.random()
+        })
+
+    return {
+        "symptom": "chest pain",
+        "matchedConditions": [{"id": "CAD", "name": "Coronary artery disease", "symptoms": ["Chest Pain"], "relatedSpecialties": []}],
+        "precautions": [],
+        "providers": providers,
+        "totalResults": provider_count
+    }
+
+
+def time_it(func, repeat: int) -> float:
+    """Average wall time of func() in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    random.seed(531)
+
+    print("=" * 78)
+    print("Search cache codec benchmark (BSON document vs compact payload)")
+    print("=" * 78)
+    print(f"{'providers':>10} {'bson bytes':>12} {'codec bytes':>12} {'ratio':>7} "
+          f"{'bson enc/dec ms':>17} {'codec enc/dec ms':>17}")
+
+    for provider_count in (10, 50, 200, 1000, 5000):
+        result = make_result(provider_count, hospital_count=max(3, provider_count // 20))
+        repeat = max(5, 2000 // provider_count)
+
+        bson_bytes = bson.encode({"result": result})
+        payload = encode_search_result(result)
+        assert decode_search_result(payload) == result
+
+        bson_enc = time_it(lambda: bson.encode({"result": result}), repeat)
+        bson_dec = time_it(lambda: bson.decode(bson_bytes), repeat)
+        codec_enc = time_it(lambda: encode_search_result(result), repeat)
+        codec_dec = time_it(lambda: decode_search_result(payload), repeat)
+
+        print(f"{provider_count:>10} {len(bson_bytes):>12,} {len(payload):>12,} "
+              f"{len(bson_bytes) / len(payload):>6.1f}x "
+              f"{bson_enc:>8.2f}/{bson_dec:<8.2f} {codec_enc:>8.2f}/{codec_dec:<8.2f}")
+
+    print("\nCodec times include building the columnar layout and zlib; BSON")
+    print("times exclude the wire transfer and working-set savings of the")
+    print("smaller payload.")
+
+
+if __name__ == "__main__":
+    main()
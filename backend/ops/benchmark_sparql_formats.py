@@ -0,0 +1,136 @@
+"""
+Benchmark SPARQL result formats: JSON vs CSV vs TSV.
+
+Serializes a synthetic provider-query result set in each format GraphDB
+can return and measures payload size and parse time, both for whole
+documents and for the streaming parsers used by GraphDBClient.stream().
+
+Usage:
+    python ops/benchmark_sparql_formats.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import csv
+import io
+import json
+import random
+import time
+from app.db.sparql_results import JSON, CSV, TSV, PARSERS, STREAM_PARSERS
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+VARIABLES = [
+    "physicianId", "physicianName", "npi", "specialtyNames", "conditionNames",
+    "hospitalId", "hospitalName", "hcahpsScore", "lat", "lng", "phone", "address"
+]
+
+
+def make_rows(count: int) -> list:
+    """Rows shaped like the symptom_providers template: (value, datatype) per variable."""
+    rows = []
+    for i in range(count):
+        hospital = random.randint(0, 50)
+        row = {
+            "physicianId": (f"DrProvider{i}", None),
+            "physicianName": (f"Dr. Provider {i}", None),
+            "npi": (str(random.randint(10**9, 10**10 - 1)), None),
+            "specialtyNames": ("|".join(random.sample(["Cardiology", "Neurology", "Allergy & Immunology"], 2)), None),
+            "conditionNames": ("|".join(random.sample(["Coronary artery disease", "Migraine", "Asthma"], 2)), None),
+            "hospitalId": (f"Hospital{hospital}", None),
+            "hospitalName": (f"Regional Medical Center \"{hospital}\", Phoenix", None),
+            "hcahpsScore": (f"{random.uniform(70, 95):.1f}", XSD + "decimal"),
+            "lat": (f"{random.uniform(33, 34):.6f}", XSD + "decimal"),
+            "lng": (f"{random.uniform(-113, -111):.6f}", XSD + "decimal"),
+            "phone": (f"(602) 555-{hospital:04d}", None),
+        }
+        if random.random() < 0.8:
+            row["address"] = (f"{random.randint(100, 9999)} E McDowell Rd", None)
+        rows.append(row)
+    return rows
+
+
+def to_json(rows: list) -> str:
+    bindings = []
+    for row in rows:
+        binding = {}
+        for var, (value, datatype) in row.items():
+            term = {"type": "literal", "value": value}
+            if datatype:
+                term["datatype"] = datatype
+            binding[var] = term
+        bindings.append(binding)
+    return json.dumps({"head": {"vars": VARIABLES}, "results": {"bindings": bindings}})
+
+
+def to_csv(rows: list) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\r\n")
+    writer.writerow(VARIABLES)
+    for row in rows:
+        writer.writerow([row[var][0] if var in row else "" for var in VARIABLES])
+    return out.getvalue()
+
+
+def to_tsv(rows: list) -> str:
+    def term(value, datatype):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\t", "\\t").replace("\n", "\\n")
+        return f'"{escaped}"^^<{datatype}>' if datatype else f'"{escaped}"'
+
+    lines = ["\t".join(f"?{var}" for var in VARIABLES)]
+    for row in rows:
+        lines.append("\t".join(term(*row[var]) if var in row else "" for var in VARIABLES))
+    return "\n".join(lines) + "\n"
+
+
+async def stream_parse(fmt: str, text: str, chunk_size: int = 65536) -> int:
+    async def chunks():
+        for i in range(0, len(text), chunk_size):
+            yield text[i:i + chunk_size]
+
+    count = 0
+    async for _ in STREAM_PARSERS[fmt](chunks()):
+        count += 1
+    return count
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Best wall time of func() in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    random.seed(531)
+    serializers = {JSON: to_json, CSV: to_csv, TSV: to_tsv}
+
+    print("=" * 72)
+    print("SPARQL result format benchmark")
+    print("=" * 72)
+    print(f"{'rows':>8} {'format':>7} {'bytes':>12} {'parse ms':>10} {'stream ms':>10}")
+
+    for count in (1000, 10000, 100000):
+        rows = make_rows(count)
+        expected = None
+        for fmt, serialize in serializers.items():
+            text = serialize(rows)
+            parsed = PARSERS[fmt](text)
+            if expected is None:
+                expected = parsed
+            assert parsed == expected, f"{fmt} rows differ from JSON"
+
+            parse_ms = best_of(lambda: PARSERS[fmt](text))
+            stream_ms = best_of(lambda: asyncio.run(stream_parse(fmt, text)), repeat=3)
+            print(f"{count:>8} {fmt:>7} {len(text.encode()):>12,} {parse_ms:>10.1f} {stream_ms:>10.1f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Build the semantic symptom index offline from GraphDB.
+
+Writes a compressed .npz file that the API loads at startup when
+SEMANTIC_INDEX_PATH points to it, so no index build happens at runtime.
+
+Usage:
+    python ops/build_symptom_index.py [output_path]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from pathlib import Path
+from app.core.config import settings
+from app.db.graphdb import graphdb_client
+from app.services.semantic_index import SymptomVectorIndex
+
+
+async def build_index(output_path: Path) -> bool:
+    """Build the index from GraphDB and save it."""
+    print("=" * 60)
+    print("Semantic Symptom Index Builder")
+    print("=" * 60)
+
+    print(f"\n[1/3] Loading symptom documents from GraphDB ({settings.GRAPHDB_URL})...")
+    try:
+        documents = await graphdb_client.get_symptom_documents()
+    except Exception as e:
+        print(f"✗ Failed to query GraphDB: {e}")
+        return False
+
+    if not documents:
+        print("✗ No symptoms found. Seed GraphDB first: python ops/seed_graphdb.py")
+        return False
+    print(f"✓ Loaded {len(documents)} symptoms")
+
+    print("\n[2/3] Building TF-IDF index...")
+    index = SymptomVectorIndex(dim=settings.SEMANTIC_INDEX_DIM)
+    start = time.perf_counter()
+    index.build(documents)
+    print(f"✓ Built {index.matrix.shape[0]}x{index.matrix.shape[1]} matrix "
+          f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    print(f"\n[3/3] Saving to {output_path}...")
+    index.save(str(output_path))
+    print("✓ Saved")
+
+    print("\nSample queries:")
+    for query in ["can't breathe", "my head hurts", "always thirsty"]:
+        matches = ", ".join(f"{name} ({score:.2f})" for name, score in index.search(query, top_k=3))
+        print(f"  {query!r}: {matches}")
+
+    print(f"\nSet SEMANTIC_INDEX_PATH={output_path} to load this index at startup.")
+    return True
+
+
+if __name__ == "__main__":
+    default_path = Path(__file__).parent / "symptom_index.npz"
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else default_path
+    success = asyncio.run(build_index(output))
+    sys.exit(0 if success else 1)
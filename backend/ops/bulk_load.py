@@ -0,0 +1,316 @@
+"""
+Bulk load large Turtle/N-Triples files into GraphDB.
+
+Files are streamed in statement-aligned chunks of N-Triples (Turtle is
+parsed incrementally and re-serialized), each chunk is sent gzip-encoded
+and several uploads are kept in flight. Failed uploads are retried with
+exponential backoff. Memory use is bounded by the chunk size times the
+number of chunks in flight, whatever the file size.
+
+Without --graph, the files are loaded as a new dataset version: into the
+version's named graph, validated, activated like ops/seed_graphdb.py does,
+and followed by an entity and search cache refresh. The files must then
+be the complete dataset (ontology and all data files). With --graph, they
+are imported into that graph as-is and no version is activated.
+
+Usage:
+    python ops/bulk_load.py FILE [FILE ...] [--graph IRI]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import gzip
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import pyoxigraph
+import requests
+from app.core.config import settings
+from app.db.dataset_version import new_dataset_version, dataset_graph
+
+# Responses worth retrying; other errors (e.g. 400 for bad RDF) fail at once
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 30.0
+
+
+class BulkLoadError(Exception):
+    """Raised when a chunk can't be loaded after all retries."""
+
+
+@dataclass
+class LoadReport:
+    """Outcome and throughput of a bulk load."""
+
+    files: int = 0
+    triples: int = 0
+    chunks: int = 0
+    bytes_sent: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def triples_per_second(self) -> float:
+        return self.triples / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "LoadReport"):
+        self.files += other.files
+        self.triples += other.triples
+        self.chunks += other.chunks
+        self.bytes_sent += other.bytes_sent
+        self.retries += other.retries
+        self.seconds += other.seconds
+        self.error = self.error or other.error
+
+    def summary(self) -> str:
+        return (
+            f"{self.triples:,} triples in {self.seconds:.1f}s "
+            f"({self.triples_per_second:,.0f} triples/s, {self.chunks} chunks, "
+            f"{self.bytes_sent / 1e6:.1f} MB sent, {self.retries} retries)"
+        )
+
+
+def open_rdf(path: Path):
+    """Open an RDF file for binary reading, transparently gunzipping *.gz."""
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def is_ntriples(path: Path) -> bool:
+    suffixes = path.suffixes[:-1] if path.suffix == ".gz" else path.suffixes
+    return bool(suffixes) and suffixes[-1] == ".nt"
+
+
+def ntriples_chunks(path: Path, chunk_triples: int) -> Iterator[Tuple[bytes, int]]:
+    """Split an N-Triples file on line boundaries (one statement per line)."""
+    with open_rdf(path) as f:
+        lines: List[bytes] = []
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith(b"#"):
+                continue
+            lines.append(line if line.endswith(b"\n") else line + b"\n")
+            if len(lines) >= chunk_triples:
+                yield b"".join(lines), len(lines)
+                lines = []
+        if lines:
+            yield b"".join(lines), len(lines)
+
+
+def turtle_chunks(path: Path, chunk_triples: int) -> Iterator[Tuple[bytes, int]]:
+    """Parse a Turtle file incrementally and re-serialize it as N-Triples chunks."""
+    with open_rdf(path) as f:
+        triples = pyoxigraph.parse(input=f, format=pyoxigraph.RdfFormat.TURTLE)
+        while True:
+            chunk = list(islice(triples, chunk_triples))
+            if not chunk:
+                return
+            yield pyoxigraph.serialize(chunk, format=pyoxigraph.RdfFormat.N_TRIPLES), len(chunk)
+
+
+def rdf_chunks(path: Path, chunk_triples: int) -> Iterator[Tuple[bytes, int]]:
+    """Statement-aligned N-Triples chunks of an RDF file, with their triple counts."""
+    if is_ntriples(path):
+        return ntriples_chunks(path, chunk_triples)
+    return turtle_chunks(path, chunk_triples)
+
+
+class BulkLoader:
+    """
+    Parallel, chunked, compressed loader for a GraphDB repository.
+
+    Each chunk is its own transaction, so a failed load can leave part of a
+    file behind; load into a fresh named graph (as seed_graphdb.py does) and
+    validate it before making it live.
+    """
+
+    def __init__(
+        self,
+        repository_url: str,
+        auth: Optional[Tuple[str, str]] = None,
+        chunk_triples: int = settings.GRAPHDB_BULK_CHUNK_TRIPLES,
+        parallelism: int = settings.GRAPHDB_BULK_PARALLELISM,
+        max_retries: int = settings.GRAPHDB_BULK_MAX_RETRIES,
+        compress: bool = settings.GRAPHDB_BULK_GZIP,
+        timeout: float = settings.GRAPHDB_BULK_TIMEOUT_SECONDS
+    ):
+        self.statements_url = f"{repository_url}/statements"
+        self.auth = auth
+        self.chunk_triples = chunk_triples
+        self.parallelism = max(1, parallelism)
+        self.max_retries = max_retries
+        self.compress = compress
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # Sessions pool connections but aren't thread-safe; one per worker
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.auth = self.auth
+        return session
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, 0.5 * 2 ** attempt))
+
+    def _upload(self, body: bytes, graph: Optional[str]) -> Tuple[int, int]:
+        """POST one chunk, retrying transient failures. Returns (bytes sent, retries)."""
+        headers = {"Content-Type": "application/n-triples"}
+        if self.compress:
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._session().post(
+                    self.statements_url,
+                    params={"context": f"<{graph}>"} if graph else None,
+                    headers=headers,
+                    data=body,
+                    timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                reason = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code in (200, 204):
+                    return len(body), attempt
+                reason = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRY_STATUSES:
+                    raise BulkLoadError(reason)
+
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt))
+
+        raise BulkLoadError(f"gave up after {self.max_retries + 1} attempts ({reason})")
+
+    def load_file(self, path: Path, graph: Optional[str] = None) -> LoadReport:
+        """Load one file, into the named graph `graph` if given."""
+        report = LoadReport(files=1)
+        start = time.perf_counter()
+        pending = {}
+
+        def collect(done):
+            for future in done:
+                triples = pending.pop(future)
+                sent, retries = future.result()
+                report.triples += triples
+                report.bytes_sent += sent
+                report.retries += retries
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            try:
+                for body, triples in rdf_chunks(path, self.chunk_triples):
+                    # Bound the chunks held in memory to twice the uploads in flight
+                    if len(pending) >= self.parallelism * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    pending[pool.submit(self._upload, body, graph)] = triples
+                    report.chunks += 1
+                collect(wait(pending).done)
+            except Exception as e:
+                for future in pending:
+                    future.cancel()
+                report.error = f"{type(e).__name__}: {e}"
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def load_files(self, paths: List[Path], graph: Optional[str] = None) -> LoadReport:
+        """Load files in order, stopping at the first failure."""
+        total = LoadReport()
+        for path in paths:
+            print(f"Loading {path.name}...", end=" ", flush=True)
+            report = self.load_file(path, graph)
+            total.add(report)
+            if not report.ok:
+                print(f"✗ {report.error}")
+                break
+            print(f"✓ {report.summary()}")
+        return total
+
+
+async def load_dataset_version(loader: BulkLoader, paths: List[Path]) -> bool:
+    """Load the files as a new dataset version and switch the API to it."""
+    # Imported here: seed_graphdb imports BulkLoader from this module
+    from ops.seed_graphdb import GraphDBSeeder, REQUIRED_ENTITIES, drop_old_versions, refresh_search_cache
+
+    seeder = GraphDBSeeder()
+    version = new_dataset_version()
+    graph = dataset_graph(version)
+
+    print(f"\n[1/4] Loading {len(paths)} files into {graph}...")
+    report = await asyncio.to_thread(loader.load_files, paths, graph)
+    print(f"\n{'✓' if report.ok else '✗'} Total: {report.summary()}")
+
+    # Validate the new version before it goes live
+    print("\n[2/4] Validating new dataset version...")
+    counts = seeder.verify_data(graph) if report.ok else {}
+    missing = [entity_type for entity_type in REQUIRED_ENTITIES if not counts.get(entity_type)]
+    if not report.ok or missing:
+        print(f"\n✗ Validation failed (missing: {missing or 'none'})")
+        print("  The active dataset version was left unchanged; dropping the new graph")
+        seeder.drop_graph(graph)
+        return False
+
+    print("\n[3/4] Activating new dataset version...")
+    if not seeder.activate_version(version, graph):
+        print("✗ Could not activate the new dataset version")
+        return False
+
+    grace_seconds = settings.GRAPHDB_VERSION_POLL_SECONDS * 2
+    print(f"Old dataset versions will be dropped in {grace_seconds}s")
+    cleanup = asyncio.create_task(drop_old_versions(seeder, graph, grace_seconds))
+
+    print("\n[4/4] Refreshing entity and search caches...")
+    await refresh_search_cache()
+
+    dropped = await cleanup
+    print(f"✓ Dropped {dropped} old dataset version(s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load Turtle/N-Triples files into GraphDB")
+    parser.add_argument("files", nargs="+", type=Path, help="*.ttl, *.nt or *.owl files, optionally gzipped")
+    parser.add_argument(
+        "--graph",
+        help="named graph to import into as-is (default: load and activate a new dataset version)"
+    )
+    parser.add_argument("--chunk-triples", type=int, default=settings.GRAPHDB_BULK_CHUNK_TRIPLES)
+    parser.add_argument("--parallelism", type=int, default=settings.GRAPHDB_BULK_PARALLELISM)
+    args = parser.parse_args()
+
+    auth = None
+    if settings.GRAPHDB_USERNAME and settings.GRAPHDB_PASSWORD:
+        auth = (settings.GRAPHDB_USERNAME, settings.GRAPHDB_PASSWORD)
+
+    loader = BulkLoader(
+        f"{settings.GRAPHDB_URL}/repositories/{settings.GRAPHDB_REPOSITORY}",
+        auth=auth,
+        chunk_triples=args.chunk_triples,
+        parallelism=args.parallelism
+    )
+    if args.graph is None:
+        return asyncio.run(load_dataset_version(loader, args.files))
+
+    report = loader.load_files(args.files, args.graph)
+    print(f"\n{'✓' if report.ok else '✗'} Total: {report.summary()}")
+    return report.ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
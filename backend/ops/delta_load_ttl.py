@@ -0,0 +1,137 @@
+"""
+Apply edits to the TTL data files to GraphDB without a full reload.
+
+Compares the TTL set against the subject hashes recorded when the live
+dataset was loaded (by seed_graphdb.py or a previous delta load), fetches
+the current triples of only the changed subjects and sends one SPARQL
+update with DELETE DATA/INSERT DATA for the triples that differ, together
+with a new dataset version so running APIs drop cached results. Load time
+scales with the size of the change, not the size of the dataset.
+
+Usage:
+    python ops/delta_load_ttl.py [--dry-run] [--force]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import time
+from app.db.dataset_version import new_dataset_version, activation_update
+from app.db.dataset_delta import (
+    read_subjects,
+    subject_hashes,
+    changed_subjects,
+    triples_query,
+    rows_to_subjects,
+    compute_delta,
+    delta_update,
+    read_manifest,
+    write_manifest
+)
+from ops.seed_graphdb import (
+    GraphDBSeeder,
+    MANIFEST_PATH,
+    dataset_files,
+    refresh_search_cache
+)
+
+# Subjects per lookup of currently loaded triples
+FETCH_BATCH_SUBJECTS = 200
+
+
+def fetch_subjects(seeder: GraphDBSeeder, subjects, graph):
+    """Currently loaded (explicit) triples of the given subjects."""
+    bindings = []
+    for start in range(0, len(subjects), FETCH_BATCH_SUBJECTS):
+        query = triples_query(subjects[start:start + FETCH_BATCH_SUBJECTS], graph)
+        bindings.extend(seeder.select(query, infer=False))
+    return rows_to_subjects(bindings)
+
+
+async def delta_load(dry_run: bool = False, force: bool = False) -> bool:
+    """Main delta loading function."""
+    print("=" * 60)
+    print("GraphDB Delta Load - Healthcare Navigator")
+    print("=" * 60)
+
+    seeder = GraphDBSeeder()
+    start = time.perf_counter()
+
+    # Step 1: Find the live dataset and what it was loaded from
+    print("\n[1/4] Checking the live dataset version...")
+    manifest = read_manifest(MANIFEST_PATH)
+    if manifest is None:
+        print(f"✗ No delta manifest at {MANIFEST_PATH}")
+        print("  Run a full load first: python ops/seed_graphdb.py")
+        return False
+
+    try:
+        version, graph = seeder.active_dataset()
+    except Exception as e:
+        print(f"✗ Cannot read the dataset version from GraphDB: {e}")
+        return False
+
+    if (version, graph) != (manifest["version"], manifest["graph"]) and not force:
+        print(f"✗ GraphDB serves version {version}, but the manifest is for {manifest['version']}")
+        print("  The repository was reloaded elsewhere; run a full load (or --force)")
+        return False
+    print(f"✓ Live version {version} ({graph or 'default graph'})")
+
+    # Step 2: Hash the TTL set and compare with the manifest
+    print("\n[2/4] Hashing TTL files...")
+    new_subjects = read_subjects(dataset_files())
+    new_hashes = subject_hashes(new_subjects)
+    added, changed, removed = changed_subjects(manifest["subjects"], new_hashes)
+    print(f"✓ {len(new_hashes)} subjects: {len(added)} added, {len(changed)} changed, {len(removed)} removed")
+
+    if not (added or changed or removed):
+        print("\n✓ Nothing to load")
+        return True
+
+    # Step 3: Diff the changed subjects triple by triple
+    print("\n[3/4] Computing triple delta...")
+    old_subjects = fetch_subjects(seeder, changed + removed, graph)
+    delta = compute_delta(manifest["subjects"], new_subjects, old_subjects)
+    print(f"✓ {len(delta.deletes)} triples to delete, {len(delta.inserts)} to insert")
+
+    if dry_run:
+        for line in delta.deletes:
+            print(f"  - {line}")
+        for line in delta.inserts:
+            print(f"  + {line}")
+        print("\nDry run: nothing was written")
+        return True
+
+    # Step 4: Apply the delta and stamp a new version in one transaction
+    print("\n[4/4] Applying delta...")
+    new_version = new_dataset_version()
+    update = activation_update(new_version, graph)
+    if not delta.empty:
+        update = f"{delta_update(delta, graph)} ;\n{update}"
+    if not seeder.update(update):
+        print("✗ Delta update failed; the live dataset is unchanged")
+        return False
+
+    write_manifest(MANIFEST_PATH, new_version, graph, new_hashes)
+    print(f"✓ Active dataset version: {new_version}")
+    print(f"✓ Delta applied in {time.perf_counter() - start:.2f}s")
+
+    await refresh_search_cache()
+
+    print("\n" + "=" * 60)
+    print("✓ Delta load completed successfully!")
+    print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply TTL edits to GraphDB as a delta")
+    parser.add_argument("--dry-run", action="store_true", help="print the delta without applying it")
+    parser.add_argument("--force", action="store_true", help="apply even if the live version differs from the manifest")
+    args = parser.parse_args()
+
+    success = asyncio.run(delta_load(args.dry_run, args.force))
+    sys.exit(0 if success else 1)
@@ -1,14 +1,39 @@
 """
 Generate RDF/Turtle (.ttl) data files for Healthcare Navigator.
 Creates proper RDF triples matching the healthnav.owl ontology.
+
+The generator is seeded and scales from the 30-physician sample to tens of
+millions of physicians across US metro regions. Entities are generated in
+fixed-size blocks, each with its own random stream, so the output is the
+same whatever the number of worker processes. Each block streams to its own
+Turtle or N-Triples file (optionally gzipped), alongside matching MongoDB
+cache documents (JSON Lines) when --mongo is given.
+
+Usage:
+    python ops/generate_ttl_data.py
+    python ops/generate_ttl_data.py --physicians 1000000 --format nt --gzip --mongo --workers 8
 """
 
 import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import gzip
+import json
 import random
-from typing import List, Dict
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
+NAMESPACE = "http://example.org/healthnav#"
+XSD_DECIMAL = "http://www.w3.org/2001/XMLSchema#decimal"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
 # Prefixes
 PREFIXES = """@prefix : <http://example.org/healthnav#> .
 @prefix owl: <http://www.w3.org/2002/07/owl#> .
@@ -108,248 +133,601 @@ PHOENIX_HOSPITALS = [
     },
 ]
 
-FIRST_NAMES = ["Sarah", "Michael", "Emily", "James", "Lisa", "Robert", "Amanda", "David"]
-LAST_NAMES = ["Chen", "Rodriguez", "Watson", "Park", "Thompson", "Kim", "Foster", "Martinez"]
-
-
-def sanitize_id(text: str) -> str:
-    """Create a valid RDF ID from text."""
-    return text.replace(" ", "").replace("-", "").replace("&", "And").replace("'", "")
-
+# US metro regions entities are spread across, weighted by population;
+# cms is the state's CMS provider number prefix
+US_REGIONS = [
+    {"metro": "Phoenix", "state": "AZ", "lat": 33.4484, "lng": -112.0740, "zip": "850", "area": "602", "cms": "03", "weight": 5,
+     "cities": ["Phoenix", "Scottsdale", "Tempe", "Mesa"]},
+    {"metro": "New York", "state": "NY", "lat": 40.7128, "lng": -74.0060, "zip": "100", "area": "212", "cms": "33", "weight": 19,
+     "cities": ["New York", "Brooklyn", "Queens", "Bronx"]},
+    {"metro": "Los Angeles", "state": "CA", "lat": 34.0522, "lng": -118.2437, "zip": "900", "area": "213", "cms": "05", "weight": 13,
+     "cities": ["Los Angeles", "Pasadena", "Long Beach", "Glendale"]},
+    {"metro": "Chicago", "state": "IL", "lat": 41.8781, "lng": -87.6298, "zip": "606", "area": "312", "cms": "14", "weight": 9,
+     "cities": ["Chicago", "Evanston", "Oak Park", "Cicero"]},
+    {"metro": "Houston", "state": "TX", "lat": 29.7604, "lng": -95.3698, "zip": "770", "area": "713", "cms": "45", "weight": 7,
+     "cities": ["Houston", "Pasadena", "Sugar Land", "Katy"]},
+    {"metro": "Dallas", "state": "TX", "lat": 32.7767, "lng": -96.7970, "zip": "752", "area": "214", "cms": "45", "weight": 8,
+     "cities": ["Dallas", "Plano", "Irving", "Garland"]},
+    {"metro": "Philadelphia", "state": "PA", "lat": 39.9526, "lng": -75.1652, "zip": "191", "area": "215", "cms": "39", "weight": 6,
+     "cities": ["Philadelphia", "Chester", "Norristown", "Media"]},
+    {"metro": "Atlanta", "state": "GA", "lat": 33.7490, "lng": -84.3880, "zip": "303", "area": "404", "cms": "11", "weight": 6,
+     "cities": ["Atlanta", "Decatur", "Marietta", "Sandy Springs"]},
+    {"metro": "Miami", "state": "FL", "lat": 25.7617, "lng": -80.1918, "zip": "331", "area": "305", "cms": "10", "weight": 6,
+     "cities": ["Miami", "Hialeah", "Coral Gables", "Miami Beach"]},
+    {"metro": "Boston", "state": "MA", "lat": 42.3601, "lng": -71.0589, "zip": "021", "area": "617", "cms": "22", "weight": 5,
+     "cities": ["Boston", "Cambridge", "Somerville", "Quincy"]},
+    {"metro": "Seattle", "state": "WA", "lat": 47.6062, "lng": -122.3321, "zip": "981", "area": "206", "cms": "50", "weight": 4,
+     "cities": ["Seattle", "Bellevue", "Redmond", "Renton"]},
+    {"metro": "Minneapolis", "state": "MN", "lat": 44.9778, "lng": -93.2650, "zip": "554", "area": "612", "cms": "24", "weight": 4,
+     "cities": ["Minneapolis", "St. Paul", "Bloomington", "Edina"]},
+    {"metro": "Denver", "state": "CO", "lat": 39.7392, "lng": -104.9903, "zip": "802", "area": "303", "cms": "06", "weight": 3,
+     "cities": ["Denver", "Aurora", "Lakewood", "Englewood"]},
+    {"metro": "St. Louis", "state": "MO", "lat": 38.6270, "lng": -90.1994, "zip": "631", "area": "314", "cms": "26", "weight": 3,
+     "cities": ["St. Louis", "Clayton", "Florissant", "Kirkwood"]},
+    {"metro": "Nashville", "state": "TN", "lat": 36.1627, "lng": -86.7816, "zip": "372", "area": "615", "cms": "44", "weight": 2,
+     "cities": ["Nashville", "Franklin", "Brentwood", "Murfreesboro"]},
+]
+REGION_WEIGHTS = [region["weight"] for region in US_REGIONS]
 
-def generate_specialties_ttl() -> str:
-    """Generate specialties.ttl file."""
-    content = PREFIXES
-    content += "# Specialties\n\n"
+# Max distance (degrees) of generated hospitals and pharmacies from their metro center
+REGION_SPREAD = 0.25
 
-    for specialty in SPECIALTIES:
-        spec_id = sanitize_id(specialty)
-        content += f":{spec_id} a :Specialty ;\n"
-        content += f'    :name "{specialty}" .\n\n'
+FIRST_NAMES = [
+    "Sarah", "Michael", "Emily", "James", "Lisa", "Robert", "Amanda", "David",
+    "Jennifer", "Christopher", "Maria", "William", "Patricia", "Thomas", "Nancy"
+]
+LAST_NAMES = [
+    "Chen", "Rodriguez", "Watson", "Park", "Thompson", "Kim", "Foster", "Martinez",
+    "Lee", "Brown", "Gonzalez", "Taylor", "Anderson", "White", "Davis"
+]
 
-    return content
+STREETS = ["Main St", "Central Ave", "McDowell Rd", "Oak St", "Park Ave", "Washington Blvd", "Medical Center Dr", "Broadway"]
+HOSPITAL_NAMES = ["{city} General Hospital", "{city} Regional Medical Center", "{metro} Memorial Hospital", "St. {last} Medical Center"]
+PHARMACY_CHAINS = ["CVS", "Walgreens", "RiteAid"]
 
+# Entities per output file (and per unit of work)
+DEFAULT_SHARD_SIZE = 100000
 
-def generate_conditions_symptoms_ttl() -> str:
-    """Generate conditions and symptoms with relationships."""
-    content = PREFIXES
-    content += "# Symptoms\n\n"
+# Odd multiplier coprime with 10^9, so physician index → NPI is a permutation (unique NPIs)
+NPI_MULTIPLIER = 387420489
 
-    # First, define all unique symptoms
-    all_symptoms = set()
-    for cond in CONDITIONS_SYMPTOMS:
-        all_symptoms.update(cond["symptoms"])
-
-    for symptom in sorted(all_symptoms):
-        content += f":{symptom} a :Symptom ;\n"
-        symptom_name = ' '.join([c for c in symptom if c.isupper() or c.islower()])
-        # Add spaces before capitals
-        symptom_name = ''.join([' ' + c if c.isupper() else c for c in symptom]).strip()
-        content += f'    :name "{symptom_name}" .\n\n'
 
-    content += "# Medical Conditions\n\n"
+def sanitize_id(text: str) -> str:
+    """Create a valid RDF ID from text."""
+    return (
+        text.replace(" ", "").replace("-", "").replace("&", "And").replace("'", "")
+        .replace(".", "").replace(",", "").replace("–", "")
+    )
 
-    # Define conditions with symptom relationships
-    for cond in CONDITIONS_SYMPTOMS:
-        content += f":{cond['id']} a :MedicalCondition ;\n"
-        content += f'    :name "{cond["name"]}" ;\n'
 
-        # Link to symptoms
-        for i, symptom in enumerate(cond["symptoms"]):
-            if i < len(cond["symptoms"]) - 1:
-                content += f"    :hasSymptom :{symptom} ;\n"
-            else:
-                content += f"    :hasSymptom :{symptom} .\n"
+def symptom_label(symptom_id: str) -> str:
+    """Spaced name of a CamelCase symptom ID."""
+    return ''.join([' ' + c if c.isupper() else c for c in symptom_id]).strip()
 
-        content += "\n"
 
-    return content
+@dataclass(frozen=True)
+class Scale:
+    """Entity counts and layout for a generated dataset."""
 
+    physicians: int = 30
+    hospitals: int = len(PHOENIX_HOSPITALS)
+    pharmacies: int = 15
+    seed: int = 42
+    shard_size: int = DEFAULT_SHARD_SIZE
 
-def generate_symptoms_precautions_ttl() -> str:
-    """Generate symptom precautions."""
-    content = PREFIXES
-    content += "# Precautions\n\n"
+    @classmethod
+    def for_physicians(cls, physicians: int, **overrides) -> "Scale":
+        """Hospital and pharmacy counts in roughly US proportions to physicians."""
+        return cls(**{
+            "physicians": physicians,
+            "hospitals": max(len(PHOENIX_HOSPITALS), physicians // 150),
+            "pharmacies": max(15, physicians // 16),
+            **{name: value for name, value in overrides.items() if value is not None}
+        })
 
-    for symptom, precaution in SYMPTOM_PRECAUTIONS.items():
-        precaution_id = f"{symptom}Precaution"
-        content += f":{precaution_id} a :Precaution ;\n"
-        content += f'    :name "{precaution}" .\n\n'
+    def shards(self, count: int) -> int:
+        return max(1, -(-count // self.shard_size))
 
-        content += f":{symptom} :recommendedPrecaution :{precaution_id} .\n\n"
+    def shard_range(self, count: int, shard: int) -> range:
+        return range(shard * self.shard_size, min((shard + 1) * self.shard_size, count))
 
-    return content
 
+def shard_rng(scale: Scale, kind: str, shard: int) -> random.Random:
+    """The random stream of one shard (string seeds hash the same in every process)."""
+    return random.Random(f"{scale.seed}:{kind}:{shard}")
 
-def generate_hospitals_ttl() -> str:
-    """Generate hospitals.ttl file."""
-    content = PREFIXES
-    content += "# Hospitals\n\n"
 
-    for hosp in PHOENIX_HOSPITALS:
-        content += f":{hosp['id']} a :Hospital ;\n"
-        content += f'    :name "{hosp["name"]}" ;\n'
-        content += f'    :cmsOrgId "{hosp["cmsId"]}" ;\n'
-        content += f'    :phone "{hosp["phone"]}" ;\n'
-        content += f"    :locatedAt :{hosp['id']}_Address .\n\n"
+# Entities
 
-        # Address
-        content += f":{hosp['id']}_Address a :Address ;\n"
-        content += f'    :addressLine "{hosp["address"]}" ;\n'
-        content += f'    :city "{hosp["city"]}" ;\n'
-        content += f'    :state "{hosp["state"]}" ;\n'
-        content += f'    :postalCode "{hosp["zipCode"]}" ;\n'
-        content += f"    :hasGeo :{hosp['id']}_Geo .\n\n"
+def jitter(rng: random.Random, region: Dict[str, Any]) -> Tuple[float, float]:
+    return (
+        round(region["lat"] + rng.uniform(-REGION_SPREAD, REGION_SPREAD), 6),
+        round(region["lng"] + rng.uniform(-REGION_SPREAD, REGION_SPREAD), 6)
+    )
 
-        # GeoLocation
-        content += f":{hosp['id']}_Geo a :GeoLocation ;\n"
-        content += f'    :latitude "{hosp["lat"]}"^^xsd:decimal ;\n'
-        content += f'    :longitude "{hosp["lng"]}"^^xsd:decimal .\n\n'
 
-    return content
+def phone_number(rng: random.Random, area: str) -> str:
+    return f"({area}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}"
 
 
-def generate_hospitals_hcahps_ttl() -> str:
-    """Generate hospital HCAHPS scores."""
-    content = PREFIXES
-    content += "# Hospital HCAHPS Scores\n\n"
+def make_hospital(scale: Scale, index: int) -> Dict[str, Any]:
+    """Hospital `index`; the first ones are the real Phoenix hospitals."""
+    rng = random.Random(f"{scale.seed}:hospital:{index}")
+    score = round(rng.uniform(70, 95), 1)
 
-    for hosp in PHOENIX_HOSPITALS:
-        score = round(random.uniform(70, 95), 1)
-        content += f":{hosp['id']} :hcahpsOverallScore \"{score}\"^^xsd:decimal .\n"
+    if index < len(PHOENIX_HOSPITALS):
+        return dict(PHOENIX_HOSPITALS[index], hcahpsScore=score)
 
-    content += "\n"
-    return content
+    region = rng.choices(US_REGIONS, weights=REGION_WEIGHTS)[0]
+    city = rng.choice(region["cities"])
+    name = rng.choice(HOSPITAL_NAMES).format(city=city, metro=region["metro"], last=rng.choice(LAST_NAMES))
+    lat, lng = jitter(rng, region)
+    return {
+        "id": f"{sanitize_id(name)}{index}",
+        "name": name,
+        "cmsId": f"{region['cms']}{index:04d}",
+        "lat": lat,
+        "lng": lng,
+        "address": f"{rng.randint(100, 9999)} {rng.choice(STREETS)}",
+        "city": city,
+        "state": region["state"],
+        "zipCode": f"{region['zip']}{rng.randint(1, 99):02d}",
+        "phone": phone_number(rng, region["area"]),
+        "hcahpsScore": score
+    }
 
 
-def generate_physicians_ttl() -> str:
-    """Generate physicians with affiliations."""
-    content = PREFIXES
-    content += "# Physicians\n\n"
+@lru_cache(maxsize=2)
+def all_hospitals(scale: Scale) -> Tuple[Dict[str, Any], ...]:
+    """Every hospital; physicians and their cache documents refer to them by index."""
+    return tuple(make_hospital(scale, index) for index in range(scale.hospitals))
 
-    physician_count = 30
 
-    for i in range(physician_count):
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-        physician_id = f"Dr{first_name}{last_name}{i}"
-
-        npi = f"{random.randint(1000000000, 9999999999)}"
+def iter_physicians(scale: Scale, shard: int) -> Iterator[Dict[str, Any]]:
+    rng = shard_rng(scale, "physicians", shard)
+    for index in scale.shard_range(scale.physicians, shard):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
 
         # Choose 1-2 specialties
-        num_specialties = random.randint(1, 2)
-        specialties = random.sample(SPECIALTIES, num_specialties)
-
-        # Choose hospital
-        hospital = random.choice(PHOENIX_HOSPITALS)
+        specialties = rng.sample(SPECIALTIES, rng.randint(1, 2))
 
         # Find conditions matching specialty
-        conditions = [
-            c for c in CONDITIONS_SYMPTOMS
-            if c["specialty"] in specialties
-        ]
+        conditions = [c for c in CONDITIONS_SYMPTOMS if c["specialty"] in specialties]
         if not conditions:
-            conditions = random.sample(CONDITIONS_SYMPTOMS, min(2, len(CONDITIONS_SYMPTOMS)))
-
-        content += f":{physician_id} a :Physician ;\n"
-        content += f'    :name "Dr. {first_name} {last_name}" ;\n'
-        content += f'    :npi "{npi}" ;\n'
-
-        # Add specialties
-        for spec in specialties:
-            spec_id = sanitize_id(spec)
-            content += f"    :hasSpecialty :{spec_id} ;\n"
-
-        # Add conditions
-        for cond in conditions:
-            content += f"    :treatsCondition :{cond['id']} ;\n"
-
-        # Add hospital affiliation
-        content += f"    :affiliatedWith :{hospital['id']} .\n\n"
-
-    return content
-
-
-def generate_pharmacies_ttl() -> str:
-    """Generate pharmacies in Phoenix area."""
-    content = PREFIXES
-    content += "# Pharmacies\n\n"
+            conditions = rng.sample(CONDITIONS_SYMPTOMS, min(2, len(CONDITIONS_SYMPTOMS)))
+
+        yield {
+            "id": f"Dr{first_name}{last_name}{index}",
+            "firstName": first_name,
+            "lastName": last_name,
+            "npi": f"1{(index * NPI_MULTIPLIER + scale.seed) % 10 ** 9:09d}",
+            "specialties": specialties,
+            "conditions": conditions,
+            "hospital": rng.randrange(scale.hospitals)
+        }
+
+
+def iter_pharmacies(scale: Scale, shard: int) -> Iterator[Dict[str, Any]]:
+    rng = shard_rng(scale, "pharmacies", shard)
+    for index in scale.shard_range(scale.pharmacies, shard):
+        region = US_REGIONS[0] if index < 15 else rng.choices(US_REGIONS, weights=REGION_WEIGHTS)[0]
+        chain = rng.choice(PHARMACY_CHAINS)
+        lat, lng = jitter(rng, region)
+        yield {
+            "id": f"{chain}Pharmacy{index}",
+            "name": f"{chain} Pharmacy #{index + 1}",
+            "chain": chain,
+            "address": f"{rng.randint(100, 9999)} {rng.choice(STREETS)}",
+            "city": rng.choice(region["cities"]),
+            "state": region["state"],
+            "zipCode": f"{region['zip']}{rng.randint(1, 99):02d}",
+            "lat": lat,
+            "lng": lng,
+            "phone": phone_number(rng, region["area"])
+        }
+
+
+# RDF
+
+class RdfWriter:
+    """Streams subjects to a Turtle or N-Triples file, optionally gzipped."""
+
+    def __init__(self, path: Path, ntriples: bool = False, compress: bool = False):
+        self.path = path
+        self.ntriples = ntriples
+        self.triples = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=3) if compress \
+            else open(path, "w", encoding="utf-8", buffering=1 << 20)
+        if not ntriples:
+            self._file.write(PREFIXES)
+
+    def comment(self, text: str):
+        self._file.write(f"# {text}\n\n")
+
+    def ref(self, local: str) -> str:
+        return f"<{NAMESPACE}{local}>" if self.ntriples else f":{local}"
+
+    @staticmethod
+    def text(value: str) -> str:
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def decimal(self, value: Any) -> str:
+        return f'"{value}"^^<{XSD_DECIMAL}>' if self.ntriples else f'"{value}"^^xsd:decimal'
+
+    def subject(self, local: str, properties: List[Tuple[str, str]]):
+        """Write a subject's (predicate, object) pairs; predicate "a" is rdf:type."""
+        self.triples += len(properties)
+        if self.ntriples:
+            subject = self.ref(local)
+            self._file.write("".join(
+                f"{subject} {f'<{RDF_TYPE}>' if predicate == 'a' else self.ref(predicate)} {obj} .\n"
+                for predicate, obj in properties
+            ))
+        else:
+            body = " ;\n    ".join(
+                f"{'a' if predicate == 'a' else ':' + predicate} {obj}" for predicate, obj in properties
+            )
+            self._file.write(f":{local} {body} .\n\n")
+
+    def close(self):
+        self._file.close()
+
+
+def write_located(out: RdfWriter, entity_id: str, entity: Dict[str, Any]):
+    """Address and geolocation subjects of a hospital or pharmacy."""
+    out.subject(f"{entity_id}_Address", [
+        ("a", out.ref("Address")),
+        ("addressLine", out.text(entity["address"])),
+        ("city", out.text(entity["city"])),
+        ("state", out.text(entity["state"])),
+        ("postalCode", out.text(entity["zipCode"])),
+        ("hasGeo", out.ref(f"{entity_id}_Geo")),
+    ])
+    out.subject(f"{entity_id}_Geo", [
+        ("a", out.ref("GeoLocation")),
+        ("latitude", out.decimal(entity["lat"])),
+        ("longitude", out.decimal(entity["lng"])),
+    ])
+
+
+def write_specialties(out: RdfWriter):
+    out.comment("Specialties")
+    for specialty in SPECIALTIES:
+        out.subject(sanitize_id(specialty), [("a", out.ref("Specialty")), ("name", out.text(specialty))])
 
-    chains = ["CVS", "Walgreens", "RiteAid"]
-    pharmacy_count = 15
 
-    base_lat = 33.4484
-    base_lng = -112.0740
+def write_conditions_symptoms(out: RdfWriter):
+    out.comment("Symptoms")
+    all_symptoms = {symptom for cond in CONDITIONS_SYMPTOMS for symptom in cond["symptoms"]}
+    for symptom in sorted(all_symptoms):
+        out.subject(symptom, [("a", out.ref("Symptom")), ("name", out.text(symptom_label(symptom)))])
 
-    for i in range(pharmacy_count):
-        chain = random.choice(chains)
-        pharmacy_id = f"{chain}Pharmacy{i}"
+    out.comment("Medical Conditions")
+    for cond in CONDITIONS_SYMPTOMS:
+        out.subject(cond["id"], [
+            ("a", out.ref("MedicalCondition")),
+            ("name", out.text(cond["name"])),
+        ] + [("hasSymptom", out.ref(symptom)) for symptom in cond["symptoms"]])
 
-        lat = base_lat + random.uniform(-0.05, 0.05)
-        lng = base_lng + random.uniform(-0.05, 0.05)
 
-        address = f"{random.randint(100, 9999)} {random.choice(['Main St', 'Central Ave', 'McDowell Rd'])}"
-        city = random.choice(["Phoenix", "Scottsdale", "Tempe"])
-        zip_code = f"85{random.randint(1, 99):03d}"
+def write_symptoms_precautions(out: RdfWriter):
+    out.comment("Precautions")
+    for symptom, precaution in SYMPTOM_PRECAUTIONS.items():
+        precaution_id = f"{symptom}Precaution"
+        out.subject(precaution_id, [("a", out.ref("Precaution")), ("name", out.text(precaution))])
+        out.subject(symptom, [("recommendedPrecaution", out.ref(precaution_id))])
+
+
+def write_hospital(out: RdfWriter, hosp: Dict[str, Any]):
+    out.subject(hosp["id"], [
+        ("a", out.ref("Hospital")),
+        ("name", out.text(hosp["name"])),
+        ("cmsOrgId", out.text(hosp["cmsId"])),
+        ("phone", out.text(hosp["phone"])),
+        ("locatedAt", out.ref(f"{hosp['id']}_Address")),
+    ])
+    write_located(out, hosp["id"], hosp)
+
+
+def write_physician(out: RdfWriter, physician: Dict[str, Any], hospitals):
+    out.subject(physician["id"], [
+        ("a", out.ref("Physician")),
+        ("name", out.text(f"Dr. {physician['firstName']} {physician['lastName']}")),
+        ("npi", out.text(physician["npi"])),
+    ] + [
+        ("hasSpecialty", out.ref(sanitize_id(spec))) for spec in physician["specialties"]
+    ] + [
+        ("treatsCondition", out.ref(cond["id"])) for cond in physician["conditions"]
+    ] + [
+        ("affiliatedWith", out.ref(hospitals[physician["hospital"]]["id"]))
+    ])
+
+
+def write_pharmacy(out: RdfWriter, pharmacy: Dict[str, Any]):
+    out.subject(pharmacy["id"], [
+        ("a", out.ref("Pharmacy")),
+        ("name", out.text(pharmacy["name"])),
+        ("phone", out.text(pharmacy["phone"])),
+        ("locatedAt", out.ref(f"{pharmacy['id']}_Address")),
+    ])
+    write_located(out, pharmacy["id"], pharmacy)
+
+
+# MongoDB cache documents (same shapes the API builds from GraphDB)
+
+def provider_doc(physician: Dict[str, Any], hospital: Dict[str, Any]) -> Dict[str, Any]:
+    symptoms = sorted({symptom for cond in physician["conditions"] for symptom in cond["symptoms"]})
+    return {
+        "id": physician["id"],
+        "npi": physician["npi"],
+        "name": f"Dr. {physician['firstName']} {physician['lastName']}",
+        "firstName": physician["firstName"],
+        "lastName": physician["lastName"],
+        "specialties": physician["specialties"],
+        "conditions": [cond["name"] for cond in physician["conditions"]],
+        "symptoms": [symptom_label(symptom) for symptom in symptoms],
+        "hospitalId": hospital["id"],
+        "hospitalName": hospital["name"],
+        "hcahpsScore": hospital["hcahpsScore"],
+        "lat": hospital["lat"],
+        "lng": hospital["lng"],
+        "phone": hospital["phone"],
+        "address": hospital["address"],
+        "distance": None
+    }
+
+
+def hospital_doc(hospital: Dict[str, Any], affiliated_providers: int) -> Dict[str, Any]:
+    return {
+        "id": hospital["id"],
+        "cmsId": hospital["cmsId"],
+        "name": hospital["name"],
+        "address": hospital["address"],
+        "city": hospital["city"],
+        "state": hospital["state"],
+        "zipCode": hospital["zipCode"],
+        "hcahpsScore": hospital["hcahpsScore"],
+        "lat": hospital["lat"],
+        "lng": hospital["lng"],
+        "phone": hospital["phone"],
+        "affiliatedProviders": affiliated_providers
+    }
+
+
+def pharmacy_doc(pharmacy: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(pharmacy, distance=None)
+
+
+class JsonLinesWriter:
+    """Streams documents to a JSON Lines file, optionally gzipped."""
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.count = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=3) if compress \
+            else open(path, "w", encoding="utf-8", buffering=1 << 20)
+
+    def write(self, doc: Dict[str, Any]):
+        self._file.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+# Sharded output
+
+@dataclass
+class Output:
+    """Where and how generated files are written."""
+
+    directory: Path
+    ntriples: bool = False
+    compress: bool = False
+    mongo: bool = False
+
+    def rdf_path(self, name: str, shard: int, shards: int) -> Path:
+        suffix = ".nt" if self.ntriples else ".ttl"
+        return self._path(self.directory, name, shard, shards, suffix)
+
+    def mongo_path(self, name: str, shard: int, shards: int) -> Path:
+        return self._path(self.directory / "mongo", name, shard, shards, ".jsonl")
+
+    def _path(self, directory: Path, name: str, shard: int, shards: int, suffix: str) -> Path:
+        # A single shard keeps the plain file name the loaders expect
+        stem = name if shards == 1 else f"{name}-{shard:05d}"
+        return directory / f"{stem}{suffix}{'.gz' if self.compress else ''}"
+
+
+def generate_physicians_shard(scale: Scale, output: Output, shard: int) -> Tuple[int, Counter]:
+    """Write one shard of physicians; returns its triples and physicians per hospital."""
+    hospitals = all_hospitals(scale)
+    shards = scale.shards(scale.physicians)
+    out = RdfWriter(output.rdf_path("physicians", shard, shards), output.ntriples, output.compress)
+    docs = JsonLinesWriter(output.mongo_path("providers", shard, shards), output.compress) if output.mongo else None
+    affiliations: Counter = Counter()
+
+    if shard == 0:
+        out.comment("Physicians")
+    for physician in iter_physicians(scale, shard):
+        write_physician(out, physician, hospitals)
+        affiliations[physician["hospital"]] += 1
+        if docs:
+            docs.write(provider_doc(physician, hospitals[physician["hospital"]]))
+
+    out.close()
+    if docs:
+        docs.close()
+    return out.triples, affiliations
+
+
+def generate_pharmacies_shard(scale: Scale, output: Output, shard: int) -> Tuple[int, Counter]:
+    shards = scale.shards(scale.pharmacies)
+    out = RdfWriter(output.rdf_path("pharmacies", shard, shards), output.ntriples, output.compress)
+    docs = JsonLinesWriter(output.mongo_path("pharmacies", shard, shards), output.compress) if output.mongo else None
+
+    if shard == 0:
+        out.comment("Pharmacies")
+    for pharmacy in iter_pharmacies(scale, shard):
+        write_pharmacy(out, pharmacy)
+        if docs:
+            docs.write(pharmacy_doc(pharmacy))
+
+    out.close()
+    if docs:
+        docs.close()
+    return out.triples, Counter()
+
+
+def generate_hospitals_shard(scale: Scale, output: Output, shard: int, affiliations: List[int]) -> int:
+    """Write one shard of hospitals and their HCAHPS scores; `affiliations` covers this shard only."""
+    hospitals = all_hospitals(scale)
+    shards = scale.shards(scale.hospitals)
+    out = RdfWriter(output.rdf_path("hospitals", shard, shards), output.ntriples, output.compress)
+    scores = RdfWriter(output.rdf_path("hospitals_hcahps", shard, shards), output.ntriples, output.compress)
+    docs = JsonLinesWriter(output.mongo_path("hospitals", shard, shards), output.compress) if output.mongo else None
+
+    if shard == 0:
+        out.comment("Hospitals")
+        scores.comment("Hospital HCAHPS Scores")
+    indexes = scale.shard_range(scale.hospitals, shard)
+    for offset, index in enumerate(indexes):
+        hosp = hospitals[index]
+        write_hospital(out, hosp)
+        scores.subject(hosp["id"], [("hcahpsOverallScore", scores.decimal(hosp["hcahpsScore"]))])
+        if docs:
+            docs.write(hospital_doc(hosp, affiliations[offset]))
+
+    for writer in (out, scores, docs):
+        if writer:
+            writer.close()
+    return out.triples + scores.triples
+
+
+def generate_static(output: Output) -> int:
+    """Reference data: specialties, conditions/symptoms and precautions."""
+    triples = 0
+    for name, write in [
+        ("specialties", write_specialties),
+        ("conditions_symptoms", write_conditions_symptoms),
+        ("symptoms_precautions", write_symptoms_precautions),
+    ]:
+        out = RdfWriter(output.rdf_path(name, 0, 1), output.ntriples, output.compress)
+        write(out)
+        out.close()
+        triples += out.triples
+
+    if output.mongo:
+        docs = JsonLinesWriter(output.mongo_path("specialties", 0, 1), output.compress)
+        for specialty in SPECIALTIES:
+            docs.write({"name": specialty})
+        docs.close()
+    return triples
+
+
+def generate_dataset(scale: Scale, output: Output, workers: int = 1) -> Dict[str, int]:
+    """Generate every file, sharded across worker processes; returns triples per entity type."""
+    output.directory.mkdir(parents=True, exist_ok=True)
+    if output.mongo:
+        (output.directory / "mongo").mkdir(exist_ok=True)
+
+    triples = {"reference": generate_static(output)}
+    affiliations: Counter = Counter()
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        # Physicians first: hospital documents need their affiliation counts
+        jobs = [
+            ("physicians", pool.submit(generate_physicians_shard, scale, output, shard))
+            for shard in range(scale.shards(scale.physicians))
+        ] + [
+            ("pharmacies", pool.submit(generate_pharmacies_shard, scale, output, shard))
+            for shard in range(scale.shards(scale.pharmacies))
+        ]
+        for kind, job in jobs:
+            shard_triples, shard_affiliations = job.result()
+            triples[kind] = triples.get(kind, 0) + shard_triples
+            affiliations.update(shard_affiliations)
+
+        hospital_jobs = [
+            pool.submit(
+                generate_hospitals_shard, scale, output, shard,
+                [affiliations[index] for index in scale.shard_range(scale.hospitals, shard)]
+            )
+            for shard in range(scale.shards(scale.hospitals))
+        ]
+        triples["hospitals"] = sum(job.result() for job in hospital_jobs)
 
-        content += f":{pharmacy_id} a :Pharmacy ;\n"
-        content += f'    :name "{chain} Pharmacy #{i+1}" ;\n'
-        content += f"    :locatedAt :{pharmacy_id}_Address .\n\n"
+    return triples
 
-        # Address
-        content += f":{pharmacy_id}_Address a :Address ;\n"
-        content += f'    :addressLine "{address}" ;\n'
-        content += f'    :city "{city}" ;\n'
-        content += f'    :state "AZ" ;\n'
-        content += f'    :postalCode "{zip_code}" ;\n'
-        content += f"    :hasGeo :{pharmacy_id}_Geo .\n\n"
 
-        # GeoLocation
-        content += f":{pharmacy_id}_Geo a :GeoLocation ;\n"
-        content += f'    :latitude "{lat:.6f}"^^xsd:decimal ;\n'
-        content += f'    :longitude "{lng:.6f}"^^xsd:decimal .\n\n'
+def build_documents(scale: Scale) -> Dict[str, List[Dict[str, Any]]]:
+    """MongoDB cache documents for a (small) dataset, in memory."""
+    hospitals = all_hospitals(scale)
+    providers = []
+    affiliations: Counter = Counter()
+    for shard in range(scale.shards(scale.physicians)):
+        for physician in iter_physicians(scale, shard):
+            providers.append(provider_doc(physician, hospitals[physician["hospital"]]))
+            affiliations[physician["hospital"]] += 1
 
-    return content
+    return {
+        "hospitals": [hospital_doc(hosp, affiliations[index]) for index, hosp in enumerate(hospitals)],
+        "providers": providers,
+        "pharmacies": [
+            pharmacy_doc(pharmacy)
+            for shard in range(scale.shards(scale.pharmacies))
+            for pharmacy in iter_pharmacies(scale, shard)
+        ],
+        "specialties": list(SPECIALTIES)
+    }
 
 
 def main():
     """Generate all TTL files."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Healthcare Navigator dataset")
+    parser.add_argument("--physicians", type=int, default=30)
+    parser.add_argument("--hospitals", type=int, help="default: physicians / 150 (at least 3)")
+    parser.add_argument("--pharmacies", type=int, help="default: physicians / 16 (at least 15)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["ttl", "nt"], default="ttl")
+    parser.add_argument("--gzip", action="store_true", help="gzip every output file")
+    parser.add_argument("--mongo", action="store_true", help="also write MongoDB cache documents (JSON Lines)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="entities per output file")
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "ttl_data")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Healthcare Navigator - TTL Data Generation")
     print("=" * 60)
 
-    # Create output directory
-    output_dir = Path(__file__).parent / "ttl_data"
-    output_dir.mkdir(exist_ok=True)
-
-    files_to_generate = [
-        ("specialties.ttl", generate_specialties_ttl),
-        ("conditions_symptoms.ttl", generate_conditions_symptoms_ttl),
-        ("symptoms_precautions.ttl", generate_symptoms_precautions_ttl),
-        ("hospitals.ttl", generate_hospitals_ttl),
-        ("hospitals_hcahps.ttl", generate_hospitals_hcahps_ttl),
-        ("physicians.ttl", generate_physicians_ttl),
-        ("pharmacies.ttl", generate_pharmacies_ttl),
-    ]
-
-    print(f"\nGenerating TTL files in: {output_dir}\n")
+    scale = Scale.for_physicians(
+        args.physicians,
+        hospitals=args.hospitals,
+        pharmacies=args.pharmacies,
+        seed=args.seed,
+        shard_size=args.shard_size
+    )
+    output = Output(args.output, ntriples=args.format == "nt", compress=args.gzip, mongo=args.mongo)
 
-    for filename, generator_func in files_to_generate:
-        content = generator_func()
-        filepath = output_dir / filename
+    print(f"\nGenerating {scale.physicians:,} physicians, {scale.hospitals:,} hospitals, "
+          f"{scale.pharmacies:,} pharmacies (seed {scale.seed}) in: {output.directory}\n")
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+    start = time.perf_counter()
+    triples = generate_dataset(scale, output, args.workers)
+    elapsed = time.perf_counter() - start
 
-        print(f"✓ Generated: {filename}")
+    for kind, count in triples.items():
+        print(f"✓ Generated {kind}: {count:,} triples")
 
+    total = sum(triples.values())
     print("\n" + "=" * 60)
-    print("✓ All TTL files generated successfully!")
+    print(f"✓ Generated {total:,} triples in {elapsed:.1f}s ({total / elapsed:,.0f} triples/s)")
     print("=" * 60)
-    print(f"\nFiles location: {output_dir}")
+    print(f"\nFiles location: {output.directory}")
     print("\nNext steps:")
-    print("  1. Review generated .ttl files")
-    print("  2. Load into GraphDB using ops/seed_graphdb.py")
+    print("  1. Review generated files")
+    print("  2. Load into GraphDB using ops/seed_graphdb.py (or ops/bulk_load.py for sharded output)")
     print("=" * 60)
 
 
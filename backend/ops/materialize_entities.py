@@ -0,0 +1,65 @@
+"""
+Materialize the MongoDB entity caches from GraphDB.
+
+Extracts every provider, hospital, pharmacy and specialty from the active
+dataset version in pages, builds the denormalized documents the API's list
+and detail routes read (providers with their hospital's details and
+coordinates, hospitals with affiliated provider counts) and writes only the
+documents whose content hash changed. Entities no longer in the graph are
+deleted. seed_graphdb.py and delta_load_ttl.py run this after every load.
+
+Usage:
+    python ops/materialize_entities.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from app.db.mongodb import mongodb_client
+from app.db.graphdb import graphdb_client
+from app.services.materializer import entity_materializer
+
+
+async def materialize_entities() -> bool:
+    """Main materialization function."""
+    print("=" * 60)
+    print("Entity Cache Materialization - Healthcare Navigator")
+    print("=" * 60)
+
+    # Step 1: Connect
+    print("\n[1/2] Connecting to GraphDB and MongoDB...")
+    if not await graphdb_client.test_connection():
+        print("✗ Cannot connect to GraphDB")
+        return False
+    try:
+        await mongodb_client.connect()
+    except Exception as e:
+        print(f"✗ Cannot connect to MongoDB: {e}")
+        return False
+    print("✓ Connected")
+
+    # Step 2: Materialize
+    print("\n[2/2] Materializing entity caches...")
+    try:
+        run = await entity_materializer.materialize()
+    except Exception as e:
+        print(f"✗ Materialization failed: {e}")
+        return False
+    finally:
+        await mongodb_client.disconnect()
+        await graphdb_client.close()
+
+    print(f"Dataset version: {run['datasetVersion']}")
+    for collection, counts in run["collections"].items():
+        print(
+            f"✓ {collection}: {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged, {counts['deleted']} deleted"
+        )
+    print(f"✓ Done in {run['elapsedSeconds']}s")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(materialize_entities()) else 1)
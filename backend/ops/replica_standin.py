@@ -0,0 +1,212 @@
+"""
+Local stand-in for a pool of GraphDB read replicas.
+
+Starts several processes, each serving the embedded graph (ontology plus
+ops/ttl_data) over the SPARQL protocol at /repositories/<GRAPHDB_REPOSITORY>,
+so ReplicaPoolBackend can be exercised without a GraphDB cluster. Every
+replica accepts fault injection:
+
+    curl -X POST "http://127.0.0.1:7301/control?delay=0.5"   # add 500 ms per query
+    curl -X POST "http://127.0.0.1:7301/control?fail=1"      # answer queries with 503
+    curl -X POST "http://127.0.0.1:7301/control"             # back to healthy
+
+Usage:
+    python ops/replica_standin.py                  # serve 3 replicas until Ctrl-C
+    python ops/replica_standin.py --replicas 4 --port 7301
+    python ops/replica_standin.py --check          # verify ejection and hedging, then exit
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List
+from urllib.parse import parse_qs, urlsplit
+import httpx
+import pyoxigraph
+from app.core.config import settings
+from app.db.graph_backends import (
+    EmbeddedGraphBackend,
+    HttpGraphBackend,
+    ReplicaPoolBackend,
+    embedded_graph_files
+)
+from app.db.sparql_results import JSON, CSV, TSV, MEDIA_TYPES
+
+# Accept header → pyoxigraph results serialization
+RESULT_FORMATS = {
+    MEDIA_TYPES[JSON]: pyoxigraph.QueryResultsFormat.JSON,
+    MEDIA_TYPES[CSV]: pyoxigraph.QueryResultsFormat.CSV,
+    MEDIA_TYPES[TSV]: pyoxigraph.QueryResultsFormat.TSV,
+}
+
+PROBE_QUERY = "SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }"
+
+
+def serve(port: int):
+    """Serve the embedded graph on one port until killed (runs in a child process)."""
+    store = EmbeddedGraphBackend(embedded_graph_files())._load()
+    faults = {"delay": 0.0, "fail": False}
+    path = f"/repositories/{settings.GRAPHDB_REPOSITORY}"
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status: int, body: bytes = b"", content_type: str = "text/plain"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == f"{path}/size":
+                return self.reply(200, str(len(store)).encode())
+            self.reply(404)
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+
+            if url.path == "/control":
+                params = parse_qs(url.query)
+                faults["delay"] = float(params.get("delay", ["0"])[0])
+                faults["fail"] = params.get("fail", ["0"])[0] not in ("0", "false")
+                return self.reply(200, json.dumps(faults).encode(), "application/json")
+            if url.path != path:
+                return self.reply(404)
+
+            time.sleep(faults["delay"])
+            if faults["fail"]:
+                return self.reply(503, b"replica unavailable (injected)")
+
+            accept = self.headers.get("Accept", MEDIA_TYPES[JSON]).split(",")[0].strip()
+            result_format = RESULT_FORMATS.get(accept, pyoxigraph.QueryResultsFormat.JSON)
+            try:
+                results = store.query(parse_qs(body)["query"][0])
+                self.reply(200, results.serialize(format=result_format), accept)
+            except (KeyError, SyntaxError, ValueError) as e:
+                self.reply(400, str(e).encode())
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def start_replicas(count: int, port: int) -> List[multiprocessing.Process]:
+    """Start `count` replica processes on consecutive ports and wait until they answer."""
+    processes = []
+    for offset in range(count):
+        process = multiprocessing.Process(target=serve, args=(port + offset,), daemon=True)
+        process.start()
+        processes.append(process)
+
+    for offset in range(count):
+        url = f"http://127.0.0.1:{port + offset}/repositories/{settings.GRAPHDB_REPOSITORY}/size"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(url).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Replica on port {port + offset} did not start")
+            time.sleep(0.2)
+    return processes
+
+
+def set_faults(url: str, delay: float = 0.0, fail: bool = False):
+    httpx.post(f"{url}/control", params={"delay": delay, "fail": int(fail)}).raise_for_status()
+
+
+async def check(urls: List[str]) -> bool:
+    """Drive a ReplicaPoolBackend against the replicas and verify ejection and hedging."""
+    pool = ReplicaPoolBackend([HttpGraphBackend(url) for url in urls])
+    ok = True
+
+    print(f"\n[2/4] Warming up {len(urls)} replicas...")
+    for _ in range(max(settings.GRAPHDB_HEDGE_MIN_SAMPLES, 2 * len(urls))):
+        await pool.query(PROBE_QUERY, JSON)
+    delay = pool.hedge_delay()
+    print(f"✓ Hedge delay (p95): {delay * 1000:.1f} ms")
+
+    # Fault the replicas the pool currently prefers, so they actually get traffic
+    failed = pool._ranked()[0]
+    failed_url = urls[pool.replicas.index(failed)]
+    print(f"\n[3/4] Failing the fastest replica, {failed_url}...")
+    set_faults(failed_url, fail=True)
+    queries = 0
+    while failed.times_ejected == 0 and queries < 50:
+        await pool.query(PROBE_QUERY, JSON)
+        queries += 1
+    if failed.times_ejected and not failed.available(time.monotonic()):
+        print(f"✓ Ejected after {failed.failures} failures; all {queries} queries answered by failover")
+    else:
+        print(f"✗ Not ejected after {queries} queries")
+        ok = False
+    set_faults(failed_url)
+
+    print(f"\n[4/4] Slowing the fastest healthy replica by 1s...")
+    slow = pool._ranked(exclude=[failed])[0]
+    set_faults(urls[pool.replicas.index(slow)], delay=1.0)
+    start = time.monotonic()
+    await pool.query(PROBE_QUERY, JSON)
+    elapsed = time.monotonic() - start
+    if pool.hedged and pool.hedge_wins and elapsed < 1.0:
+        print(f"✓ Hedged to a second replica; answered in {elapsed * 1000:.1f} ms")
+    else:
+        print(f"✗ Not hedged (hedged={pool.hedged}, wins={pool.hedge_wins}, {elapsed * 1000:.1f} ms)")
+        ok = False
+
+    print(json.dumps(pool.stats(), indent=2))
+    await pool.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicas", type=int, default=3, help="replica processes to start")
+    parser.add_argument("--port", type=int, default=7301, help="port of the first replica")
+    parser.add_argument("--check", action="store_true", help="verify ejection and hedging, then exit")
+    args = parser.parse_args()
+    if args.check and args.replicas < 3:
+        parser.error("--check needs at least 3 replicas (one failed, one slow, one to hedge to)")
+
+    print("=" * 60)
+    print("GraphDB Replica Stand-in - Healthcare Navigator")
+    print("=" * 60)
+
+    print(f"\n[1/{4 if args.check else 1}] Starting {args.replicas} replicas...")
+    processes = start_replicas(args.replicas, args.port)
+    urls = [f"http://127.0.0.1:{args.port + offset}" for offset in range(args.replicas)]
+    print(f"✓ Serving the embedded graph on ports {args.port}-{args.port + args.replicas - 1}")
+
+    try:
+        if args.check:
+            ok = asyncio.run(check(urls))
+            print("\n" + "=" * 60)
+            print("✓ Ejection and hedging work" if ok else "✗ Replica pool check failed")
+            print("=" * 60)
+            sys.exit(0 if ok else 1)
+
+        print(f"\nPoint the API at them with:\n  GRAPHDB_REPLICA_URLS='{json.dumps(urls)}'")
+        print("Press Ctrl-C to stop")
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -93,7 +93,7 @@ async def main():
         specialties = await graphdb_client.get_all_specialties()
         print(f"✓ Found {len(specialties)} specialties in GraphDB")
 
-        hospitals = await graphdb_client.get_hospitals(limit=10)
+        hospitals = await graphdb_client.get_hospitals(limit=None)
         print(f"✓ Found {len(hospitals)} hospitals in GraphDB")
 
     except Exception as e:
@@ -113,19 +113,14 @@ async def main():
         await mongodb_client.connect()
         print("✓ Connected to MongoDB")
 
-        # Clear existing cache
-        if mongodb_client.db:
-            await mongodb_client.db.search_cache.delete_many({})
-            await mongodb_client.db.query_cache.delete_many({})
-            print("✓ Cleared existing cache")
-
-        # Note: We don't pre-populate cache
-        # Cache is populated on-demand when queries are made
-        print("✓ MongoDB cache ready (will populate on first queries)")
+        # Entity caches were materialized from GraphDB and popular searches
+        # re-warmed by seed_graphdb.py; other searches populate on demand
+        print("✓ MongoDB cache ready (entities materialized, popular searches warmed)")
 
         print("\nNote: MongoDB is CACHE ONLY")
         print("  - GraphDB is the source of truth")
-        print("  - Cache populates automatically on API queries")
+        print("  - Entity caches are rebuilt from it by ops/materialize_entities.py")
+        print("  - Search cache populates automatically on API queries")
         print("  - Cache improves performance on repeated queries")
 
     except Exception as e:
@@ -10,8 +10,48 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import asyncio
 import requests
 from pathlib import Path
-from typing import List
+from typing import List, Dict, Optional, Tuple
 from app.core.config import settings
+from app.db.mongodb import mongodb_client
+from app.db.graphdb import graphdb_client
+from app.services.cache_warmer import cache_warmer
+from app.services.materializer import entity_materializer
+from app.db.sparql_templates import with_default_graph, get_template
+from app.db.dataset_version import (
+    GRAPH_PREFIX,
+    UNVERSIONED,
+    new_dataset_version,
+    dataset_graph,
+    activation_update
+)
+from app.db.dataset_delta import read_subjects, subject_hashes, write_manifest
+from ops.bulk_load import BulkLoader
+
+# Entity types that must be present before a new dataset version goes live
+REQUIRED_ENTITIES = ["Physicians", "Hospitals", "Symptoms", "Conditions", "Specialties"]
+
+TTL_DIR = Path(__file__).parent / "ttl_data"
+ONTOLOGY_PATH = Path(__file__).parent.parent.parent / "HealthcareNavigator_Team4.owl"
+
+# TTL files in load order
+TTL_FILES = [
+    "specialties.ttl",
+    "conditions_symptoms.ttl",
+    "symptoms_precautions.ttl",
+    "hospitals.ttl",
+    "hospitals_hcahps.ttl",
+    "physicians.ttl",
+    "pharmacies.ttl",
+]
+
+# Subject hashes of the last loaded dataset, for ops/delta_load_ttl.py
+MANIFEST_PATH = TTL_DIR / ".loaded_manifest.json"
+
+
+def dataset_files() -> List[Path]:
+    """The ontology (if present) and TTL files making up the dataset, in load order."""
+    files = [ONTOLOGY_PATH] if ONTOLOGY_PATH.exists() else []
+    return files + [TTL_DIR / filename for filename in TTL_FILES]
 
 
 class GraphDBSeeder:
@@ -27,6 +67,9 @@ class GraphDBSeeder:
         if settings.GRAPHDB_USERNAME and settings.GRAPHDB_PASSWORD:
             self.auth = (settings.GRAPHDB_USERNAME, settings.GRAPHDB_PASSWORD)
 
+        # Streams files in gzipped chunks, several uploads in flight
+        self.bulk_loader = BulkLoader(self.repository_url, self.auth)
+
     def test_connection(self) -> bool:
         """Test connection to GraphDB."""
         try:
@@ -114,61 +157,107 @@ class GraphDBSeeder:
         except Exception as e:
             print(f"Warning: Error clearing repository: {e}")
 
-    def load_ttl_file(self, file_path: Path) -> bool:
-        """Load a TTL file into GraphDB."""
+    def load_ttl_file(self, file_path: Path, graph: Optional[str] = None) -> bool:
+        """Load a TTL file into GraphDB, into the named graph `graph` if given."""
         if not file_path.exists():
             print(f"✗ File not found: {file_path}")
             return False
 
-        print(f"Loading {file_path.name}...", end=" ")
+        print(f"Loading {file_path.name}...", end=" ", flush=True)
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = f.read()
+        report = self.bulk_loader.load_file(file_path, graph)
+        if report.ok:
+            print(f"✓ {report.summary()}")
+            return True
 
-            response = requests.post(
-                f"{self.repository_url}/statements",
-                headers={'Content-Type': 'text/turtle'},
-                data=data.encode('utf-8'),
-                auth=self.auth
-            )
+        print("✗")
+        print(f"  Error: {report.error}")
+        return False
 
-            if response.status_code in [200, 204]:
-                print("✓")
-                return True
-            else:
-                print(f"✗ ({response.status_code})")
-                print(f"  Error: {response.text}")
-                return False
+    def update(self, sparql_update: str) -> bool:
+        """Run a SPARQL update (one transaction)."""
+        response = requests.post(
+            f"{self.repository_url}/statements",
+            data={'update': sparql_update},
+            auth=self.auth
+        )
+        if response.status_code in [200, 204]:
+            return True
+        print(f"Warning: SPARQL update failed ({response.status_code}): {response.text}")
+        return False
 
+    def activate_version(self, version: str, graph: str) -> bool:
+        """
+        Atomically point the API at a loaded dataset graph.
+
+        The version marker and active-graph pointer change in one update, so
+        running APIs switch from the old graph to the new one at their next
+        version check and drop cached query results.
+        """
+        try:
+            if self.update(activation_update(version, graph)):
+                print(f"✓ Active dataset version: {version}")
+                return True
         except Exception as e:
-            print(f"✗ Error: {e}")
-            return False
+            print(f"Warning: Error activating dataset version: {e}")
+        return False
 
-    def count_triples(self) -> int:
-        """Count total triples in repository."""
-        query = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
+    def select(self, query: str, infer: bool = True) -> List[Dict]:
+        """Run a SELECT query and return its JSON result bindings."""
+        response = requests.post(
+            f"{self.repository_url}",
+            data={'query': query, 'infer': 'true' if infer else 'false'},
+            headers={'Accept': 'application/sparql-results+json'},
+            auth=self.auth
+        )
+        response.raise_for_status()
+        return response.json()['results']['bindings']
+
+    def active_dataset(self) -> Tuple[str, Optional[str]]:
+        """The live dataset version and the named graph it points at (if any)."""
+        bindings = self.select(get_template("dataset_version").bind())
+        if not bindings:
+            return UNVERSIONED, None
+        graph = bindings[0].get('graph')
+        return bindings[0]['version']['value'], graph['value'] if graph else None
+
+    def dataset_graphs(self) -> List[str]:
+        """Named graphs holding dataset versions."""
+        response = requests.get(
+            f"{self.repository_url}/contexts",
+            headers={'Accept': 'application/sparql-results+json'},
+            auth=self.auth
+        )
+        response.raise_for_status()
+        return [
+            binding['contextID']['value']
+            for binding in response.json()['results']['bindings']
+            if binding['contextID']['value'].startswith(GRAPH_PREFIX)
+        ]
 
-        try:
-            response = requests.post(
-                f"{self.repository_url}",
-                data={'query': query},
-                headers={'Accept': 'application/sparql-results+json'},
-                auth=self.auth
-            )
+    def drop_graph(self, graph: str) -> bool:
+        """Delete a dataset version's named graph."""
+        return self.update(f"DROP SILENT GRAPH <{graph}>")
 
-            if response.status_code == 200:
-                results = response.json()
-                count = int(results['results']['bindings'][0]['count']['value'])
-                return count
-            return 0
+    def count(self, query: str, graph: Optional[str] = None) -> int:
+        """Run a COUNT query, optionally against one named graph only."""
+        if graph:
+            query = with_default_graph(query, graph)
+
+        return int(self.select(query)[0]['count']['value'])
 
+    def count_triples(self, graph: Optional[str] = None) -> int:
+        """Count total triples in the repository, or in one named graph."""
+        query = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
+
+        try:
+            return self.count(query, graph)
         except Exception as e:
             print(f"Error counting triples: {e}")
             return 0
 
-    def verify_data(self):
-        """Verify loaded data."""
+    def verify_data(self, graph: Optional[str] = None) -> Dict[str, int]:
+        """Count loaded entities by type, in the repository or one named graph."""
         print("\nVerifying loaded data...")
 
         queries = {
@@ -180,23 +269,60 @@ class GraphDBSeeder:
             "Specialties": "SELECT (COUNT(*) as ?count) WHERE { ?s a <http://example.org/healthnav#Specialty> }",
         }
 
+        counts = {}
         for entity_type, query in queries.items():
             try:
-                response = requests.post(
-                    f"{self.repository_url}",
-                    data={'query': query},
-                    headers={'Accept': 'application/sparql-results+json'},
-                    auth=self.auth
-                )
-
-                if response.status_code == 200:
-                    results = response.json()
-                    count = int(results['results']['bindings'][0]['count']['value'])
-                    print(f"  - {entity_type}: {count}")
-
+                counts[entity_type] = self.count(query, graph)
+                print(f"  - {entity_type}: {counts[entity_type]}")
             except Exception as e:
                 print(f"  - {entity_type}: Error ({e})")
 
+        return counts
+
+
+async def refresh_search_cache():
+    """Materialize the entity caches, drop stale cached searches and re-warm popular ones."""
+    try:
+        await mongodb_client.connect()
+    except Exception as e:
+        print(f"⚠ Skipping cache refresh, MongoDB unavailable: {e}")
+        return
+
+    try:
+        # Warm against the version just activated, not the whole repository
+        await graphdb_client.refresh_dataset_version()
+        try:
+            run = await entity_materializer.materialize()
+            for collection, counts in run["collections"].items():
+                print(f"✓ Materialized {collection}: {counts}")
+        except Exception as e:
+            print(f"⚠ Entity cache materialization failed: {e}")
+        stats = await cache_warmer.after_data_load()
+        print(f"✓ Warmed {stats['warmed']} popular searches ({stats['failed']} failed)")
+    finally:
+        await mongodb_client.disconnect()
+
+
+async def drop_old_versions(seeder: GraphDBSeeder, active_graph: str, delay: float) -> int:
+    """
+    Drop every dataset graph but the active one, after a grace period.
+
+    The delay lets running APIs notice the new version (they poll every
+    GRAPHDB_VERSION_POLL_SECONDS) before the graph they read disappears.
+    """
+    await asyncio.sleep(delay)
+    try:
+        graphs = await asyncio.to_thread(seeder.dataset_graphs)
+    except Exception as e:
+        print(f"Warning: Could not list old dataset versions: {e}")
+        return 0
+
+    dropped = 0
+    for graph in graphs:
+        if graph != active_graph and await asyncio.to_thread(seeder.drop_graph, graph):
+            dropped += 1
+    return dropped
+
 
 async def seed_graphdb():
     """Main seeding function."""
@@ -207,7 +333,7 @@ async def seed_graphdb():
     seeder = GraphDBSeeder()
 
     # Step 1: Test connection
-    print("\n[1/5] Testing GraphDB connection...")
+    print("\n[1/6] Testing GraphDB connection...")
     if not seeder.test_connection():
         print("\n✗ Cannot connect to GraphDB")
         print(f"  Please ensure GraphDB is running at: {settings.GRAPHDB_URL}")
@@ -219,62 +345,73 @@ async def seed_graphdb():
     print("✓ Connected to GraphDB")
 
     # Step 2: Create repository if needed
-    print("\n[2/5] Checking repository...")
+    print("\n[2/6] Checking repository...")
     seeder.create_repository()
 
-    # Step 3: Clear existing data
-    print("\n[3/5] Clearing existing data...")
-    seeder.clear_repository()
-
-    # Step 4: Load TTL files
-    print("\n[4/5] Loading RDF data...")
+    # Step 3: Load into a new dataset version graph; the live one stays untouched
+    version = new_dataset_version()
+    graph = dataset_graph(version)
+    print(f"\n[3/6] Loading RDF data into {graph}...")
 
-    # Get TTL directory
-    ttl_dir = Path(__file__).parent / "ttl_data"
-
-    if not ttl_dir.exists():
-        print(f"\n✗ TTL data directory not found: {ttl_dir}")
+    if not TTL_DIR.exists():
+        print(f"\n✗ TTL data directory not found: {TTL_DIR}")
         print("  Please run: python ops/generate_ttl_data.py")
         return False
 
     # Load ontology first
-    ontology_path = Path(__file__).parent.parent.parent / "HealthcareNavigator_Team4.owl"
-    if ontology_path.exists():
+    if ONTOLOGY_PATH.exists():
         print("\nLoading ontology...")
-        seeder.load_ttl_file(ontology_path)
+        seeder.load_ttl_file(ONTOLOGY_PATH, graph)
     else:
-        print(f"Warning: Ontology not found at {ontology_path}")
-
-    # Load TTL files in order
-    ttl_files = [
-        "specialties.ttl",
-        "conditions_symptoms.ttl",
-        "symptoms_precautions.ttl",
-        "hospitals.ttl",
-        "hospitals_hcahps.ttl",
-        "physicians.ttl",
-        "pharmacies.ttl",
-    ]
+        print(f"Warning: Ontology not found at {ONTOLOGY_PATH}")
 
     print("\nLoading data files...")
     loaded_count = 0
-    for filename in ttl_files:
-        filepath = ttl_dir / filename
-        if seeder.load_ttl_file(filepath):
+    for filename in TTL_FILES:
+        filepath = TTL_DIR / filename
+        if seeder.load_ttl_file(filepath, graph):
             loaded_count += 1
 
-    # Step 5: Verify
-    print("\n[5/5] Verification...")
-    total_triples = seeder.count_triples()
-    print(f"\nTotal triples loaded: {total_triples}")
+    # Step 4: Validate the new version before it goes live
+    print("\n[4/6] Validating new dataset version...")
+    total_triples = seeder.count_triples(graph)
+    print(f"\nTriples in {graph}: {total_triples}")
+
+    counts = seeder.verify_data(graph)
+    missing = [entity_type for entity_type in REQUIRED_ENTITIES if not counts.get(entity_type)]
+    if loaded_count < len(TTL_FILES) or total_triples == 0 or missing:
+        print(f"\n✗ Validation failed ({loaded_count}/{len(TTL_FILES)} files loaded, missing: {missing or 'none'})")
+        print("  The active dataset version was left unchanged; dropping the new graph")
+        seeder.drop_graph(graph)
+        return False
 
-    seeder.verify_data()
+    # Step 5: Switch the API to the new version; drop old ones in the background
+    print("\n[5/6] Activating new dataset version...")
+    if not seeder.activate_version(version, graph):
+        print("✗ Could not activate the new dataset version")
+        return False
+
+    # Later edits can then be applied with ops/delta_load_ttl.py
+    try:
+        write_manifest(MANIFEST_PATH, version, graph, subject_hashes(read_subjects(dataset_files())))
+        print(f"✓ Wrote delta manifest: {MANIFEST_PATH.name}")
+    except Exception as e:
+        print(f"Warning: Could not write delta manifest: {e}")
+
+    grace_seconds = settings.GRAPHDB_VERSION_POLL_SECONDS * 2
+    print(f"Old dataset versions will be dropped in {grace_seconds}s")
+    cleanup = asyncio.create_task(drop_old_versions(seeder, graph, grace_seconds))
+
+    # Step 6: Refresh the search cache for the new data
+    print("\n[6/6] Refreshing entity and search caches...")
+    await refresh_search_cache()
+
+    print("\nWaiting to drop old dataset versions...")
+    dropped = await cleanup
+    print(f"✓ Dropped {dropped} old dataset version(s)")
 
     print("\n" + "=" * 60)
-    if loaded_count == len(ttl_files):
-        print("✓ GraphDB seeding completed successfully!")
-    else:
-        print(f"⚠ Partial success: {loaded_count}/{len(ttl_files)} files loaded")
+    print("✓ GraphDB seeding completed successfully!")
 
     print("=" * 60)
     print(f"\nGraphDB Workbench: {settings.GRAPHDB_URL}")
@@ -285,7 +422,7 @@ async def seed_graphdb():
     print("  3. Generate MongoDB cache from GraphDB")
     print("=" * 60)
 
-    return loaded_count == len(ttl_files)
+    return True
 
 
 if __name__ == "__main__":
@@ -3,9 +3,17 @@ Simple script to load TTL files directly into GraphDB.
 This bypasses the repository creation issues.
 """
 
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
 import requests
 import glob
 from pathlib import Path
+from app.db.dataset_version import new_dataset_version, version_update
+from ops.bulk_load import BulkLoader
+from ops.seed_graphdb import refresh_search_cache
 
 # GraphDB settings
 GRAPHDB_URL = "http://localhost:7200"
@@ -49,32 +57,34 @@ def load_ttl_files():
 
     print(f"Found {len(ttl_files)} TTL files")
 
+    loader = BulkLoader(f"{GRAPHDB_URL}/repositories/{REPOSITORY}")
     loaded_count = 0
     for ttl_file in ttl_files:
         print(f"\n  Loading: {ttl_file.name}...")
 
-        try:
-            with open(ttl_file, 'r', encoding='utf-8') as f:
-                ttl_data = f.read()
-
-            # Upload to GraphDB
-            response = requests.post(
-                f"{GRAPHDB_URL}/repositories/{REPOSITORY}/statements",
-                headers={'Content-Type': 'application/x-turtle'},
-                data=ttl_data.encode('utf-8')
-            )
-
-            if response.status_code in [200, 201, 204]:
-                print(f"  ✓ Loaded: {ttl_file.name}")
-                loaded_count += 1
-            else:
-                print(f"  ✗ Failed: {ttl_file.name} - Status: {response.status_code}")
-                print(f"    Response: {response.text}")
-
-        except Exception as e:
-            print(f"  ✗ Error loading {ttl_file.name}: {e}")
+        report = loader.load_file(ttl_file)
+        if report.ok:
+            print(f"  ✓ Loaded: {ttl_file.name} - {report.summary()}")
+            loaded_count += 1
+        else:
+            print(f"  ✗ Failed: {ttl_file.name} - {report.error}")
 
     print(f"\n✓ Loaded {loaded_count}/{len(ttl_files)} files successfully")
+
+    # Stamp a new dataset version so running APIs drop cached query results
+    version = new_dataset_version()
+    try:
+        response = requests.post(
+            f"{GRAPHDB_URL}/repositories/{REPOSITORY}/statements",
+            data={'update': version_update(version)}
+        )
+        if response.status_code in [200, 204]:
+            print(f"✓ Dataset version: {version}")
+        else:
+            print(f"  ✗ Failed to stamp dataset version - Status: {response.status_code}")
+    except Exception as e:
+        print(f"  ✗ Error stamping dataset version: {e}")
+
     return loaded_count == len(ttl_files)
 
 def main():
@@ -98,6 +108,9 @@ def main():
                 print(f"\nTotal triples in repository: {count}")
         except:
             pass
+
+        # Materialize entity caches and re-warm popular searches for the new data
+        asyncio.run(refresh_search_cache())
     else:
         print("\n" + "="*60)
         print("✗ Some files failed to load")
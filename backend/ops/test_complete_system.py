@@ -86,7 +86,7 @@ class SystemTester:
                 query = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
                 results = await graphdb_client.query(query)
                 if results:
-                    count = int(results[0]['count']['value'])
+                    count = int(results[0]['count'])
                     self.log_test(
                         f"Knowledge graph has data ({count} triples)",
                         count > 0,
@@ -106,7 +106,7 @@ class SystemTester:
                         for entity_name, entity_query in entities.items():
                             results = await graphdb_client.query(entity_query)
                             if results:
-                                entity_count = int(results[0]['count']['value'])
+                                entity_count = int(results[0]['count'])
                                 self.log_test(
                                     f"  - {entity_name} loaded",
                                     entity_count > 0,
@@ -458,7 +458,7 @@ class SystemTester:
             self.log_test(
                 "Hospital HCAHPS quality scores",
                 len(hcahps_results) > 0,
-                f"Top hospital score: {hcahps_results[0]['score']['value']}" if hcahps_results else ""
+                f"Top hospital score: {hcahps_results[0]['score']}" if hcahps_results else ""
             )
 
         except Exception as e: